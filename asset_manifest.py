@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Asset Manifest Module for Simple Hacker Mode
+============================================
+
+This module builds an index of the logo files once at load time so the
+popup loop only does indexed lookups instead of scanning the Logos folder.
+
+An optional ``manifest.json`` inside the logo folder can override
+per-asset settings, keyed by file name:
+
+    {
+        "O4U4.jpg": {"keep_original_size": true},
+        "Merck Logo.png": {"popup_size": [300, 300]},
+        "old_sponsor.png": {"enabled": false}
+    }
+"""
+
+import os
+import json
+import glob
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import pygame
+
+from hacker_logging import get_logger
+
+log = get_logger("loader")
+
+# File patterns scanned in the logo folder, in load order
+LOGO_PATTERNS = ("*.png", "*.jpg", "*.webp")
+
+# Logos shown at their loaded size instead of being scaled down for popups
+KEEP_ORIGINAL_SIZE = ("O4U4.jpg", "O4U1.jpg")
+
+# Default sizes used by Simple Hacker Mode
+LOAD_SIZE = (800, 600)
+POPUP_SIZE = (400, 400)
+
+MANIFEST_FILENAME = "manifest.json"
+
+
+def fit_size(size: Tuple[int, int], max_size: Tuple[int, int]) -> Tuple[int, int]:
+    """Largest size that fits within max_size while maintaining aspect ratio"""
+    width, height = size
+    scale = min(max_size[0] / width, max_size[1] / height)
+    return int(width * scale), int(height * scale)
+
+
+def scale_to_fit(image: pygame.Surface, max_width: int, max_height: int) -> pygame.Surface:
+    """Scale image to fit within max dimensions while maintaining aspect ratio"""
+    return pygame.transform.scale(image, fit_size(image.get_size(), (max_width, max_height)))
+
+
+@dataclass
+class LogoAsset:
+    """One logo file and everything the popup loop needs to show it"""
+    path: str
+    name: str
+    keep_original_size: bool = False
+    load_size: Tuple[int, int] = LOAD_SIZE
+    popup_size: Tuple[int, int] = POPUP_SIZE
+    original_size: Optional[Tuple[int, int]] = None
+    surface: Optional[pygame.Surface] = None
+    popup_surface: Optional[pygame.Surface] = None
+    failed: bool = False
+    removed: bool = False
+    version: int = 0  # Bumped when the file changes so stale background loads are ignored
+
+    @property
+    def available(self) -> bool:
+        """Whether the asset can still be loaded and shown"""
+        return not (self.failed or self.removed)
+
+    @property
+    def loaded(self) -> bool:
+        return self.popup_surface is not None
+
+    @property
+    def target_popup_size(self) -> Optional[Tuple[int, int]]:
+        """Popup size to pre-scale to, or None if the loaded size is used as is"""
+        return None if self.keep_original_size else self.popup_size
+
+    def set_image(self, image: pygame.Surface):
+        """Store the decoded image and pre-scale the popup surface"""
+        surface = scale_to_fit(image, *self.load_size)
+        popup_surface = None
+        if not self.keep_original_size:
+            popup_surface = scale_to_fit(surface, *self.popup_size)
+        self.set_surfaces(image.get_size(), surface, popup_surface)
+
+    def set_surfaces(self, original_size: Tuple[int, int], surface: pygame.Surface,
+                     popup_surface: Optional[pygame.Surface] = None):
+        """Store already scaled surfaces (popup_surface is None for keep_original_size assets)"""
+        self.original_size = original_size
+        self.surface = surface
+        # Don't scale keep_original_size images any further - use loaded size
+        self.popup_surface = popup_surface if popup_surface is not None else surface
+
+
+class AssetManifest:
+    def __init__(self, folder: str = "Logos", manifest_path: Optional[str] = None):
+        self.folder = folder
+        self.manifest_path = manifest_path or os.path.join(folder, MANIFEST_FILENAME)
+        self.assets: List[LogoAsset] = []
+        self.by_name: Dict[str, int] = {}
+        self.overrides: Dict[str, dict] = {}
+
+    def scan(self) -> List[LogoAsset]:
+        """Build the asset index from the logo folder and optional manifest file"""
+        self.overrides = overrides = self.load_overrides()
+
+        paths = []
+        for pattern in LOGO_PATTERNS:
+            paths.extend(sorted(glob.glob(os.path.join(self.folder, pattern))))
+
+        self.assets = []
+        self.by_name = {}
+        for path in paths:
+            asset = self.make_asset(path, overrides.get(os.path.basename(path), {}))
+            if asset is None:
+                continue
+            self.by_name[asset.name] = len(self.assets)
+            self.assets.append(asset)
+        return self.assets
+
+    def add(self, path: str) -> Optional[int]:
+        """Index a new file; indices of existing assets never change"""
+        name = os.path.basename(path)
+        if name in self.by_name:
+            return self.by_name[name]
+        asset = self.make_asset(path, self.overrides.get(name, {}))
+        if asset is None:
+            return None
+        self.by_name[name] = len(self.assets)
+        self.assets.append(asset)
+        return self.by_name[name]
+
+    def remove(self, path: str) -> Optional[int]:
+        """Mark a deleted file's asset as removed, keeping its slot so indices stay valid"""
+        index = self.by_name.pop(os.path.basename(path), None)
+        if index is not None:
+            self.assets[index].removed = True
+        return index
+
+    def make_asset(self, path: str, override: dict) -> Optional[LogoAsset]:
+        """Create the record for one file, applying manifest overrides"""
+        if not override.get("enabled", True):
+            return None
+
+        name = os.path.basename(path)
+        asset = LogoAsset(path=path, name=name, keep_original_size=name in KEEP_ORIGINAL_SIZE)
+        if "keep_original_size" in override:
+            asset.keep_original_size = bool(override["keep_original_size"])
+        if "load_size" in override:
+            asset.load_size = tuple(override["load_size"])
+        if "popup_size" in override:
+            asset.popup_size = tuple(override["popup_size"])
+        return asset
+
+    def load_overrides(self) -> Dict[str, dict]:
+        """Read per-asset overrides from the JSON manifest, if there is one"""
+        if not os.path.exists(self.manifest_path):
+            return {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                overrides = json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"Could not read {self.manifest_path}: {e}")
+            return {}
+        if not isinstance(overrides, dict):
+            log.warning(f"Ignoring {self.manifest_path}: expected an object keyed by file name")
+            return {}
+        return overrides
+
+    def __len__(self):
+        return len(self.assets)
+
+    def __getitem__(self, index: int) -> LogoAsset:
+        return self.assets[index]
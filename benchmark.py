@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Rendering Benchmark
+===================
+
+Headless benchmark for the hot draw paths. For each case it counts the
+Python-level calls one frame makes (function calls plus calls into C such
+as blit and render) and times the frame, for the old one-call-per-item
+code and the current batched code. It also times whole slideshow frames
+with the simulation run in sequence and pipelined on a worker thread, and
+with the graph widgets drawn in process and by the widget process, and
+the CRT post-processing pass per effect.
+
+Usage:
+    python benchmark.py [--frames N] [--columns 50,500,5000]
+"""
+
+import os
+import sys
+import time
+import argparse
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import main
+from crt_effect import CRT_EFFECTS, CRTEffect
+from options import parse_options
+
+
+def count_calls(function, *args) -> int:
+    """Number of Python function calls and C calls made by one call of function"""
+    calls = 0
+
+    def profile(frame, event, arg):
+        nonlocal calls
+        if event in ("call", "c_call"):
+            calls += 1
+
+    sys.setprofile(profile)
+    try:
+        function(*args)
+    finally:
+        sys.setprofile(None)
+    return calls - 1  # Don't count the sys.setprofile call that switches profiling off
+
+
+def time_frames(function, frames: int, *args) -> float:
+    """Average milliseconds per call"""
+    started = time.perf_counter()
+    for _ in range(frames):
+        function(*args)
+    return (time.perf_counter() - started) * 1000 / frames
+
+
+def draw_matrix_unbatched(game):
+    """The Matrix rain as it was drawn before batching: render and blit every glyph"""
+    rain = game.matrix
+    for x, y, chars, char_index in zip(rain.x.tolist(), rain.y.tolist(), rain.chars, rain.char_index.tolist()):
+        for i, char in enumerate(chars):
+            char_y = y + (i * 20)
+            if 0 <= char_y <= game.screen_height:
+                alpha = max(0, 255 - (i * 15))
+                color = (0, alpha, 0)
+                if i == char_index:
+                    color = game.BRIGHT_GREEN
+                char_surface = game.font_mono.render(char, True, color)
+                game.screen.blit(char_surface, (x, char_y))
+
+
+def draw_grid_unbatched(screen, x, y, width, height):
+    """Graph grid as it was drawn before batching: one draw.line per grid line"""
+    pygame.draw.rect(screen, (20, 20, 20), (x, y, width, height))
+    pygame.draw.rect(screen, (100, 100, 100), (x, y, width, height), 1)
+    for i in range(0, width, 20):
+        pygame.draw.line(screen, (40, 40, 40), (x + i, y), (x + i, y + height))
+    for i in range(0, height, 20):
+        pygame.draw.line(screen, (40, 40, 40), (x, y + i), (x + width, y + i))
+
+
+def draw_grid_batched(graphs, screen, x, y, width, height):
+    """Graph grid as draw_line_graph draws it now"""
+    pygame.draw.rect(screen, (20, 20, 20), (x, y, width, height))
+    vertical, horizontal = graphs.grid_lines(x, y, width, height)
+    pygame.draw.lines(screen, (40, 40, 40), False, vertical)
+    pygame.draw.lines(screen, (40, 40, 40), False, horizontal)
+    pygame.draw.rect(screen, graphs.GRAY, (x, y, width, height), 1)
+
+
+def draw_data_stream_bars(graphs, screen, x, y, width, height):
+    """Data stream as it was drawn before the waterfall: fresh random bars and sparkles every frame"""
+    pygame.draw.rect(screen, (0, 0, 0), (x, y, width, height))
+    pygame.draw.rect(screen, graphs.GREEN, (x, y, width, height), 1)
+    font = pygame.font.Font(None, 20)
+    screen.blit(font.render("DATA STREAM", True, graphs.BRIGHT_GREEN), (x + 10, y + 10))
+    for i in range(0, width - 20, 30):
+        data_height = graphs.rng.randint(10, height - 40)
+        data_y = y + height - data_height - 20
+        pygame.draw.rect(screen, graphs.GREEN, (x + 10 + i, data_y, 20, data_height))
+        if graphs.rng.random() < 0.1:
+            pygame.draw.circle(screen, graphs.WHITE, (x + 10 + i + 10, data_y + graphs.rng.randint(0, data_height)), 1)
+
+
+def draw_data_stream_waterfall(graphs, screen, x, y, width, height):
+    """One sample in, one frame of the waterfall out"""
+    graphs.update_data_stream()
+    graphs.draw_data_stream(screen, x, y, width, height)
+
+
+def print_row(name, before_calls, after_calls, before_ms, after_ms):
+    print(f"{name:<24} {before_calls:>12} {after_calls:>12} {before_ms:>11.2f} {after_ms:>11.2f}")
+
+
+def benchmark_matrix(game, columns_list, frames):
+    for columns in columns_list:
+        game.init_matrix_effect(columns)
+        for _ in range(60):
+            game.update_matrix_effect()  # Let the columns fall onto the screen
+        game.draw_matrix_effect()  # Fill the glyph cache, as after the first frames of a run
+
+        before_calls = count_calls(draw_matrix_unbatched, game)
+        after_calls = count_calls(game.draw_matrix_effect)
+
+        game.screen.fill((0, 0, 0))
+        draw_matrix_unbatched(game)
+        expected = pygame.image.tobytes(game.screen, "RGB")
+        game.screen.fill((0, 0, 0))
+        game.draw_matrix_effect()
+        if pygame.image.tobytes(game.screen, "RGB") != expected:
+            print(f"warning: batched Matrix output differs at {columns} columns")
+
+        before_ms = time_frames(draw_matrix_unbatched, frames, game)
+        after_ms = time_frames(game.draw_matrix_effect, frames)
+        print_row(f"Matrix, {columns} columns", before_calls, after_calls, before_ms, after_ms)
+
+
+def benchmark_graph_grid(game, frames):
+    graphs = game.graph_animations
+    args = (game.screen, 10, 40, 280, 80)
+    graphs.grid_lines(*args[1:])  # Precomputed once per graph box
+    before_calls = count_calls(draw_grid_unbatched, *args)
+    after_calls = count_calls(draw_grid_batched, graphs, *args)
+    before_ms = time_frames(draw_grid_unbatched, frames, *args)
+    after_ms = time_frames(draw_grid_batched, frames, graphs, *args)
+    print_row("Graph grid", before_calls, after_calls, before_ms, after_ms)
+
+
+def benchmark_data_stream(game, frames):
+    graphs = game.graph_animations
+    for width in (300, 1200):
+        args = (game.screen, 0, 0, width, 160)
+        draw_data_stream_waterfall(graphs, *args)  # Create the waterfall surface
+        before_calls = count_calls(draw_data_stream_bars, graphs, *args)
+        after_calls = count_calls(draw_data_stream_waterfall, graphs, *args)
+        before_ms = time_frames(draw_data_stream_bars, frames, graphs, *args)
+        after_ms = time_frames(draw_data_stream_waterfall, frames, graphs, *args)
+        print_row(f"Data stream, {width} wide", before_calls, after_calls, before_ms, after_ms)
+
+
+def benchmark_pipeline(columns_list, frames):
+    """Whole slideshow frames (update and draw, no frame cap) with and without the simulation thread"""
+    for columns in columns_list:
+        results = []
+        for extra in ([], ["--pipeline"]):
+            game = main.FunHackerMode(parse_options(["--seed", "1", "--fps", "0"] + extra))
+            game.init_matrix_effect(columns)
+            game.current_mode = "slideshow"
+            game.show_graphs = True
+
+            def frame():
+                game.update()
+                game.draw()
+
+            frame()  # Start the pipeline and fill the glyph cache
+            results.append(time_frames(frame, frames))
+            if game.pipeline is not None:
+                game.pipeline.stop()
+        print(f"{f'Slideshow, {columns} columns':<24} {results[0]:>12.2f} {results[1]:>12.2f}")
+
+
+def benchmark_widgets(frames):
+    """Whole slideshow frames with the graph widgets shown, drawn in process and out of process"""
+    results = []
+    for extra in ([], ["--widget-process"]):
+        game = main.FunHackerMode(parse_options(["--fps", "0"] + extra))
+        game.current_mode = "slideshow"
+        game.show_graphs = True
+        if game.widgets is not None and not game.widgets.wait_for_frame():
+            print("warning: the widget process didn't produce a frame")
+
+        def frame():
+            game.update()
+            game.draw()
+
+        frame()
+        results.append(time_frames(frame, frames))
+        if game.widgets is not None:
+            game.widgets.stop()
+    print(f"{'Slideshow with widgets':<24} {results[0]:>12.2f} {results[1]:>12.2f}")
+
+
+def benchmark_crt(game, frames):
+    """CRT pass per effect on a slideshow frame, at the window size and at 1080p"""
+    game.current_mode = "slideshow"
+    game.show_graphs = True
+    game.update()
+    game.draw()
+    sizes = [game.screen.get_size(), (1920, 1080)]
+    frames_by_size = [pygame.transform.smoothscale(game.screen, size) for size in sizes]
+    targets = [pygame.Surface(size, depth=32) for size in sizes]
+    for effects in [[effect] for effect in CRT_EFFECTS] + [list(CRT_EFFECTS)]:
+        results = []
+        for frame, target in zip(frames_by_size, targets):
+            crt = CRTEffect(effects)
+
+            def apply():
+                target.blit(frame, (0, 0))  # A fresh frame each time, as in the render loop
+                crt.apply(target)
+
+            apply()  # Build the masks and buffers
+            results.append(time_frames(apply, frames) - time_frames(target.blit, frames, frame, (0, 0)))
+        name = "all effects" if len(effects) > 1 else effects[0]
+        print(f"{f'CRT {name}':<24} {results[0]:>12.2f} {results[1]:>12.2f}")
+
+
+def main_benchmark(argv=None):
+    parser = argparse.ArgumentParser(description="Headless rendering benchmark")
+    parser.add_argument("--frames", type=int, default=20, help="Frames to time per case (default: 20)")
+    parser.add_argument("--columns", default="50,500,5000",
+                        help="Comma-separated Matrix column counts (default: 50,500,5000)")
+    args = parser.parse_args(argv)
+    columns_list = [int(value) for value in args.columns.split(",")]
+
+    game = main.FunHackerMode(parse_options(["--seed", "1"]))
+
+    print(f"{'Case':<24} {'calls before':>12} {'calls after':>12} {'ms before':>11} {'ms after':>11}")
+    benchmark_matrix(game, columns_list, args.frames)
+    benchmark_graph_grid(game, args.frames)
+    benchmark_data_stream(game, args.frames)
+    print()
+    print(f"{'Frame time (ms)':<24} {'sequential':>12} {'pipelined':>12}")
+    benchmark_pipeline(columns_list, args.frames)
+    print()
+    print(f"{'Frame time (ms)':<24} {'in process':>12} {'out of proc':>12}")
+    benchmark_widgets(args.frames)
+    print()
+    print(f"{'CRT pass (ms)':<24} {'window':>12} {'1080p':>12}")
+    benchmark_crt(game, args.frames)
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main_benchmark()
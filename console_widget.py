@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Console Widget Module
+=====================
+
+A terminal-style text panel for streams of log or error lines.
+
+Lines are kept as text in a scrollback ring buffer. Each line is rendered
+to a surface exactly once, when it is composited into a persistent backing
+surface; scrolling moves the backing surface in place instead of
+re-rendering what's already on screen. Lines pushed faster than they can
+be shown are never rasterized at all.
+"""
+
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+import pygame
+
+from resource_registry import track
+
+Color = Tuple[int, int, int]
+
+
+class ConsoleWidget:
+    def __init__(self, font: pygame.font.Font, size: Tuple[int, int], color: Color = (0, 255, 0),
+                 background: Optional[Color] = (0, 0, 0), line_height: Optional[int] = None,
+                 scrollback: int = 1000):
+        self.font = font
+        self.width, self.height = size
+        self.color = color
+        self.background = background  # None gives a transparent panel
+        self.line_height = line_height or font.get_linesize()
+        self.rows = max(1, self.height // self.line_height)
+
+        if background is None:
+            self.surface = pygame.Surface(size, pygame.SRCALPHA)
+        else:
+            self.surface = pygame.Surface(size)
+        track(self.surface, "console", "text")
+
+        self.lines = deque(maxlen=scrollback)  # (text, color) history
+        self.pending = deque(maxlen=self.rows)  # Lines waiting to be composited; older ones would scroll off unseen
+        self.cursor_row = 0  # Row the next line goes on until the panel is full
+        self.lines_rendered = 0
+        self.clear()
+
+    def clear(self):
+        """Empty the panel and its scrollback"""
+        self.lines.clear()
+        self.pending.clear()
+        self.cursor_row = 0
+        self.fill_rows(0, self.rows)
+
+    def push(self, text: str, color: Optional[Color] = None):
+        """Add one line (cheap - rendering waits until the next draw)"""
+        line = (text, color or self.color)
+        self.lines.append(line)
+        self.pending.append(line)
+
+    def extend(self, lines: Iterable[str], color: Optional[Color] = None):
+        """Add lines from any producer, e.g. a generator of error messages"""
+        for text in lines:
+            self.push(text, color)
+
+    def fill_rows(self, first_row: int, count: int):
+        """Clear a band of rows on the backing surface"""
+        rect = (0, first_row * self.line_height, self.width, count * self.line_height)
+        self.surface.fill(self.background if self.background is not None else (0, 0, 0, 0), rect)
+
+    def update(self):
+        """Composite pending lines into the backing surface"""
+        if not self.pending:
+            return
+
+        overflow = len(self.pending) - (self.rows - self.cursor_row)
+        if overflow > 0:
+            # Scroll the existing lines up in place to make room at the bottom
+            self.surface.scroll(0, -overflow * self.line_height)
+            self.cursor_row -= overflow
+            self.fill_rows(self.cursor_row, self.rows - self.cursor_row)
+
+        for text, color in self.pending:
+            line_surface = self.font.render(text, True, color)
+            self.surface.blit(line_surface, (0, self.cursor_row * self.line_height))
+            self.cursor_row += 1
+            self.lines_rendered += 1
+        self.pending.clear()
+
+    def redraw(self):
+        """Rebuild the visible rows from the scrollback"""
+        visible = list(self.lines)[-self.rows:]
+        self.pending.clear()
+        self.cursor_row = 0
+        self.fill_rows(0, self.rows)
+        self.pending.extend(visible)
+        self.update()
+
+    def draw(self, screen: pygame.Surface, position: Tuple[int, int]):
+        """Blit the panel, compositing any new lines first"""
+        self.update()
+        screen.blit(self.surface, position)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+CRT Effect Module
+=================
+
+Post-processing pass that makes the finished frame look like an old CRT
+monitor: scanlines, a vignette, phosphor glow and a slight chromatic
+offset. Each effect can be switched on and off.
+
+Everything that depends only on the resolution is built once per size:
+the scanline and vignette masks are multiplied into one mask surface, and
+the glow and chroma buffers are preallocated. Per frame the pass works in
+place on the screen and allocates nothing:
+
+- scanlines and vignette: one multiply blit of the mask
+- glow: the frame is scaled down to an eighth, unpacked from a
+  surfarray.pixels2d view into preallocated channel arrays, thresholded
+  and box-blurred with NumPy, packed back, scaled up and added
+- chroma: the red channel of the frame is masked into a scratch surface
+  and added back a couple of pixels to the right; the mask blit clears
+  the screen's own red channel on the way
+
+Full-frame work is left to SDL's blend blits, which are several times
+faster than NumPy on pixel views (pixels3d views of the display format
+have a negative channel stride, and even packed pixels2d operations take
+about a millisecond per pass at 1080p). NumPy does the per-pixel work on
+the small glow buffer.
+"""
+
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+import pygame
+
+from options import CRT_EFFECTS, DEFAULT_CRT_EFFECTS
+from resource_registry import track
+
+SCANLINE_DEPTH = 0.25  # How much darker every other row is
+VIGNETTE_STRENGTH = 0.35  # Darkening in the corners
+GLOW_THRESHOLD = 96  # Only channels brighter than this glow
+GLOW_RADIUS = 1  # Box blur radius at 1/8 of the resolution
+GLOW_GAIN = (17, 8)  # Glow = blurred * 17 >> 8, about 0.6 of the box average (9 taps)
+
+
+class CRTEffect:
+    """Applies the enabled CRT effects to a surface in place"""
+
+    def __init__(self, effects: Iterable[str] = DEFAULT_CRT_EFFECTS):
+        self.effects = set(effects)
+        unknown = self.effects - set(CRT_EFFECTS)
+        if unknown:
+            raise ValueError(f"unknown CRT effect(s): {', '.join(sorted(unknown))}")
+        self.enabled = True
+        self.size: Optional[Tuple[int, int]] = None
+
+    def toggle(self, effect: Optional[str] = None):
+        """Switch one effect, or the whole pass when no effect is given"""
+        if effect is None:
+            self.enabled = not self.enabled
+            return
+        if effect in self.effects:
+            self.effects.remove(effect)
+        else:
+            self.effects.add(effect)
+        self.size = None  # The mask depends on which effects are on
+
+    def prepare(self, surface: pygame.Surface) -> int:
+        """Build the masks and buffers for the surface's resolution; returns the number of surfaces made"""
+        width, height = self.size = surface.get_size()
+
+        # Scanlines times vignette as one mask surface (white where nothing is dimmed)
+        rows = np.ones(height)
+        if "scanlines" in self.effects:
+            rows[1::2] -= SCANLINE_DEPTH
+        mask = np.outer(np.ones(width), rows)
+        if "vignette" in self.effects:
+            x = np.linspace(-1, 1, width)[:, None]
+            y = np.linspace(-1, 1, height)[None, :]
+            mask *= 1 - VIGNETTE_STRENGTH * np.clip((x * x + y * y) / 2, 0, 1) ** 1.5
+        levels = (mask * 255).astype(np.uint8)
+        mask = np.repeat(levels[:, :, None], 3, axis=2)
+        self.mask = None
+        if self.effects & {"scanlines", "vignette", "chroma"}:
+            if "chroma" in self.effects:
+                mask[:, :, 0] = 0  # The screen's red channel is replaced by the shifted one
+            self.mask = pygame.Surface((width, height), depth=32)
+            pygame.surfarray.blit_array(self.mask, mask)
+
+        # Chroma: the red channel, dimmed like the rest, moves a couple of pixels right at 1080p
+        if "chroma" in self.effects:
+            self.chroma_offset = max(1, width // 960)
+            mask[:, :, 0] = levels
+            mask[:, :, 1:] = 0
+            self.mask_red = pygame.Surface((width, height), depth=32)
+            pygame.surfarray.blit_array(self.mask_red, mask)
+            self.red = pygame.Surface((width, height), depth=32)
+
+        # Glow: quarter and eighth size frames, channel arrays and blur scratch, half and full size upscales
+        if "glow" in self.effects:
+            self.quarter = pygame.Surface((max(1, width // 4), max(1, height // 4)), depth=32)
+            self.eighth = pygame.Surface((max(1, width // 8), max(1, height // 8)), depth=32)
+            self.half = pygame.Surface((max(1, width // 2), max(1, height // 2)), depth=32)
+            self.glow = pygame.Surface((width, height), depth=32)
+            self.channels = np.zeros((3, self.eighth.get_height(), self.eighth.get_width()), dtype=np.int16)
+            self.blurred = np.zeros_like(self.channels)
+            self.packed = np.zeros(self.channels.shape[1:], dtype=np.uint32)
+            self.shifts = self.eighth.get_shifts()[:3]
+
+        for buffer in (self.mask, *self.buffers()):
+            track(buffer, "crt", "effects")
+        if "glow" in self.effects:
+            for array in (self.channels, self.blurred, self.packed):
+                track(array, "crt", "effects")
+        return sum(surface is not None for surface in (self.mask, *self.buffers()))
+
+    def buffers(self):
+        if "chroma" in self.effects:
+            yield from (self.mask_red, self.red)
+        if "glow" in self.effects:
+            yield from (self.quarter, self.eighth, self.half, self.glow)
+
+    def apply(self, surface: pygame.Surface) -> int:
+        """Run the enabled effects on the finished frame; returns the number of surfaces allocated"""
+        if not self.enabled or not self.effects:
+            return 0
+        allocated = 0
+        if surface.get_size() != self.size:
+            allocated = self.prepare(surface)
+        if "glow" in self.effects:
+            self.apply_glow(surface)  # From the undimmed frame
+        if "chroma" in self.effects:
+            # Keep the dimmed red channel before the mask blit clears it
+            self.red.blit(surface, (0, 0))
+            self.red.blit(self.mask_red, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        if self.mask is not None:
+            surface.blit(self.mask, (0, 0), special_flags=pygame.BLEND_RGB_MULT)
+        if "chroma" in self.effects:
+            surface.blit(self.red, (self.chroma_offset, 0), special_flags=pygame.BLEND_RGB_ADD)
+        return allocated
+
+    def apply_glow(self, surface: pygame.Surface):
+        # Scale down in two steps: a cheap nearest-neighbour quarter, then an averaging eighth
+        pygame.transform.scale(surface, self.quarter.get_size(), self.quarter)
+        pygame.transform.smoothscale(self.quarter, self.eighth.get_size(), self.eighth)
+
+        # Unpack the channels; the transposed view walks the pixels in memory order
+        pixels = pygame.surfarray.pixels2d(self.eighth).T
+        channels, blurred = self.channels, self.blurred
+        for channel, shift in zip(channels, self.shifts):
+            np.right_shift(pixels, shift, out=channel, casting="unsafe")
+        np.bitwise_and(channels, 0xFF, out=channels)
+
+        # Keep what's above the threshold, then box blur along x and y
+        np.subtract(channels, GLOW_THRESHOLD, out=channels)
+        np.maximum(channels, 0, out=channels)
+        np.copyto(blurred, channels)
+        for d in range(1, GLOW_RADIUS + 1):
+            blurred[:, :, d:] += channels[:, :, :-d]
+            blurred[:, :, :-d] += channels[:, :, d:]
+        np.copyto(channels, blurred)
+        for d in range(1, GLOW_RADIUS + 1):
+            channels[:, d:] += blurred[:, :-d]
+            channels[:, :-d] += blurred[:, d:]
+        np.multiply(channels, GLOW_GAIN[0], out=channels)
+        np.right_shift(channels, GLOW_GAIN[1], out=channels)
+        np.minimum(channels, 0xFF, out=channels)
+
+        # Pack back into the small surface
+        pixels[:] = 0
+        for channel, shift in zip(channels, self.shifts):
+            np.left_shift(channel, shift, out=self.packed, dtype=np.uint32, casting="unsafe")
+            np.bitwise_or(pixels, self.packed, out=pixels)
+        del pixels  # Unlock the surface
+
+        # Smooth up to a quarter, then cheap doublings to full size
+        pygame.transform.smoothscale(self.eighth, self.quarter.get_size(), self.quarter)
+        pygame.transform.scale(self.quarter, self.half.get_size(), self.half)
+        pygame.transform.scale(self.half, self.glow.get_size(), self.glow)
+        surface.blit(self.glow, (0, 0), special_flags=pygame.BLEND_RGB_ADD)
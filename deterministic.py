@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Deterministic Mode Module
+=========================
+
+Makes a run reproducible for performance comparisons. With a seed, every
+subsystem draws from its own seeded random stream (so adding a random call
+to one doesn't shift another), time advances a fixed step per frame, and
+keyboard input can be recorded and replayed frame for frame. Frame hashes
+can be saved from one run and checked against another to catch rendering
+changes.
+
+Without a seed everything behaves as before: the streams are the global
+random module and time is wall-clock time.
+"""
+
+import json
+import random
+import hashlib
+from typing import Dict, List, Optional
+
+import pygame
+
+from hacker_logging import get_logger
+
+log = get_logger()
+
+RECORDING_VERSION = 1
+RECORDED_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+EVENT_NAMES = {pygame.KEYDOWN: "keydown", pygame.KEYUP: "keyup"}
+EVENT_TYPES = {name: event_type for event_type, name in EVENT_NAMES.items()}
+
+
+class RandomStreams:
+    """Independent random number generators per subsystem"""
+
+    def __init__(self, seed: Optional[int] = None):
+        self.seed = seed
+        self.streams: Dict[str, random.Random] = {}
+
+    def get(self, name: str):
+        """Generator for one subsystem (the global random module when unseeded)"""
+        if self.seed is None:
+            return random
+        stream = self.streams.get(name)
+        if stream is None:
+            # String seeds are hashed with SHA-512, so they're stable across runs and platforms
+            stream = self.streams[name] = random.Random(f"{self.seed}:{name}")
+        return stream
+
+
+class WallClock:
+    """Real time - pygame's clock and tick counter"""
+
+    def __init__(self):
+        self.clock = pygame.time.Clock()
+
+    def tick(self, framerate: int = 0) -> int:
+        return self.clock.tick(framerate)
+
+    def get_ticks(self) -> int:
+        return pygame.time.get_ticks()
+
+    def get_fps(self) -> float:
+        return self.clock.get_fps()
+
+
+class SimulatedClock(WallClock):
+    """Time that advances exactly one frame step per tick, however long frames really take"""
+
+    def __init__(self, fps: int = 60):
+        super().__init__()
+        self.step_ms = 1000 / fps
+        self.frame = 0
+
+    def tick(self, framerate: int = 0) -> int:
+        self.clock.tick(framerate)  # Still pace the real frames
+        self.frame += 1
+        return int(self.step_ms)
+
+    def get_ticks(self) -> int:
+        return int(self.frame * self.step_ms)
+
+
+class InputRecorder:
+    """Saves keyboard events with the frame they arrived on"""
+
+    def __init__(self, path: str, seed: int):
+        self.path = path
+        self.seed = seed
+        self.frame = 0
+        self.events: List[List] = []
+
+    def events_for_frame(self, events: List[pygame.event.Event]) -> List[pygame.event.Event]:
+        for event in events:
+            if event.type in RECORDED_EVENTS:
+                self.events.append([self.frame, EVENT_NAMES[event.type],
+                                    {"key": event.key, "mod": event.mod,
+                                     "unicode": getattr(event, "unicode", ""),
+                                     "scancode": getattr(event, "scancode", 0)}])
+        self.frame += 1
+        return events
+
+    def close(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump({"version": RECORDING_VERSION, "seed": self.seed, "frames": self.frame,
+                       "events": self.events}, f)
+        log.info(f"Recorded {len(self.events)} key events over {self.frame} frames to {self.path}")
+
+
+class InputReplayer:
+    """Feeds recorded keyboard events back in on the same frames"""
+
+    def __init__(self, path: str):
+        with open(path, encoding="utf-8") as f:
+            recording = json.load(f)
+        if recording.get("version") != RECORDING_VERSION:
+            raise ValueError(f"{path}: unsupported recording version {recording.get('version')}")
+        self.path = path
+        self.seed = recording["seed"]
+        self.frames = recording["frames"]
+        self.frame = 0
+        self.pending = [(frame, EVENT_TYPES[name], attributes)
+                        for frame, name, attributes in reversed(recording["events"])]
+
+    def events_for_frame(self, events: List[pygame.event.Event]) -> List[pygame.event.Event]:
+        # Live keys would change the run; closing the window still works
+        events = [event for event in events if event.type not in RECORDED_EVENTS]
+        while self.pending and self.pending[-1][0] <= self.frame:
+            _, event_type, attributes = self.pending.pop()
+            events.append(pygame.event.Event(event_type, attributes))
+        if self.frame >= self.frames:
+            events.append(pygame.event.Event(pygame.QUIT))
+        self.frame += 1
+        return events
+
+    def close(self):
+        log.info(f"Replayed {min(self.frame, self.frames)} of {self.frames} frames from {self.path}")
+
+
+class FrameHasher:
+    """Hashes every frame, saving the hashes and/or checking them against a reference run"""
+
+    def __init__(self, output_path: Optional[str] = None, reference_path: Optional[str] = None):
+        self.output_path = output_path
+        self.hashes: List[str] = []
+        self.reference: Optional[List[str]] = None
+        self.mismatches = 0
+        self.first_mismatch: Optional[int] = None
+        if reference_path:
+            with open(reference_path, encoding="utf-8") as f:
+                self.reference = [line.split()[1] for line in f if line.strip()]
+
+    def add(self, screen: pygame.Surface):
+        frame = len(self.hashes)
+        digest = hashlib.blake2b(pygame.image.tobytes(screen, "RGB"), digest_size=8).hexdigest()
+        self.hashes.append(digest)
+        if self.reference is not None and frame < len(self.reference) and self.reference[frame] != digest:
+            self.mismatches += 1
+            if self.first_mismatch is None:
+                self.first_mismatch = frame
+                log.warning(f"Frame {frame} differs from the reference run")
+
+    def close(self):
+        if self.output_path:
+            with open(self.output_path, "w", encoding="utf-8") as f:
+                f.writelines(f"{frame} {digest}\n" for frame, digest in enumerate(self.hashes))
+            log.info(f"Wrote {len(self.hashes)} frame hashes to {self.output_path}")
+        if self.reference is not None:
+            compared = min(len(self.hashes), len(self.reference))
+            if self.mismatches:
+                log.warning(f"{self.mismatches} of {compared} frames differ from the reference run "
+                            f"(first at frame {self.first_mismatch})")
+            else:
+                log.info(f"All {compared} frames match the reference run")
+
+
+class Session:
+    """Randomness, time, input and frame checks for one run"""
+
+    def __init__(self, options, fps: int = 60):
+        seed = getattr(options, "seed", None)
+        self.input = None
+        replay_path = getattr(options, "replay_input", None)
+        record_path = getattr(options, "record_input", None)
+        if replay_path:
+            self.input = InputReplayer(replay_path)
+            if seed is None:
+                seed = self.input.seed
+        elif record_path:
+            if seed is None:
+                seed = random.randrange(2**32)  # A recording is only replayable with a fixed seed
+            self.input = InputRecorder(record_path, seed)
+
+        self.seed = seed
+        self.deterministic = seed is not None
+        self.streams = RandomStreams(seed)
+        self.clock = SimulatedClock(fps) if self.deterministic else WallClock()
+
+        hashes_path = getattr(options, "frame_hashes", None)
+        check_path = getattr(options, "check_frames", None)
+        self.hasher = FrameHasher(hashes_path, check_path) if hashes_path or check_path else None
+
+        if self.deterministic:
+            log.info(f"Deterministic mode: seed {seed}")
+
+    def rng(self, name: str):
+        """Random stream for one subsystem"""
+        return self.streams.get(name)
+
+    def events(self) -> List[pygame.event.Event]:
+        """This frame's events, recorded or replayed as configured"""
+        events = pygame.event.get()
+        if self.input is not None:
+            events = self.input.events_for_frame(events)
+        return events
+
+    def end_frame(self, screen: pygame.Surface):
+        """Call after each flip"""
+        if self.hasher is not None:
+            self.hasher.add(screen)
+
+    def close(self):
+        if self.input is not None:
+            self.input.close()
+        if self.hasher is not None:
+            self.hasher.close()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Display Format Module
+=====================
+
+Helpers that convert loaded surfaces into the display's native pixel
+format so blits don't pay a per-pixel conversion, and a watcher that
+re-runs the conversion when the display mode changes.
+"""
+
+import pygame
+from typing import Callable, List, Optional
+
+
+def has_transparency(surface: pygame.Surface) -> bool:
+    """Check whether a surface actually uses its alpha channel or colorkey"""
+    if surface.get_colorkey() is not None:
+        return True
+    if not surface.get_flags() & pygame.SRCALPHA:
+        return False
+    alpha = pygame.surfarray.pixels_alpha(surface)
+    transparent = int(alpha.min()) < 255
+    del alpha  # Release the surface lock
+    return transparent
+
+
+def convert_for_display(surface: pygame.Surface) -> pygame.Surface:
+    """Convert a surface to the display format, keeping alpha only if it is used"""
+    if has_transparency(surface):
+        return surface.convert_alpha()
+    return surface.convert()
+
+
+def display_signature() -> Optional[tuple]:
+    """Describe the current display format, or None if there is no display"""
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    return (display.get_size(), display.get_bitsize(), display.get_masks())
+
+
+class DisplayFormatWatcher:
+    def __init__(self):
+        self.signature = None
+        self.callbacks: List[Callable[[], None]] = []
+
+    def on_change(self, callback: Callable[[], None]):
+        """Register a conversion pass to run whenever the display format changes"""
+        self.callbacks.append(callback)
+
+    def check(self) -> bool:
+        """Run the conversion passes if the display format changed since last check"""
+        signature = display_signature()
+        if signature is None or signature == self.signature:
+            return False
+        self.signature = signature
+        for callback in self.callbacks:
+            callback()
+        return True
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Folder Watcher Module
+=====================
+
+Watches a folder for added, changed and removed image files from a
+background thread. Uses inotify on Linux and falls back to polling file
+modification times everywhere else (or if inotify isn't available).
+
+Changes are queued as (kind, path) pairs with kind being "added",
+"changed" or "removed", and collected on the main thread with drain().
+"""
+
+import os
+import sys
+import queue
+import select
+import struct
+import ctypes
+import ctypes.util
+import fnmatch
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# inotify flags from <sys/inotify.h>
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_IGNORED = 0x00008000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF
+EVENT_HEADER = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+
+class FolderWatcher:
+    def __init__(self, folder: str, patterns: Iterable[str], poll_interval: float = 1.0,
+                 use_inotify: bool = True):
+        self.folder = folder
+        self.patterns = tuple(patterns)
+        self.poll_interval = poll_interval
+        self.use_inotify = use_inotify and sys.platform.startswith("linux")
+        self.mode = None  # "inotify" or "polling" once started
+        self.changes = queue.Queue()
+        self.snapshot: Dict[str, Tuple[int, int]] = {}
+        self.stop_event = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+
+    def matches(self, name: str) -> bool:
+        return any(fnmatch.fnmatchcase(name, pattern) for pattern in self.patterns)
+
+    def scan(self) -> Dict[str, Tuple[int, int]]:
+        """Current (mtime, size) of every matching file"""
+        files = {}
+        try:
+            entries = list(os.scandir(self.folder))
+        except OSError:
+            return files
+        for entry in entries:
+            if not self.matches(entry.name):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            if entry.is_file():
+                files[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def start(self):
+        """Take the initial snapshot and start watching in the background"""
+        self.snapshot = self.scan()
+        self.thread = threading.Thread(target=self.run, name="folder-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(timeout=2)
+
+    def drain(self) -> List[Tuple[str, str]]:
+        """Changes seen since the last call (never blocks)"""
+        changes = []
+        while True:
+            try:
+                changes.append(self.changes.get_nowait())
+            except queue.Empty:
+                return changes
+
+    def run(self):
+        if self.use_inotify and self.run_inotify():
+            return
+        self.run_polling()
+
+    def run_polling(self):
+        """Compare folder snapshots every poll_interval seconds"""
+        self.mode = "polling"
+        while not self.stop_event.wait(self.poll_interval):
+            current = self.scan()
+            for path, stamp in current.items():
+                if path not in self.snapshot:
+                    self.changes.put(("added", path))
+                elif self.snapshot[path] != stamp:
+                    self.changes.put(("changed", path))
+            for path in self.snapshot:
+                if path not in current:
+                    self.changes.put(("removed", path))
+            self.snapshot = current
+
+    def run_inotify(self) -> bool:
+        """Watch with inotify; returns False if it couldn't be set up or the folder went away"""
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+            fd = libc.inotify_init1(IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return False
+        if fd < 0:
+            return False
+        if libc.inotify_add_watch(fd, os.fsencode(self.folder), WATCH_MASK) < 0:
+            os.close(fd)
+            return False
+
+        self.mode = "inotify"
+        try:
+            while not self.stop_event.is_set():
+                ready, _, _ = select.select([fd], [], [], 0.5)
+                if not ready:
+                    continue
+                data = os.read(fd, 64 * 1024)
+                offset = 0
+                while offset < len(data):
+                    wd, mask, cookie, length = EVENT_HEADER.unpack_from(data, offset)
+                    offset += EVENT_HEADER.size
+                    name = data[offset:offset + length].rstrip(b"\0").decode(sys.getfilesystemencoding(), "replace")
+                    offset += length
+                    if mask & (IN_DELETE_SELF | IN_MOVE_SELF | IN_IGNORED):
+                        return False  # Watched folder is gone - keep going by polling
+                    self.handle_event(name, mask)
+        finally:
+            os.close(fd)
+        return True
+
+    def handle_event(self, name: str, mask: int):
+        """Turn one inotify event into an added/changed/removed change"""
+        if not name or not self.matches(name):
+            return
+        path = os.path.join(self.folder, name)
+        if mask & (IN_DELETE | IN_MOVED_FROM):
+            if self.snapshot.pop(path, None) is not None:
+                self.changes.put(("removed", path))
+        elif mask & (IN_CLOSE_WRITE | IN_MOVED_TO):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return
+            kind = "changed" if path in self.snapshot else "added"
+            self.snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+            self.changes.put((kind, path))
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Frame Pacer Module
+==================
+
+Holds the render loop to a steady frame rate. pygame's Clock.tick sleeps
+for whatever is left of the frame, and OS sleeps overshoot by a
+millisecond or more, so frame intervals wobble and the Matrix rain and
+radar sweep stutter. The pacer schedules frames against absolute
+deadlines and can wait in several ways:
+
+- sleep: plain sleep until the deadline (lowest CPU, least precise; the
+  default)
+- hybrid: sleep until shortly before the deadline, then spin
+- busy: pygame's Clock.tick_busy_loop
+- vsync: let a vsynced flip do the waiting (falls back to hybrid if the
+  display can't vsync)
+
+Frame intervals are measured continuously; the jitter statistics can be
+printed at exit or shown in an on-screen overlay.
+"""
+
+import math
+import time
+from collections import deque
+from typing import Optional, Tuple
+
+import pygame
+
+from hacker_logging import get_logger
+from options import DEFAULT_FPS, DEFAULT_STRATEGY, PACING_STRATEGIES
+
+log = get_logger()
+
+SPIN_MS = 2.0  # Hybrid pacing spins for the last part of each frame
+VSYNC_CHECK_FRAMES = 30  # Frames to watch before trusting that flips really wait for vsync
+MISSED_FACTOR = 1.5  # A frame that takes 1.5x the target interval counts as a missed deadline
+
+
+class FrameStats:
+    """Frame interval statistics for the whole run and a recent window"""
+
+    def __init__(self, target_ms: float, window: int = 120):
+        self.target_ms = target_ms
+        self.recent = deque(maxlen=window)
+        self.frames = 0
+        self.missed = 0
+        self.max_ms = 0.0
+        self.mean_ms = 0.0
+        self.m2 = 0.0  # Running sum of squared deviations (Welford)
+
+    def add(self, interval_ms: float):
+        self.recent.append(interval_ms)
+        self.frames += 1
+        delta = interval_ms - self.mean_ms
+        self.mean_ms += delta / self.frames
+        self.m2 += delta * (interval_ms - self.mean_ms)
+        self.max_ms = max(self.max_ms, interval_ms)
+        if interval_ms > self.target_ms * MISSED_FACTOR:
+            self.missed += 1
+
+    @property
+    def stddev_ms(self) -> float:
+        return math.sqrt(self.m2 / (self.frames - 1)) if self.frames > 1 else 0.0
+
+    def recent_stats(self) -> Tuple[float, float, float]:
+        """(mean, stddev, max) over the recent window"""
+        if not self.recent:
+            return 0.0, 0.0, 0.0
+        mean = sum(self.recent) / len(self.recent)
+        variance = sum((value - mean) ** 2 for value in self.recent) / max(1, len(self.recent) - 1)
+        return mean, math.sqrt(variance), max(self.recent)
+
+    def summary(self) -> str:
+        fps = 1000 / self.mean_ms if self.mean_ms else 0.0
+        return (f"Frame pacing: {self.frames} frames at {fps:.1f} FPS, "
+                f"interval {self.mean_ms:.2f} ms mean, {self.stddev_ms:.2f} ms stddev, "
+                f"{self.max_ms:.1f} ms max (target {self.target_ms:.2f} ms), "
+                f"{self.missed} missed deadlines")
+
+
+class FramePacer:
+    """Waits out the rest of each frame with the chosen strategy"""
+
+    def __init__(self, fps: int = DEFAULT_FPS, strategy: str = DEFAULT_STRATEGY, clock=None):
+        if strategy not in PACING_STRATEGIES:
+            raise ValueError(f"unknown pacing strategy: {strategy}")
+        self.fps = fps
+        self.strategy = strategy
+        self.period = 1.0 / fps if fps > 0 else 0.0
+        self.clock = clock  # Program clock to advance once per frame (e.g. the simulated clock)
+        self.busy_clock = pygame.time.Clock()
+        self.stats = FrameStats(self.period * 1000 if self.period else 1000 / DEFAULT_FPS)
+        self.deadline: Optional[float] = None
+        self.last_frame: Optional[float] = None
+
+        self.show_overlay = False
+        self.overlay_surface: Optional[pygame.Surface] = None
+        self.overlay_frame = 0
+
+    def set_mode(self, size: Tuple[int, int], flags: int = 0) -> pygame.Surface:
+        """Open the display, asking for vsync when that strategy is selected"""
+        if self.strategy == "vsync":
+            try:
+                # SDL only vsyncs through its renderer, which pygame uses for SCALED displays.
+                # SCALED needs a real size, so (0, 0) becomes the desktop size.
+                scaled_size = size
+                if size == (0, 0):
+                    scaled_size = pygame.display.get_desktop_sizes()[0]
+                return pygame.display.set_mode(scaled_size, flags | pygame.SCALED, vsync=1)
+            except pygame.error as e:
+                log.warning(f"Vsync not available ({e}), using hybrid frame pacing")
+                self.strategy = "hybrid"
+        return pygame.display.set_mode(size, flags)
+
+    def wait(self) -> float:
+        """End the frame: wait until the next one is due and return the measured interval in ms"""
+        if self.strategy == "busy":
+            self.busy_clock.tick_busy_loop(self.fps)
+        elif self.strategy in ("sleep", "hybrid") and self.period:
+            now = time.perf_counter()
+            if self.deadline is None or now > self.deadline + self.period:
+                # First frame, or too far behind to catch up - start a fresh schedule
+                self.deadline = now + self.period
+            self.wait_until(self.deadline)
+            self.deadline += self.period
+        # vsync: the flip already waited for the display
+
+        now = time.perf_counter()
+        interval = 0.0
+        if self.last_frame is not None:
+            interval = (now - self.last_frame) * 1000
+            self.stats.add(interval)
+        self.last_frame = now
+        if self.strategy == "vsync" and self.stats.frames == VSYNC_CHECK_FRAMES and self.period:
+            if self.stats.mean_ms < self.stats.target_ms * 0.8:
+                # The driver accepted vsync but flips don't wait (e.g. a headless or virtual display)
+                log.warning("Display flips are not vsynced, using hybrid frame pacing")
+                self.strategy = "hybrid"
+        if self.clock is not None:
+            self.clock.tick()
+        return interval
+
+    def wait_until(self, deadline: float):
+        if self.strategy == "hybrid":
+            remaining = deadline - time.perf_counter() - SPIN_MS / 1000
+            if remaining > 0:
+                time.sleep(remaining)
+            while time.perf_counter() < deadline:
+                pass
+        else:
+            remaining = deadline - time.perf_counter()
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def resync(self):
+        """Forget the schedule after the loop was deliberately paused"""
+        self.deadline = None
+        self.last_frame = None
+
+    def toggle_overlay(self):
+        self.show_overlay = not self.show_overlay
+        self.overlay_surface = None
+
+    def draw_overlay(self, screen: pygame.Surface, font: pygame.font.Font, position: Tuple[int, int] = (10, 10)):
+        """Show recent pacing stats; the text is re-rendered twice a second, not every frame"""
+        if not self.show_overlay:
+            return
+        self.overlay_frame += 1
+        if self.overlay_surface is None or self.overlay_frame >= (self.fps or DEFAULT_FPS) // 2:
+            self.overlay_frame = 0
+            mean, stddev, worst = self.stats.recent_stats()
+            fps = 1000 / mean if mean else 0.0
+            text = (f"{self.strategy} {fps:5.1f} FPS  {mean:5.2f} ms  "
+                    f"jitter {stddev:4.2f} ms  max {worst:5.1f} ms  missed {self.stats.missed}")
+            self.overlay_surface = font.render(text, True, (255, 255, 0), (0, 0, 0))
+        screen.blit(self.overlay_surface, position)
@@ -11,12 +11,62 @@ import pygame
 import math
 import random
 import numpy as np
+from dataclasses import dataclass
 from typing import List, Tuple
 
+from resource_registry import track
+
+STREAM_BINS = 64  # Values per data stream sample (rows of the waterfall)
+STREAM_CAPACITY = 512  # Samples kept, the widest waterfall that can be redrawn from history
+# Waterfall colors from quiet to loud; interpolated into a 256-entry lookup table
+STREAM_PALETTE = ((0, (0, 0, 0)), (90, (0, 70, 0)), (170, (0, 200, 40)), (230, (180, 255, 60)),
+                  (255, (255, 255, 255)))
+
+
+class RingBuffer:
+    """Fixed-size buffer of samples (rows); the oldest are overwritten"""
+
+    def __init__(self, capacity: int, width: int, dtype=np.uint8):
+        self.data = np.zeros((capacity, width), dtype=dtype)
+        self.total = 0  # Samples pushed so far
+
+    def push(self, sample: np.ndarray):
+        self.data[self.total % len(self.data)] = sample
+        self.total += 1
+
+    def latest(self, count: int) -> np.ndarray:
+        """The last `count` samples, oldest first"""
+        count = min(count, self.total, len(self.data))
+        end = self.total % len(self.data)
+        indices = np.arange(end - count, end) % len(self.data)
+        return self.data[indices]
+
+    def copy(self) -> "RingBuffer":
+        """Read-only copy for a snapshot"""
+        snapshot = RingBuffer.__new__(RingBuffer)
+        snapshot.data = self.data.copy()
+        snapshot.data.flags.writeable = False
+        snapshot.total = self.total
+        return snapshot
+
+
+@dataclass(frozen=True)
+class GraphState:
+    """Immutable copy of the animated graph data for one frame"""
+    cpu_data: Tuple[float, ...]
+    memory_data: Tuple[float, ...]
+    network_data: Tuple[float, ...]
+    time_counter: int
+    pulse_radius: int
+    stream: RingBuffer
+
+
 class GraphAnimations:
-    def __init__(self, screen_width: int, screen_height: int):
+    def __init__(self, screen_width: int, screen_height: int, rng=None, draw_rng=None):
         self.screen_width = screen_width
         self.screen_height = screen_height
+        self.rng = rng or random  # Seeded stream in deterministic mode
+        self.draw_rng = draw_rng or self.rng  # Draw-time randomness (radar blips), kept apart from the data
         
         # Colors
         self.GREEN = (0, 255, 0)
@@ -37,6 +87,13 @@ class GraphAnimations:
         self.time_counter = 0
         self.pulse_radius = 0
         self.pulse_growing = True
+        self.grid_cache = {}  # Graph box -> precomputed grid polylines
+        
+        # Data stream samples and the waterfalls drawn from them
+        self.stream = RingBuffer(STREAM_CAPACITY, STREAM_BINS)
+        self.stream_rng = np.random.default_rng(self.rng.getrandbits(64))
+        self.stream_bins = np.arange(STREAM_BINS)
+        self.waterfalls = {}  # Plot size -> Waterfall
         
     def update(self):
         """Update all graph animations"""
@@ -49,19 +106,35 @@ class GraphAnimations:
                 self.pulse_growing = False
         else:
             self.pulse_radius -= 2
-            if self.pulse_radius < 0:
+            if self.pulse_radius <= 0:
+                self.pulse_radius = 0  # A negative radius can't size the pulse surface
                 self.pulse_growing = True
         
         # Update data arrays
         self.update_cpu_data()
         self.update_memory_data()
         self.update_network_data()
+        self.update_data_stream()
+    
+    def state(self) -> GraphState:
+        """Snapshot of the data the draw methods read"""
+        return GraphState(tuple(self.cpu_data), tuple(self.memory_data), tuple(self.network_data),
+                          self.time_counter, self.pulse_radius, self.stream.copy())
+    
+    def load_state(self, state: GraphState):
+        """Draw from a snapshot made by another instance (the pipelined simulation)"""
+        self.cpu_data = state.cpu_data
+        self.memory_data = state.memory_data
+        self.network_data = state.network_data
+        self.time_counter = state.time_counter
+        self.pulse_radius = state.pulse_radius
+        self.stream = state.stream
     
     def update_cpu_data(self):
         """Update CPU usage simulation"""
         # Simulate realistic CPU usage with some randomness
         base_usage = 30 + 20 * math.sin(self.time_counter * 0.1)
-        noise = random.uniform(-10, 10)
+        noise = self.rng.uniform(-10, 10)
         cpu_usage = max(0, min(100, base_usage + noise))
         
         self.cpu_data.append(cpu_usage)
@@ -71,7 +144,7 @@ class GraphAnimations:
     def update_memory_data(self):
         """Update memory usage simulation"""
         base_usage = 50 + 15 * math.sin(self.time_counter * 0.05)
-        noise = random.uniform(-5, 5)
+        noise = self.rng.uniform(-5, 5)
         memory_usage = max(0, min(100, base_usage + noise))
         
         self.memory_data.append(memory_usage)
@@ -81,13 +154,26 @@ class GraphAnimations:
     def update_network_data(self):
         """Update network traffic simulation"""
         base_traffic = 40 + 30 * math.sin(self.time_counter * 0.08)
-        noise = random.uniform(-15, 15)
+        noise = self.rng.uniform(-15, 15)
         network_traffic = max(0, min(100, base_traffic + noise))
         
         self.network_data.append(network_traffic)
         if len(self.network_data) > self.max_data_points:
             self.network_data.pop(0)
     
+    def update_data_stream(self):
+        """Push one spectrum-like sample: noise plus two drifting peaks, louder with network traffic"""
+        t = self.time_counter
+        traffic = self.network_data[-1] / 100 if self.network_data else 0.5
+        first = STREAM_BINS * (0.5 + 0.35 * math.sin(t * 0.03))
+        second = STREAM_BINS * (0.25 + 0.2 * math.sin(t * 0.05 + 1))
+        sample = 0.1 + 0.2 * self.stream_rng.random(STREAM_BINS)
+        sample += 0.8 * np.exp(-((self.stream_bins - first) / 3) ** 2)
+        sample += (0.3 + 0.5 * traffic) * np.exp(-((self.stream_bins - second) / 2) ** 2)
+        if self.stream_rng.random() < 0.05:
+            sample[self.stream_rng.integers(STREAM_BINS)] = 1.0  # Burst
+        self.stream.push(np.clip(sample * 255, 0, 255).astype(np.uint8))
+    
     def draw_system_monitor(self, screen: pygame.Surface, x: int, y: int, width: int, height: int):
         """Draw a system monitoring dashboard"""
         # Background
@@ -111,6 +197,28 @@ class GraphAnimations:
         self.draw_line_graph(screen, x + 10, y + 220, width - 20, 80, 
                            self.network_data, self.YELLOW, "Network Traffic")
     
+    def grid_lines(self, x: int, y: int, width: int, height: int, spacing: int = 20):
+        """Grid for a graph box as two zigzag polylines, one vertical and one horizontal
+
+        Consecutive grid lines are joined along the box edges, where the
+        border is drawn over the joins, so each set is a single draw call.
+        """
+        key = (x, y, width, height, spacing)
+        cached = self.grid_cache.get(key)
+        if cached is None:
+            top, bottom = y, y + height - 1
+            left, right = x, x + width - 1
+            vertical = []
+            for n, i in enumerate(range(0, width, spacing)):
+                ends = [(x + i, top), (x + i, bottom)]
+                vertical.extend(ends if n % 2 == 0 else reversed(ends))
+            horizontal = []
+            for n, i in enumerate(range(0, height, spacing)):
+                ends = [(left, y + i), (right, y + i)]
+                horizontal.extend(ends if n % 2 == 0 else reversed(ends))
+            cached = self.grid_cache[key] = (vertical, horizontal)
+        return cached
+    
     def draw_line_graph(self, screen: pygame.Surface, x: int, y: int, width: int, height: int, 
                        data: List[float], color: Tuple[int, int, int], label: str):
         """Draw a line graph with the given data"""
@@ -122,16 +230,13 @@ class GraphAnimations:
         label_surface = font.render(label, True, self.WHITE)
         screen.blit(label_surface, (x, y - 20))
         
-        # Draw graph background
+        # Draw graph background, grid lines (two precomputed polylines), then the border over them
         pygame.draw.rect(screen, (20, 20, 20), (x, y, width, height))
+        vertical, horizontal = self.grid_lines(x, y, width, height)
+        pygame.draw.lines(screen, (40, 40, 40), False, vertical)
+        pygame.draw.lines(screen, (40, 40, 40), False, horizontal)
         pygame.draw.rect(screen, self.GRAY, (x, y, width, height), 1)
         
-        # Draw grid lines
-        for i in range(0, width, 20):
-            pygame.draw.line(screen, (40, 40, 40), (x + i, y), (x + i, y + height))
-        for i in range(0, height, 20):
-            pygame.draw.line(screen, (40, 40, 40), (x, y + i), (x + width, y + i))
-        
         # Draw data line
         if len(data) > 1:
             points = []
@@ -175,9 +280,9 @@ class GraphAnimations:
         pygame.draw.line(screen, self.BRIGHT_GREEN, (center_x, center_y), (end_x, end_y), 2)
         
         # Draw random blips
-        for _ in range(random.randint(2, 5)):
-            blip_angle = random.uniform(0, 2 * math.pi)
-            blip_distance = random.uniform(0.3, 0.9) * radius
+        for _ in range(self.draw_rng.randint(2, 5)):
+            blip_angle = self.draw_rng.uniform(0, 2 * math.pi)
+            blip_distance = self.draw_rng.uniform(0.3, 0.9) * radius
             blip_x = center_x + int(blip_distance * math.cos(blip_angle))
             blip_y = center_y + int(blip_distance * math.sin(blip_angle))
             pygame.draw.circle(screen, self.YELLOW, (blip_x, blip_y), 2)
@@ -195,7 +300,7 @@ class GraphAnimations:
             screen.blit(pulse_surface, (center_x - radius, center_y - radius))
     
     def draw_data_stream(self, screen: pygame.Surface, x: int, y: int, width: int, height: int):
-        """Draw a data stream visualization"""
+        """Draw the data stream as a scrolling waterfall, newest samples on the right"""
         # Background
         pygame.draw.rect(screen, (0, 0, 0), (x, y, width, height))
         pygame.draw.rect(screen, self.GREEN, (x, y, width, height), 1)
@@ -205,14 +310,54 @@ class GraphAnimations:
         title = font.render("DATA STREAM", True, self.BRIGHT_GREEN)
         screen.blit(title, (x + 10, y + 10))
         
-        # Draw streaming data
-        for i in range(0, width - 20, 30):
-            data_height = random.randint(10, height - 40)
-            data_y = y + height - data_height - 20
-            pygame.draw.rect(screen, self.GREEN, (x + 10 + i, data_y, 20, data_height))
-            
-            # Add some sparkle effect
-            if random.random() < 0.1:
-                sparkle_x = x + 10 + i + 10
-                sparkle_y = data_y + random.randint(0, data_height)
-                pygame.draw.circle(screen, self.WHITE, (sparkle_x, sparkle_y), 1)
+        # Waterfall
+        size = (width - 20, height - 40)
+        if size[0] <= 0 or size[1] <= 0:
+            return
+        waterfall = self.waterfalls.get(size)
+        if waterfall is None:
+            waterfall = self.waterfalls[size] = Waterfall(size)
+        waterfall.update(self.stream)
+        screen.blit(waterfall.surface, (x + 10, y + 30))
+
+
+class Waterfall:
+    """Backing surface of a waterfall panel, one column per sample
+
+    New samples scroll the surface left in place and only the new columns
+    are written, through surfarray and a palette lookup table, so a frame
+    costs the same however wide the panel is.
+    """
+    
+    def __init__(self, size: Tuple[int, int]):
+        self.surface = track(pygame.Surface(size, depth=32), "data_stream", "graphs")
+        self.surface.fill((0, 0, 0))
+        self.drawn = 0  # Stream samples already on the surface
+        # Row -> sample bin, low bins at the bottom
+        self.rows = (np.arange(size[1]) * STREAM_BINS // size[1])[::-1]
+        # Level (0-255) -> pixel value in the surface's format
+        levels = np.arange(256)
+        stops = [level for level, _ in STREAM_PALETTE]
+        channels = [np.interp(levels, stops, [color[c] for _, color in STREAM_PALETTE]) for c in range(3)]
+        self.palette = np.array([self.surface.map_rgb((int(r), int(g), int(b)))
+                                 for r, g, b in zip(*channels)], dtype=np.uint32)
+    
+    def update(self, stream: RingBuffer):
+        """Scroll in the samples pushed since the last update"""
+        width = self.surface.get_width()
+        new = stream.total - self.drawn
+        if new < 0:  # A different stream; start over
+            new = stream.total
+        if new == 0:
+            return
+        # Samples the ring buffer has already overwritten are skipped, so the scroll never leaves a gap
+        columns = stream.latest(min(new, width))[:, self.rows]  # (samples, rows) of levels
+        new = len(columns)
+        if new == width:
+            self.surface.fill((0, 0, 0))  # Everything on it scrolls out
+        else:
+            self.surface.scroll(-new, 0)
+        pixels = pygame.surfarray.pixels2d(self.surface)
+        pixels[width - len(columns):] = self.palette[columns]
+        del pixels  # Unlock the surface for blitting
+        self.drawn = stream.total
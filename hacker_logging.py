@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Logging Module for FunHackerMode
+================================
+
+Queue-based logging so the render loop never waits on console or file
+I/O. Log calls only put the record on a queue; formatting and writing
+happen on a background listener thread.
+
+Debug output is split into channels (popups, placement, loader) that are
+off unless asked for, and debug records carry structured key=value fields.
+"""
+
+import sys
+import queue
+import atexit
+import logging
+import logging.handlers
+from typing import Iterable, Optional
+
+LOGGER_NAME = "funhackermode"
+DEBUG_CHANNELS = ("popups", "placement", "loader")
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that leaves formatting to the listener thread"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            # Tracebacks can't be formatted later once the frame is gone
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class StructuredFormatter(logging.Formatter):
+    """Appends a record's structured fields as key=value pairs"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            text += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return text
+
+
+def get_logger(channel: Optional[str] = None) -> logging.Logger:
+    """Logger for the program or one of its channels"""
+    return logging.getLogger(f"{LOGGER_NAME}.{channel}" if channel else LOGGER_NAME)
+
+
+def log_event(logger: logging.Logger, level: int, message: str, **fields):
+    """Log a structured record; cheap no-op when the level is disabled"""
+    if logger.isEnabledFor(level):
+        logger.log(level, message, extra={"fields": fields})
+
+
+def setup_logging(level: str = "INFO", debug_channels: Iterable[str] = (),
+                  log_file: Optional[str] = None) -> logging.handlers.QueueListener:
+    """Route program logging through a background thread (safe to call more than once)"""
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    handlers = []
+    console = logging.StreamHandler(sys.stdout)
+    console.setFormatter(StructuredFormatter("%(message)s"))
+    handlers.append(console)
+    if log_file:
+        file_handler = logging.FileHandler(log_file, encoding="utf-8")
+        file_handler.setFormatter(StructuredFormatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+        handlers.append(file_handler)
+
+    log_queue = queue.SimpleQueue()
+    logger = get_logger()
+    root_level = getattr(logging, level.upper(), logging.INFO)
+    logger.setLevel(root_level)
+    logger.handlers = [DeferredQueueHandler(log_queue)]
+    logger.propagate = False
+
+    # Debug channels are opt-in even when the overall level is DEBUG; otherwise they
+    # inherit the overall level (NOTSET), so WARNING or ERROR quiets them too
+    debug_channels = set(debug_channels)
+    quiet_level = logging.INFO if root_level <= logging.DEBUG else logging.NOTSET
+    for channel in DEBUG_CHANNELS:
+        get_logger(channel).setLevel(logging.DEBUG if channel in debug_channels else quiet_level)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def shutdown_logging():
+    """Flush queued records and stop the listener thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Idle Scheduler Module
+=====================
+
+Lets a static scene stop the render loop. A scene that knows nothing on
+screen will change for the next N frames (a blue screen, a paused line of
+boot text) requests an idle period; instead of redrawing and flipping the
+same image 60 times a second, the loop blocks in pygame.event.wait until
+the next scheduled change or until input arrives, whichever comes first.
+
+Scenes keep counting time in frames: when the loop wakes up, each scene's
+resume callback is told how many frames were skipped.
+"""
+
+import math
+import time
+from typing import Callable, List, Optional
+
+import pygame
+
+UNTIL_INPUT = math.inf  # A scene that only changes on input
+MAX_IDLE_MS = 1000  # Wake at least this often so background loads and file changes are picked up
+
+
+class IdleScheduler:
+    """Blocks the loop through frames that static scenes say they don't need"""
+
+    def __init__(self, fps: int, enabled: bool = True):
+        self.frame_ms = 1000 / fps
+        self.enabled = enabled
+        self.frames: Optional[float] = None
+        self.callbacks: List[Callable[[int], None]] = []
+        self.idle_frames = 0
+        self.idle_seconds = 0.0
+
+    def request(self, frames: float, on_resume: Optional[Callable[[int], None]] = None):
+        """Declare the screen static until `frames` frames from now (the frame that changes is still drawn)"""
+        self.frames = frames if self.frames is None else min(self.frames, frames)
+        if on_resume is not None:
+            self.callbacks.append(on_resume)
+
+    def cancel(self):
+        """Something on screen is animating this frame after all"""
+        self.frames = None
+        self.callbacks.clear()
+
+    def wait(self, pacer=None) -> int:
+        """Sleep through the requested idle period; returns the number of frames skipped"""
+        frames, callbacks = self.frames, self.callbacks
+        self.frames, self.callbacks = None, []
+        if not self.enabled or frames is None or frames <= 1:
+            return 0
+        if pacer is not None and pacer.show_overlay:
+            return 0  # The stats overlay is live
+
+        timeout = int(min((frames - 1) * self.frame_ms, MAX_IDLE_MS))
+        started = time.perf_counter()
+        event = pygame.event.wait(timeout)
+        if event.type != pygame.NOEVENT:
+            # Put it back in front of anything queued behind it (a KEYUP after its KEYDOWN)
+            # for the regular event handling; posting doesn't pump, so nothing new slips in
+            queued = pygame.event.get(pump=False)
+            pygame.event.post(event)
+            for later in queued:
+                pygame.event.post(later)
+        elapsed = time.perf_counter() - started
+
+        skipped = int(min(frames - 1, elapsed * 1000 // self.frame_ms))
+        self.idle_frames += skipped
+        self.idle_seconds += elapsed
+        for callback in callbacks:
+            callback(skipped)
+        if pacer is not None:
+            pacer.resync()  # The pause isn't a missed frame
+        return skipped
+
+    def summary(self) -> str:
+        return f"Idle: {self.idle_frames} frames skipped, {self.idle_seconds:.1f} s blocked waiting for input"
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Image Loader Module
+===================
+
+Decodes and resizes images in a thread pool with Pillow so startup doesn't
+wait on one file at a time. Worker threads only produce raw pixel bytes;
+pygame surfaces are created on the main thread when results are polled.
+
+If Pillow isn't installed, the workers fall back to pygame's own loader.
+"""
+
+import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Hashable, List, Optional, Tuple
+
+import pygame
+
+from asset_manifest import fit_size
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+# Resampling used for all resizes (part of the cache key for scaled images)
+RESAMPLE = "bilinear"
+
+
+@dataclass
+class DecodedImage:
+    """Raw pixels produced by a worker thread"""
+    size: Tuple[int, int]
+    mode: str
+    data: bytes
+
+
+@dataclass
+class LoadedImage:
+    """A finished load, with surfaces created on the main thread"""
+    key: Hashable
+    path: str
+    original_size: Optional[Tuple[int, int]] = None
+    surface: Optional[pygame.Surface] = None
+    popup_surface: Optional[pygame.Surface] = None
+    error: Optional[Exception] = None
+
+
+def decode_image(path: str, max_size: Tuple[int, int], popup_size: Optional[Tuple[int, int]] = None,
+                 stretch: bool = False):
+    """Decode and resize one image file (runs on a worker thread)
+
+    Returns (original_size, image, popup_image) where the images are DecodedImage
+    records. With stretch=True the image is resized to exactly max_size.
+    """
+    if Image is None:
+        return decode_image_pygame(path, max_size, popup_size, stretch)
+
+    with Image.open(path) as image:
+        image.load()
+        has_alpha = image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info)
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    original_size = image.size
+    size = max_size if stretch else fit_size(original_size, max_size)
+    resample = Image.Resampling.BILINEAR
+    scaled = image.resize(size, resample)
+    popup = None
+    if popup_size is not None:
+        popup = image.resize(fit_size(size, popup_size), resample)
+
+    return (original_size,
+            DecodedImage(scaled.size, scaled.mode, scaled.tobytes()),
+            DecodedImage(popup.size, popup.mode, popup.tobytes()) if popup else None)
+
+
+def decode_image_pygame(path: str, max_size: Tuple[int, int], popup_size: Optional[Tuple[int, int]] = None,
+                        stretch: bool = False):
+    """Fallback decoder used when Pillow isn't available"""
+    image = pygame.image.load(path)
+    original_size = image.get_size()
+    size = max_size if stretch else fit_size(original_size, max_size)
+    scaled = pygame.transform.scale(image, size)
+    # From the original, like the Pillow path, so a popup larger than the scaled image isn't upscaled
+    popup = pygame.transform.scale(image, fit_size(size, popup_size)) if popup_size is not None else None
+
+    def to_decoded(surface):
+        return DecodedImage(surface.get_size(), "RGBA", pygame.image.tobytes(surface, "RGBA"))
+
+    return original_size, to_decoded(scaled), to_decoded(popup) if popup else None
+
+
+def to_surface(decoded: Optional[DecodedImage]) -> Optional[pygame.Surface]:
+    """Wrap decoded pixels in a pygame surface (main thread)"""
+    if decoded is None:
+        return None
+    return pygame.image.frombuffer(decoded.data, decoded.size, decoded.mode)
+
+
+class ImageLoader:
+    def __init__(self, workers: Optional[int] = None,
+                 progress_callback: Optional[Callable[[int, int, LoadedImage], None]] = None,
+                 cache=None):
+        self.workers = workers or min(8, os.cpu_count() or 1)
+        self.cache = cache  # Optional ThumbnailCache checked before decoding
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-loader")
+        self.progress_callback = progress_callback
+        self.completed = queue.Queue()
+        self.submitted = 0
+        self.finished = 0
+        self.futures = set()
+
+    def submit(self, key: Hashable, path: str, max_size: Tuple[int, int],
+               popup_size: Optional[Tuple[int, int]] = None, stretch: bool = False):
+        """Queue an image for decoding; key is handed back with the result"""
+        self.submitted += 1
+        future = self.executor.submit(self.load_job, path, max_size, popup_size, stretch)
+        self.futures.add(future)
+        future.add_done_callback(lambda f: self.completed.put((key, path, f)))
+
+    def load_job(self, path: str, max_size: Tuple[int, int], popup_size: Optional[Tuple[int, int]],
+                 stretch: bool):
+        """Worker thread job: read from the thumbnail cache or decode and store"""
+        if self.cache is None:
+            return decode_image(path, max_size, popup_size, stretch)
+
+        key = self.cache.key_for(path, max_size, popup_size, stretch, RESAMPLE)
+        cached = self.cache.load(key)
+        if cached is not None:
+            return cached
+        result = decode_image(path, max_size, popup_size, stretch)
+        self.cache.store(key, *result)
+        return result
+
+    @property
+    def pending(self) -> int:
+        return self.submitted - self.finished
+
+    def poll(self, limit: Optional[int] = None, timeout: Optional[float] = None) -> List[LoadedImage]:
+        """Turn finished decodes into surfaces; only blocks if timeout is given"""
+        results = []
+        while self.pending and (limit is None or len(results) < limit):
+            try:
+                if timeout is not None and not results:
+                    key, path, future = self.completed.get(timeout=timeout)
+                else:
+                    key, path, future = self.completed.get_nowait()
+            except queue.Empty:
+                break
+
+            self.futures.discard(future)
+            result = LoadedImage(key=key, path=path)
+            try:
+                result.original_size, image, popup = future.result()
+                result.surface = to_surface(image)
+                result.popup_surface = to_surface(popup)
+            except Exception as e:
+                result.error = e
+            self.finished += 1
+            results.append(result)
+            if self.progress_callback:
+                self.progress_callback(self.finished, self.submitted, result)
+        return results
+
+    def shutdown(self):
+        """Stop the worker threads, dropping anything not yet started"""
+        for future in list(self.futures):
+            future.cancel()
+        self.executor.shutdown(wait=False)
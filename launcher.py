@@ -7,11 +7,33 @@ A cool startup script that makes it look like you're launching
 some serious hacking software.
 """
 
+import startup_profile
+if startup_profile.requested():
+    # Before the other imports so they get timed too
+    startup_profile.enable("launcher")
+
 import os
 import sys
 import time
 import random
+import threading
 import subprocess
+import importlib.util
+
+from options import parse_options
+
+try:
+    from importlib import metadata as importlib_metadata
+except ImportError:  # Python < 3.8
+    importlib_metadata = None
+
+# Distribution name (what pip installs) -> module name (what Python imports)
+REQUIRED_PACKAGES = {
+    'pygame': 'pygame',
+    'numpy': 'numpy',
+    'matplotlib': 'matplotlib',
+    'Pillow': 'PIL',
+}
 
 def print_slow(text, delay=0.03):
     """Print text with a typing effect"""
@@ -61,6 +83,45 @@ def show_banner():
     """
     print_colored(banner, '\033[92m')  # Green color
 
+class Warmup:
+    """Gets the real program ready in the background while the boot text prints"""
+
+    def __init__(self):
+        self.main_module = None
+        self.sound_effects = None
+        self.error = None
+        self.thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+
+    def start(self):
+        if sys.platform == 'darwin':
+            # SDL has to initialize video on the main thread on macOS
+            self.run()
+        else:
+            self.thread.start()
+        return self
+
+    def run(self):
+        try:
+            import main  # Imports pygame and numpy
+            import pygame
+            # Only the mixer (for the sounds) and fonts here; pygame.init() and its video
+            # subsystem stay on the main thread, in FunHackerMode
+            pygame.mixer.init()
+            pygame.font.init()
+            from sound_effects import SoundEffects
+            self.sound_effects = SoundEffects()  # Synthesizing the sounds is the slow part
+            self.main_module = main
+        except Exception as e:
+            self.error = e
+
+    def wait(self):
+        """Block until warm-up is finished and return the main module"""
+        if self.thread.is_alive():
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+        return self.main_module
+
 def simulate_boot_sequence():
     """Simulate a boot sequence"""
     boot_messages = [
@@ -81,18 +142,29 @@ def simulate_boot_sequence():
     
     print()
 
+def probe_package(distribution, module):
+    """Look a package up without importing it; returns its version, '' if unknown, or None if missing"""
+    if importlib.util.find_spec(module) is None:
+        return None
+    if importlib_metadata is not None:
+        try:
+            return importlib_metadata.version(distribution)
+        except importlib_metadata.PackageNotFoundError:
+            pass  # Importable but not installed as a distribution (e.g. vendored)
+    return ''
+
 def check_dependencies():
     """Check if required dependencies are installed"""
     print_colored("Checking dependencies...", '\033[93m')  # Yellow
     
-    required_packages = ['pygame', 'numpy', 'matplotlib', 'Pillow']
     missing_packages = []
     
-    for package in required_packages:
-        try:
-            __import__(package)
-            print_colored(f"✓ {package} - OK", '\033[92m')
-        except ImportError:
+    for package, module in REQUIRED_PACKAGES.items():
+        version = probe_package(package, module)
+        if version is not None:
+            label = f"{package} {version}" if version else package
+            print_colored(f"✓ {label} - OK", '\033[92m')
+        else:
             print_colored(f"✗ {package} - MISSING", '\033[91m')
             missing_packages.append(package)
     
@@ -112,6 +184,8 @@ def check_dependencies():
 
 def main():
     """Main launcher function"""
+    options = parse_options(description="FunHackerMode Launcher")
+    startup_profile.configure(options)
     clear_screen()
     show_banner()
     
@@ -120,12 +194,16 @@ def main():
     print()
     
     # Check dependencies
-    if not check_dependencies():
+    with startup_profile.phase("dependency check"):
+        dependencies_ok = check_dependencies()
+    if not dependencies_ok:
         print_colored("Cannot proceed without required dependencies.", '\033[91m')
         return
     
     print()
-    simulate_boot_sequence()
+    warmup = Warmup().start()
+    with startup_profile.phase("boot sequence"):
+        simulate_boot_sequence()
     
     print_colored("Launching FunHackerMode...", '\033[92m')
     print_colored("Press Ctrl+C to exit at any time.", '\033[93m')
@@ -133,8 +211,9 @@ def main():
     
     # Launch the main program
     try:
-        import main
-        main.FunHackerMode().run()
+        with startup_profile.phase("warm-up wait"):
+            main = warmup.wait()
+        main.FunHackerMode(options, sound_effects=warmup.sound_effects).run()
     except KeyboardInterrupt:
         print_colored("\nFunHackerMode terminated by user.", '\033[93m')
     except Exception as e:
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Logo Pool Module for Simple Hacker Mode
+=======================================
+
+Keeps only a byte budget of decoded logo surfaces resident. The asset
+manifest is always in memory, but surfaces are loaded on demand through
+the background ImageLoader, prefetched from the upcoming shuffled order,
+and the least recently shown logos are evicted when over budget.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Iterable, Optional
+
+import pygame
+
+from asset_manifest import AssetManifest, LogoAsset
+from resource_registry import track
+
+
+def surface_bytes(surface: Optional[pygame.Surface]) -> int:
+    """Bytes of pixel memory held by a surface"""
+    if surface is None:
+        return 0
+    return surface.get_pitch() * surface.get_height()
+
+
+def asset_bytes(asset: LogoAsset) -> int:
+    """Bytes held by an asset's surfaces (the popup surface may be the same object)"""
+    total = surface_bytes(asset.surface)
+    if asset.popup_surface is not asset.surface:
+        total += surface_bytes(asset.popup_surface)
+    return total
+
+
+class LogoPool:
+    def __init__(self, manifest: AssetManifest, loader, budget_bytes: Optional[int] = None,
+                 prefetch_count: Optional[int] = 8):
+        self.manifest = manifest
+        self.loader = loader
+        self.budget_bytes = budget_bytes  # None means keep everything resident
+        self.prefetch_count = prefetch_count  # None means prefetch everything
+
+        self.resident = OrderedDict()  # index -> bytes, least recently shown first
+        self.resident_bytes = 0
+        self.requested = set()  # Indices submitted to the loader and not back yet
+        self.seen = set()  # Indices that finished loading (or failed) at least once
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, index: int) -> Optional[LogoAsset]:
+        """Asset ready to show, or None after queueing a load for it"""
+        asset = self.manifest[index]
+        if asset.loaded:
+            self.hits += 1
+            self.resident.move_to_end(index)
+            return asset
+        self.misses += 1
+        self.request(index)
+        return None
+
+    def request(self, index: int):
+        """Start loading an asset in the background if it isn't resident or on its way"""
+        asset = self.manifest[index]
+        if asset.loaded or not asset.available or index in self.requested:
+            return
+        self.requested.add(index)
+        self.loader.submit(("logo", index, asset.version), asset.path, asset.load_size, asset.target_popup_size)
+
+    def prefetch(self, indices: Iterable[int]):
+        """Queue loads for the next few assets that are about to be shown"""
+        wanted = 0
+        for index in indices:
+            if self.prefetch_count is not None and wanted >= self.prefetch_count:
+                break
+            self.request(index)
+            wanted += 1
+
+    def store(self, index: int, original_size, surface: pygame.Surface,
+              popup_surface: Optional[pygame.Surface] = None):
+        """Take a finished load and account for its memory"""
+        self.requested.discard(index)
+        self.seen.add(index)
+        asset = self.manifest[index]
+        asset.set_surfaces(original_size, surface, popup_surface)
+        self.account(index)
+        self.enforce_budget(keep=index)
+
+    def invalidate(self, index: int):
+        """Forget an asset whose file changed or was removed; loads already in flight are ignored"""
+        self.evict(index)
+        self.requested.discard(index)
+        self.seen.discard(index)
+        asset = self.manifest[index]
+        asset.version += 1
+        asset.failed = False
+        asset.original_size = None
+
+    def fail(self, index: int):
+        """Record an asset that could not be decoded"""
+        self.requested.discard(index)
+        self.seen.add(index)
+        self.manifest[index].failed = True
+
+    def account(self, index: int):
+        """(Re)count the bytes held by one resident asset"""
+        asset = self.manifest[index]
+        track(asset.surface, "logo_pool", "logos")
+        track(asset.popup_surface, "logo_pool", "logos")
+        nbytes = asset_bytes(asset)
+        self.resident_bytes += nbytes - self.resident.get(index, 0)
+        self.resident[index] = nbytes
+        self.resident.move_to_end(index)
+
+    def evict(self, index: int):
+        """Drop an asset's surfaces; on-screen popups keep their own copies"""
+        nbytes = self.resident.pop(index, None)
+        if nbytes is None:
+            return
+        self.resident_bytes -= nbytes
+        asset = self.manifest[index]
+        asset.surface = None
+        asset.popup_surface = None
+        self.evictions += 1
+
+    def enforce_budget(self, keep: Optional[int] = None):
+        """Evict least recently shown assets until under budget"""
+        if self.budget_bytes is None:
+            return
+        for index in list(self.resident):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if index != keep:
+                self.evict(index)
+
+    def trim(self, excess_bytes: int):
+        """Eviction callback for the resource registry: free excess_bytes, least recently shown first"""
+        for index in list(self.resident)[:-1]:  # The newest logo is about to be shown
+            if excess_bytes <= 0:
+                break
+            excess_bytes -= self.resident[index]
+            self.evict(index)
+
+    def convert(self, convert: Callable[[pygame.Surface], pygame.Surface]):
+        """Run a conversion pass over all resident surfaces"""
+        for index in list(self.resident):
+            asset = self.manifest[index]
+            asset.surface = convert(asset.surface)
+            if asset.keep_original_size:
+                asset.popup_surface = asset.surface
+            else:
+                asset.popup_surface = convert(asset.popup_surface)
+            self.account(index)
+
+    @property
+    def all_seen(self) -> bool:
+        return all(index in self.seen for index, asset in enumerate(self.manifest.assets) if not asset.removed)
+
+    def summary(self) -> str:
+        """One-line report of pool usage"""
+        budget = "unlimited" if self.budget_bytes is None else f"{self.budget_bytes / 2**20:.1f} MB"
+        return (f"Logo pool: {len(self.resident)}/{len(self.manifest)} resident, "
+                f"{self.resident_bytes / 2**20:.1f} MB of {budget}, "
+                f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions")
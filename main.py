@@ -14,27 +14,62 @@ Author: FunHackerMode
 Version: 1.0.0
 """
 
+import startup_profile
+if startup_profile.requested():
+    # Before the other imports so they get timed too
+    startup_profile.enable("FunHackerMode")
+
 import pygame
 import sys
 import os
-import time
-import random
 import math
 from typing import List, Tuple
 import threading
+import resource_registry
+from crt_effect import CRTEffect
+from deterministic import Session
+from frame_pacer import DEFAULT_FPS, FramePacer
+from idle_scheduler import IdleScheduler
 from graph_animations import GraphAnimations
+from simulation import FrameSnapshot, MatrixRain, SimulationPipeline
+from slide_transitions import SlideTransitions
 from sound_effects import SoundEffects
+from typewriter_text import TypewriterText
+from widget_process import WidgetPanel, WidgetProcess, draw_panel
+from hacker_logging import get_logger, setup_logging
+from metrics_server import FrameMetrics, start_metrics_server
+from options import default_options, parse_options
+from resource_registry import track
 
-# Initialize Pygame
-pygame.init()
-pygame.mixer.init()
+def init_pygame():
+    """Initialize pygame and the mixer; not at import, so the widget process doesn't open them too"""
+    if pygame.get_init() and pygame.mixer.get_init():
+        return
+    with startup_profile.phase("pygame init"):
+        pygame.init()
+        pygame.mixer.init()
 
 class FunHackerMode:
-    def __init__(self):
+    def __init__(self, options=None, sound_effects=None):
+        init_pygame()
+        self.options = options or default_options()
+        setup_logging(self.options.log_level, self.options.debug, self.options.log_file)
+        startup_profile.configure(self.options)
+        self.resources = resource_registry.get_registry()
+        resource_registry.configure(self.options)
+        self.session = Session(self.options, fps=self.options.fps or DEFAULT_FPS)
+        self.pacer = FramePacer(self.options.fps, self.options.pacing, clock=self.session.clock)
+        self.crt = CRTEffect(self.options.crt) if self.options.crt else None
+        self.idle = IdleScheduler(self.options.fps or DEFAULT_FPS,
+                                  enabled=not self.options.no_idle and not self.session.deterministic)
+        self.matrix_rng = self.session.rng("matrix")
+        self.typing_rng = self.session.rng("typing")
+        
         self.screen_width = 1200
         self.screen_height = 800
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
-        pygame.display.set_caption("FunHackerMode v1.0.0 - Initializing...")
+        with startup_profile.phase("display"):
+            self.screen = self.pacer.set_mode((self.screen_width, self.screen_height))
+            pygame.display.set_caption("FunHackerMode v1.0.0 - Initializing...")
         
         # Colors (hacker theme)
         self.BLACK = (0, 0, 0)
@@ -47,17 +82,22 @@ class FunHackerMode:
         self.GRAY = (100, 100, 100)
         
         # Fonts
-        self.font_small = pygame.font.Font(None, 24)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_large = pygame.font.Font(None, 48)
-        self.font_mono = pygame.font.Font("consola.ttf", 20) if os.path.exists("consola.ttf") else pygame.font.Font(None, 20)
+        with startup_profile.phase("fonts"):
+            self.font_small = pygame.font.Font(None, 24)
+            self.font_medium = pygame.font.Font(None, 36)
+            self.font_large = pygame.font.Font(None, 48)
+            self.font_mono = pygame.font.Font("consola.ttf", 20) if os.path.exists("consola.ttf") else pygame.font.Font(None, 20)
+            for font in (self.font_small, self.font_medium, self.font_large, self.font_mono):
+                track(font, "fun_hacker", "fonts")
         
         # Animation variables
-        self.clock = pygame.time.Clock()
+        self.clock = self.session.clock
         self.running = True
         self.current_mode = "startup"
         self.startup_progress = 0
-        self.matrix_chars = []
+        self.matrix = None
+        self.pipeline = None
+        self.widgets = None
         self.slideshow_images = []
         self.current_image_index = 0
         self.image_timer = 0
@@ -66,33 +106,79 @@ class FunHackerMode:
         self.typing_speed = 50  # milliseconds
         
         # Initialize components
-        self.init_matrix_effect()
-        self.load_images()
-        self.setup_typing_animation()
+        with startup_profile.phase("matrix"):
+            self.init_matrix_effect()
+        with startup_profile.phase("images"):
+            self.load_images()
+            self.prepare_slides()
+        with startup_profile.phase("typing animation"):
+            self.setup_typing_animation()
         
         # Initialize additional components
-        self.graph_animations = GraphAnimations(self.screen_width, self.screen_height)
-        self.sound_effects = SoundEffects()
+        with startup_profile.phase("graphs"):
+            self.graph_animations = GraphAnimations(self.screen_width, self.screen_height,
+                                                    rng=self.session.rng("graphs"),
+                                                    draw_rng=self.session.rng("graph_draw"))
+        with startup_profile.phase("sounds"):
+            self.sound_effects = sound_effects if sound_effects is not None else SoundEffects()
+        
+        # Graph widgets in the corners, drawn here or by the widget process
+        self.widget_panels = [
+            WidgetPanel("system_monitor", (self.screen_width - 320, 20, 320, 320)),
+            WidgetPanel("radar", (50, self.screen_height - 250, 200, 200)),
+            WidgetPanel("pulse", (self.screen_width - 200, self.screen_height - 200, 200, 200)),
+            WidgetPanel("data_stream", (20, 20, 300, 160)),
+        ]
+        if self.options.widget_process:
+            if self.session.deterministic:
+                get_logger().warning("The widget process runs on its own clock; drawing widgets in process "
+                                     "to keep the run deterministic")
+            else:
+                with startup_profile.phase("widget process"):
+                    self.widgets = WidgetProcess(self.widget_panels, self.options.widget_fps)
+                    self.widgets.start()
         
         # Additional animation variables
         self.show_graphs = False
         self.graph_timer = 0
         
-    def init_matrix_effect(self):
+        # Live metrics, served on --metrics-port
+        self.metrics = FrameMetrics("fun_hacker")
+        self.metrics_server = start_metrics_server(self.options, self.metrics, self.resources, self.sound_effects)
+        
+    def init_matrix_effect(self, columns=50):
         """Initialize the Matrix-style falling code effect"""
-        self.matrix_chars = []
-        for i in range(50):  # Number of falling columns
-            x = random.randint(0, self.screen_width)
-            y = random.randint(-500, 0)
-            speed = random.randint(1, 3)
-            chars = "".join([chr(random.randint(33, 126)) for _ in range(random.randint(10, 30))])
-            self.matrix_chars.append({
-                'x': x,
-                'y': y,
-                'speed': speed,
-                'chars': chars,
-                'char_index': 0
-            })
+        self.matrix = MatrixRain(columns, self.screen_width, self.screen_height, self.matrix_rng)
+        self.matrix_view = self.matrix  # Positions to draw: the live state, or a pipeline snapshot
+        # Glyphs are rendered once per character and color, then reused every frame
+        self.matrix_glyphs = {}
+        self.matrix_fade = [(0, max(0, 255 - (i * 15)), 0) for i in range(30)]  # Dimmer further down a column
+        # Each column's glyphs top to bottom, faded and highlighted
+        self.matrix_columns = [[self.matrix_glyph(char, self.matrix_fade[i]) for i, char in enumerate(chars)]
+                               for chars in self.matrix.chars]
+        self.matrix_bright = [[self.matrix_glyph(char, self.BRIGHT_GREEN) for char in chars]
+                              for chars in self.matrix.chars]
+    
+    def start_pipeline(self):
+        """Simulate the slideshow one frame ahead on a worker thread from now on"""
+        # The worker owns the simulated graphs; the drawing instance only reads snapshots and is never stepped
+        self.simulated_graphs = self.graph_animations
+        self.graph_animations = GraphAnimations(self.screen_width, self.screen_height,
+                                                rng=self.session.rng("graph_replica"),
+                                                draw_rng=self.simulated_graphs.draw_rng)
+        slots = [FrameSnapshot(len(self.matrix)) for _ in range(2)]
+        self.pipeline = SimulationPipeline(self.step_simulation, self.publish_simulation, slots)
+        self.pipeline.start()
+    
+    def step_simulation(self):
+        """One slideshow simulation step (worker thread in pipelined mode)"""
+        self.matrix.step()
+        self.simulated_graphs.update()
+    
+    def publish_simulation(self, snapshot):
+        """Copy the simulation into a snapshot slot (worker thread)"""
+        snapshot.matrix.copy_from(self.matrix)
+        snapshot.graphs = self.simulated_graphs.state()
     
     def load_images(self):
         """Load and prepare images for slideshow"""
@@ -105,6 +191,51 @@ class FunHackerMode:
             {"text": "HACKER MODE", "color": self.BRIGHT_GREEN, "subtext": "ACTIVATED"},
         ]
     
+    def prepare_slides(self):
+        """Persistent dim overlay, slide cache and transition engine"""
+        self.dim_overlay = track(pygame.Surface((self.screen_width, self.screen_height)), "slideshow", "overlays")
+        self.dim_overlay.set_alpha(128)
+        self.dim_overlay.fill(self.BLACK)
+        self.slide_size = (600, 400)
+        self.slide_position = ((self.screen_width - self.slide_size[0]) // 2,
+                               (self.screen_height - self.slide_size[1]) // 2)
+        self.slide_surfaces = {}
+        self.transitions = SlideTransitions(self.options.transition, rng=self.session.rng("transitions"),
+                                            edge_color=self.BRIGHT_GREEN)
+        self.resources.on_evict("slides", self.evict_slides)
+    
+    def slide_surface(self, index):
+        """The slide rendered once: border and text on a transparent background"""
+        surface = self.slide_surfaces.get(index)
+        if surface is None:
+            image = self.slideshow_images[index]
+            width, height = self.slide_size
+            surface = self.slide_surfaces[index] = track(pygame.Surface(self.slide_size, pygame.SRCALPHA),
+                                                         "slideshow", "slides")
+            
+            # Draw border with glow effect
+            pygame.draw.rect(surface, image["color"], (0, 0, width, height), 3)
+            
+            # Draw main text
+            main_text = self.font_large.render(image["text"], True, image["color"])
+            surface.blit(main_text, main_text.get_rect(center=(width // 2, 150)))
+            
+            # Draw subtext
+            sub_text = self.font_medium.render(image["subtext"], True, self.WHITE)
+            surface.blit(sub_text, sub_text.get_rect(center=(width // 2, 200)))
+        return surface
+    
+    def evict_slides(self, excess_bytes):
+        """Eviction callback for the slides budget: drop cached slides that aren't on screen"""
+        on_screen = {id(self.transitions.outgoing), id(self.transitions.incoming)}
+        for index in list(self.slide_surfaces):
+            surface = self.slide_surfaces[index]
+            if excess_bytes <= 0:
+                break
+            if index != self.current_image_index and id(surface) not in on_screen:
+                excess_bytes -= resource_registry.resource_bytes(surface)
+                del self.slide_surfaces[index]
+    
     def setup_typing_animation(self):
         """Setup the typing animation text"""
         self.typing_phrases = [
@@ -119,44 +250,65 @@ class FunHackerMode:
         self.typing_text = ""
         self.typing_index = 0
         self.last_typing_time = 0
+        self.phrase_pause_until = None  # Finished phrases stay up for a second
+        
+        # Cached text for the startup screen
+        self.title_surface = track(self.font_large.render("FunHackerMode v1.0.0", True, self.BRIGHT_GREEN),
+                                   "startup_screen", "text")
+        self.typing_display = TypewriterText(self.font_medium, self.GREEN, self.screen_width - 100)
+        self.progress_label = ("", None)
     
     def update_matrix_effect(self):
         """Update the Matrix-style falling code animation"""
-        for char_data in self.matrix_chars:
-            char_data['y'] += char_data['speed']
-            char_data['char_index'] = (char_data['char_index'] + 1) % len(char_data['chars'])
-            
-            # Reset when off screen
-            if char_data['y'] > self.screen_height:
-                char_data['y'] = random.randint(-500, -100)
-                char_data['x'] = random.randint(0, self.screen_width)
+        self.matrix.step()
+    
+    def matrix_glyph(self, char, color):
+        """Rendered Matrix character, cached per character and color"""
+        glyph = self.matrix_glyphs.get((char, color))
+        if glyph is None:
+            glyph = self.matrix_glyphs[(char, color)] = track(self.font_mono.render(char, True, color),
+                                                              "matrix", "glyphs")
+        return glyph
     
     def draw_matrix_effect(self):
         """Draw the Matrix-style falling code effect"""
-        for char_data in self.matrix_chars:
-            x = char_data['x']
-            y = char_data['y']
-            chars = char_data['chars']
-            char_index = char_data['char_index']
+        screen_height = self.screen_height
+        view = self.matrix_view
+        batch = []
+        extend = batch.extend
+        for x, y, char_index, glyphs, bright in zip(view.x.tolist(), view.y.tolist(), view.char_index.tolist(),
+                                                    self.matrix_columns, self.matrix_bright):
+            # Only the characters between the top and bottom of the screen
+            first = -(y // 20) if y < 0 else 0
+            last = (screen_height - y) // 20
+            if last >= len(glyphs):
+                last = len(glyphs) - 1
+            if first > last:
+                continue
             
-            # Draw the falling characters
-            for i, char in enumerate(chars):
-                char_y = y + (i * 20)
-                if 0 <= char_y <= self.screen_height:
-                    # Fade effect - characters get dimmer as they fall
-                    alpha = max(0, 255 - (i * 15))
-                    color = (0, alpha, 0)
-                    
-                    # Highlight the current character
-                    if i == char_index:
-                        color = self.BRIGHT_GREEN
-                    
-                    char_surface = self.font_mono.render(char, True, color)
-                    self.screen.blit(char_surface, (x, char_y))
+            # Fade effect - characters get dimmer as they fall; the current character is highlighted
+            visible = glyphs[first:last + 1]
+            if first <= char_index <= last:
+                visible[char_index - first] = bright[char_index]
+            extend(zip(visible, [(x, y + (i * 20)) for i in range(first, last + 1)]))
+        
+        # One call for the whole rain instead of a render and a blit per character
+        self.screen.blits(batch, doreturn=False)
     
     def update_typing_animation(self):
         """Update the typing animation"""
-        current_time = pygame.time.get_ticks()
+        current_time = self.clock.get_ticks()
+        if self.phrase_pause_until is not None:
+            if current_time < self.phrase_pause_until:
+                # Nothing moves on the startup screen until the pause is over
+                self.idle.request(math.ceil((self.phrase_pause_until - current_time) / self.idle.frame_ms))
+                return
+            # Move to next phrase after the pause
+            self.phrase_pause_until = None
+            self.current_phrase_index += 1
+            self.typing_text = ""
+            self.typing_index = 0
+        
         if current_time - self.last_typing_time > self.typing_speed:
             if self.current_phrase_index < len(self.typing_phrases):
                 current_phrase = self.typing_phrases[self.current_phrase_index]
@@ -164,14 +316,11 @@ class FunHackerMode:
                     self.typing_text += current_phrase[self.typing_index]
                     self.typing_index += 1
                     # Play typing sound
-                    if random.random() < 0.3:  # 30% chance
+                    if self.typing_rng.random() < 0.3:  # 30% chance
                         self.sound_effects.play_typing()
                 else:
-                    # Move to next phrase after a delay
-                    time.sleep(1)
-                    self.current_phrase_index += 1
-                    self.typing_text = ""
-                    self.typing_index = 0
+                    # Keep the finished phrase up for a second without blocking the loop
+                    self.phrase_pause_until = current_time + 1000
             else:
                 # All phrases done, switch to slideshow mode
                 self.current_mode = "slideshow"
@@ -187,15 +336,13 @@ class FunHackerMode:
         # Draw matrix effect in background
         self.draw_matrix_effect()
         
-        # Draw main title
-        title = self.font_large.render("FunHackerMode v1.0.0", True, self.BRIGHT_GREEN)
-        title_rect = title.get_rect(center=(self.screen_width // 2, 100))
-        self.screen.blit(title, title_rect)
+        # Draw main title (rendered once)
+        title_rect = self.title_surface.get_rect(center=(self.screen_width // 2, 100))
+        self.screen.blit(self.title_surface, title_rect)
         
-        # Draw typing animation
-        typing_surface = self.font_medium.render(self.typing_text + "_", True, self.GREEN)
-        typing_rect = typing_surface.get_rect(center=(self.screen_width // 2, 200))
-        self.screen.blit(typing_surface, typing_rect)
+        # Draw typing animation - only the newly typed glyphs are drawn into its cache
+        self.typing_display.set_text(self.typing_text)
+        self.typing_display.draw(self.screen, self.screen_width // 2, 200)
         
         # Draw progress bar
         progress_width = 400
@@ -211,9 +358,11 @@ class FunHackerMode:
         current_progress_width = int(progress_width * progress)
         pygame.draw.rect(self.screen, self.GREEN, (progress_x, progress_y, current_progress_width, progress_height))
         
-        # Progress text
+        # Progress text - re-rendered only when the percentage changes
         progress_text = f"Loading... {int(progress * 100)}%"
-        progress_surface = self.font_small.render(progress_text, True, self.WHITE)
+        if progress_text != self.progress_label[0]:
+            self.progress_label = (progress_text, self.font_small.render(progress_text, True, self.WHITE))
+        progress_surface = self.progress_label[1]
         progress_rect = progress_surface.get_rect(center=(self.screen_width // 2, progress_y + 40))
         self.screen.blit(progress_surface, progress_rect)
     
@@ -227,32 +376,14 @@ class FunHackerMode:
         
         # Draw current image
         if self.slideshow_images:
-            current_image = self.slideshow_images[self.current_image_index]
-            
-            # Create a semi-transparent overlay
-            overlay = pygame.Surface((self.screen_width, self.screen_height))
-            overlay.set_alpha(128)
-            overlay.fill(self.BLACK)
-            self.screen.blit(overlay, (0, 0))
-            
-            # Draw image placeholder (rectangle with text)
-            image_width = 600
-            image_height = 400
-            image_x = (self.screen_width - image_width) // 2
-            image_y = (self.screen_height - image_height) // 2
-            
-            # Draw border with glow effect
-            pygame.draw.rect(self.screen, current_image["color"], (image_x, image_y, image_width, image_height), 3)
+            # Dim the background with the persistent overlay
+            self.screen.blit(self.dim_overlay, (0, 0))
             
-            # Draw main text
-            main_text = self.font_large.render(current_image["text"], True, current_image["color"])
-            main_rect = main_text.get_rect(center=(self.screen_width // 2, image_y + 150))
-            self.screen.blit(main_text, main_rect)
-            
-            # Draw subtext
-            sub_text = self.font_medium.render(current_image["subtext"], True, self.WHITE)
-            sub_rect = sub_text.get_rect(center=(self.screen_width // 2, image_y + 200))
-            self.screen.blit(sub_text, sub_rect)
+            # Draw the slide, or the transition into it
+            if self.transitions.active:
+                self.transitions.draw(self.screen, self.slide_position)
+            else:
+                self.screen.blit(self.slide_surface(self.current_image_index), self.slide_position)
         
         # Draw animated graphs in corners
         self.graph_timer += 1
@@ -260,17 +391,15 @@ class FunHackerMode:
             self.show_graphs = not self.show_graphs
             self.graph_timer = 0
         
+        if self.widgets is not None:
+            self.widgets.set_visible(self.show_graphs)
         if self.show_graphs:
-            # Draw system monitor in top-right corner
-            self.graph_animations.draw_system_monitor(self.screen, 
-                                                    self.screen_width - 320, 20, 300, 320)
-            
-            # Draw radar sweep in bottom-left corner
-            self.graph_animations.draw_radar_sweep(self.screen, 150, self.screen_height - 150, 100)
-            
-            # Draw pulse animation in bottom-right corner
-            self.graph_animations.draw_pulse_animation(self.screen, 
-                                                     self.screen_width - 100, self.screen_height - 100)
+            # System monitor top right, data stream top left, radar sweep bottom left, pulse bottom right
+            if self.widgets is not None:
+                self.widgets.draw(self.screen)
+            else:
+                for panel in self.widget_panels:
+                    draw_panel(self.graph_animations, self.screen, panel, *panel.rect[:2])
         
         # Draw slideshow controls
         controls_text = "Press SPACE for next image | G for graphs | ESC to exit"
@@ -286,16 +415,24 @@ class FunHackerMode:
     
     def next_image(self):
         """Move to the next image in the slideshow"""
+        outgoing = self.current_image_index
         self.current_image_index = (self.current_image_index + 1) % len(self.slideshow_images)
+        self.transitions.start(self.slide_surface(outgoing), self.slide_surface(self.current_image_index))
     
     def handle_events(self):
         """Handle pygame events"""
-        for event in pygame.event.get():
+        for event in self.session.events():
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.pacer.toggle_overlay()
+                elif event.key == pygame.K_F4 and self.crt is not None:
+                    self.crt.toggle()
+                elif event.key == pygame.K_F5:
+                    get_logger().info(self.resources.report())
                 elif event.key == pygame.K_SPACE and self.current_mode == "slideshow":
                     self.next_image()
                     self.sound_effects.play_beep()
@@ -317,8 +454,17 @@ class FunHackerMode:
         if self.current_mode == "startup":
             self.update_typing_animation()
         elif self.current_mode == "slideshow":
-            self.update_matrix_effect()
-            self.graph_animations.update()
+            if self.options.pipeline:
+                # Render the snapshot the worker finished while it simulates the next frame
+                if self.pipeline is None:
+                    self.start_pipeline()
+                snapshot = self.pipeline.next_frame()
+                self.matrix_view = snapshot.matrix
+                self.graph_animations.load_state(snapshot.graphs)
+            else:
+                self.update_matrix_effect()
+                if self.widgets is None:  # Otherwise the widget process animates the graphs
+                    self.graph_animations.update()
     
     def draw(self):
         """Draw the current frame"""
@@ -327,7 +473,28 @@ class FunHackerMode:
         elif self.current_mode == "slideshow":
             self.draw_slideshow()
         
+        if self.crt is not None:
+            self.crt.apply(self.screen)
+        self.pacer.draw_overlay(self.screen, self.font_small)
         pygame.display.flip()
+        startup_profile.first_frame()
+        self.session.end_frame(self.screen)
+    
+    def run_frame(self):
+        """Handle input, update, draw and wait for the next frame"""
+        metrics = self.metrics
+        metrics.start_frame()
+        self.handle_events()
+        metrics.lap("events")
+        self.update()
+        metrics.lap("update")
+        self.draw()
+        self.resources.enforce()
+        metrics.lap("draw")
+        interval = self.pacer.wait()
+        self.idle.wait(self.pacer)
+        metrics.lap("wait")
+        metrics.end_frame(interval, self.current_mode)
     
     def run(self):
         """Main game loop"""
@@ -336,18 +503,28 @@ class FunHackerMode:
         print("🔐 Accessing mainframe...")
         
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+            self.run_frame()
         
+        if self.pipeline is not None:
+            self.pipeline.stop()
+        if self.widgets is not None:
+            self.widgets.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.session.close()
+        if self.options.frame_stats:
+            print(self.pacer.stats.summary())
+            print(self.idle.summary())
+            if self.widgets is not None:
+                print(self.widgets.summary())
+        get_logger().info(self.resources.report())
         print("👋 FunHackerMode terminated. Thanks for hacking!")
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
     try:
-        hacker_mode = FunHackerMode()
+        hacker_mode = FunHackerMode(parse_options(description="FunHackerMode"))
         hacker_mode.run()
     except KeyboardInterrupt:
         print("\n🛑 Interrupted by user")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Metrics Server Module
+=====================
+
+Live render and resource metrics for fleet monitoring, served in the
+Prometheus text format from a background thread (--metrics-port; bound
+to localhost unless --metrics-host says otherwise):
+
+- frames, FPS over the last second and a frame interval histogram
+- seconds spent per stage of the frame (events, update, draw, wait)
+- bytes resident and budgets per resource category
+- sound triggers that couldn't play
+- the current phase of the show
+
+The render thread never waits on the server. FrameMetrics is written
+only by the render thread, with plain integer and float updates to
+lists and dicts whose keys are fixed up front; the server thread copies
+them with list() and dict(), which complete without the render thread
+running in between, and formats the copies. A scrape is a few dozen
+lines of text, so the server thread gives the interpreter back quickly.
+"""
+
+import bisect
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence
+
+from hacker_logging import get_logger
+
+log = get_logger()
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+PREFIX = "funhacker"
+STAGES = ("events", "update", "draw", "wait")
+# Frame interval histogram bounds in ms: around 60 and 30 FPS, then hitches
+FRAME_BUCKETS_MS = (8.0, 12.0, 16.0, 17.5, 20.0, 25.0, 33.4, 50.0, 100.0, 250.0)
+FPS_WINDOW = 1.0  # Seconds per FPS measurement
+
+
+class FrameMetrics:
+    """Per-frame counters, written only by the render thread"""
+
+    def __init__(self, program: str, buckets_ms: Sequence[float] = FRAME_BUCKETS_MS):
+        self.program = program
+        self.buckets_ms = tuple(buckets_ms)
+        self.bucket_counts = [0] * (len(self.buckets_ms) + 1)  # Last one is +Inf
+        self.interval_seconds = 0.0  # Sum of all frame intervals
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.frames = 0
+        self.fps = 0.0
+        self.phase = ""
+        self.phases: List[str] = []  # Every phase seen, so each one's gauge drops back to 0
+        self.lap_start = time.perf_counter()
+        self.window_start = self.lap_start
+        self.window_frames = 0
+
+    def start_frame(self):
+        self.lap_start = time.perf_counter()
+
+    def lap(self, stage: str):
+        """Charge the time since the last lap to a stage"""
+        now = time.perf_counter()
+        self.stage_seconds[stage] += now - self.lap_start
+        self.lap_start = now
+
+    def end_frame(self, interval_ms: float, phase: str):
+        """Record the frame interval measured by the pacer and the phase the frame showed"""
+        self.frames += 1
+        if interval_ms > 0:
+            self.bucket_counts[bisect.bisect_left(self.buckets_ms, interval_ms)] += 1
+            self.interval_seconds += interval_ms / 1000
+        if phase != self.phase:
+            if phase not in self.phases:
+                self.phases.append(phase)
+            self.phase = phase
+
+        self.window_frames += 1
+        elapsed = self.lap_start - self.window_start
+        if elapsed >= FPS_WINDOW:
+            self.fps = self.window_frames / elapsed
+            self.window_start = self.lap_start
+            self.window_frames = 0
+
+
+def label_text(labels: Dict[str, str]) -> str:
+    return "{" + ",".join(f'{key}="{label}"' for key, label in labels.items()) + "}"
+
+
+def metric(lines: List[str], name: str, kind: str, help_text: str, samples, suffix: str = ""):
+    """Append one metric family; samples are (labels, value) pairs"""
+    lines.append(f"# HELP {PREFIX}_{name} {help_text}")
+    lines.append(f"# TYPE {PREFIX}_{name} {kind}")
+    for labels, value in samples:
+        lines.append(f"{PREFIX}_{name}{suffix}{label_text(labels)} {value}")
+
+
+def exposition(metrics: FrameMetrics, registry=None, sounds=None) -> str:
+    """Current metrics in the Prometheus text format"""
+    # Snapshot everything the render thread writes before formatting
+    bucket_counts = list(metrics.bucket_counts)
+    stage_seconds = dict(metrics.stage_seconds)
+    phases = list(metrics.phases)
+    phase = metrics.phase
+    program = {"program": metrics.program}
+
+    lines: List[str] = []
+    metric(lines, "frames_total", "counter", "Frames rendered", [(program, metrics.frames)])
+    metric(lines, "fps", "gauge", "Frames per second over the last second", [(program, round(metrics.fps, 2))])
+
+    cumulative = 0
+    buckets = []
+    for bound, count in zip(metrics.buckets_ms + (None,), bucket_counts):
+        cumulative += count
+        le = "+Inf" if bound is None else repr(bound / 1000)
+        buckets.append(({**program, "le": le}, cumulative))
+    metric(lines, "frame_seconds", "histogram", "Interval between frames", buckets, suffix="_bucket")
+    lines.append(f"{PREFIX}_frame_seconds_sum{label_text(program)} {metrics.interval_seconds:.6f}")
+    lines.append(f"{PREFIX}_frame_seconds_count{label_text(program)} {cumulative}")
+
+    metric(lines, "stage_seconds_total", "counter", "Time spent in each stage of the frame",
+           [({**program, "stage": stage}, f"{seconds:.6f}") for stage, seconds in stage_seconds.items()])
+    metric(lines, "phase", "gauge", "1 for the phase the show is in",
+           [({**program, "phase": name}, int(name == phase)) for name in phases])
+
+    if registry is not None:
+        totals = dict(registry.totals)
+        budgets = dict(registry.budgets)
+        metric(lines, "resource_bytes", "gauge", "Bytes held by tracked surfaces, sounds and buffers",
+               [({**program, "category": category}, nbytes) for category, nbytes in sorted(totals.items())])
+        metric(lines, "resource_budget_bytes", "gauge", "Byte budget per resource category",
+               [({**program, "category": category}, nbytes) for category, nbytes in sorted(budgets.items())])
+    if sounds is not None:
+        metric(lines, "sound_triggers_total", "counter", "Sounds the show tried to play",
+               [(program, sounds.triggers)])
+        metric(lines, "sound_triggers_dropped_total", "counter",
+               "Sounds that couldn't play (no sound, no free channel or a mixer error)",
+               [(program, sounds.dropped_triggers)])
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = self.server.collect().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug(f"metrics: {self.address_string()} {format % args}")
+
+
+class MetricsServer:
+    """Serves /metrics on a daemon thread until stopped"""
+
+    def __init__(self, metrics: FrameMetrics, port: int, host: str = DEFAULT_METRICS_HOST,
+                 registry=None, sounds=None):
+        self.metrics = metrics
+        self.registry = registry
+        self.sounds = sounds
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        self.server.daemon_threads = True
+        self.server.collect = self.collect
+        self.thread = threading.Thread(target=self.server.serve_forever, name="metrics", daemon=True)
+
+    @property
+    def address(self):
+        return self.server.server_address[:2]
+
+    def collect(self) -> str:
+        return exposition(self.metrics, self.registry, self.sounds)
+
+    def start(self):
+        self.thread.start()
+        host, port = self.address
+        log.info(f"Serving metrics on http://{host}:{port}/metrics")
+
+    def stop(self):
+        if self.thread.is_alive():
+            self.server.shutdown()
+        self.server.server_close()
+
+
+def start_metrics_server(options, metrics: FrameMetrics, registry=None, sounds=None) -> Optional[MetricsServer]:
+    """Start the server if --metrics-port was given; a port that can't be bound only logs a warning"""
+    if getattr(options, "metrics_port", None) is None:
+        return None
+    try:
+        server = MetricsServer(metrics, options.metrics_port, options.metrics_host, registry, sounds)
+    except OSError as e:
+        log.warning(f"Could not serve metrics on {options.metrics_host}:{options.metrics_port}: {e}")
+        return None
+    server.start()
+    return server
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Command Line Options for FunHackerMode
+======================================
+
+Shared option parsing for main.py, simple_hacker.py and the launcher.
+Every option has a default so the programs run the same without flags.
+
+The choices and defaults live here rather than in the modules that use
+them, so parsing options (which the launcher does before it has checked
+that pygame and NumPy are installed) imports nothing but the standard
+library.
+"""
+
+import argparse
+from typing import Dict, List, Optional
+
+from hacker_logging import DEBUG_CHANNELS
+from metrics_server import DEFAULT_METRICS_HOST
+from startup_profile import DEFAULT_REPORT, PROFILE_FLAG
+
+PACING_STRATEGIES = ("sleep", "hybrid", "busy", "vsync")
+DEFAULT_FPS = 60
+DEFAULT_STRATEGY = "sleep"  # Kiosks run all day; the others spin or need a vsynced display
+DEFAULT_WIDGET_FPS = 30
+TRANSITIONS = ("crossfade", "wipe", "glitch")
+TRANSITION_CHOICES = TRANSITIONS + ("cycle", "none")
+DEFAULT_TRANSITION = "cycle"  # A different transition each time, in order
+CRT_EFFECTS = ("scanlines", "vignette", "glow", "chroma")
+DEFAULT_CRT_EFFECTS = ("scanlines", "vignette")  # One blit; glow and chroma each add full-frame passes
+RESOURCE_CATEGORIES = (
+    "logos",  # Decoded logos in the logo pool
+    "popups",  # Per-popup copies on screen
+    "blue_screens",  # Full-screen blue screen images
+    "slides",  # Cached slideshow slides
+    "overlays",  # Full-screen overlays
+    "text",  # Rendered banners, labels and text buffers
+    "glyphs",  # Per-character glyph caches
+    "graphs",  # Graph widget surfaces
+    "effects",  # CRT masks and scratch buffers
+    "sounds",  # Sound buffers
+    "fonts",  # Open fonts (counted, not sized)
+    "shared_memory",  # Widget process atlas
+)
+MB = 2**20
+
+
+def debug_channel_list(value: str) -> List[str]:
+    """Parse a comma-separated list of debug channels"""
+    channels = [channel.strip() for channel in value.split(",") if channel.strip()]
+    unknown = [channel for channel in channels if channel not in DEBUG_CHANNELS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown debug channel(s): {', '.join(unknown)}")
+    return channels
+
+
+def crt_effect_list(value: str) -> List[str]:
+    """Parse a comma-separated list of CRT effects ("default" or "all" for the predefined sets)"""
+    if value == "default":
+        return list(DEFAULT_CRT_EFFECTS)
+    if value == "all":
+        return list(CRT_EFFECTS)
+    effects = [effect.strip() for effect in value.split(",") if effect.strip()]
+    unknown = [effect for effect in effects if effect not in CRT_EFFECTS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown CRT effect(s): {', '.join(unknown)}")
+    return effects
+
+
+def memory_budgets(value: str) -> Dict[str, int]:
+    """Parse comma-separated CATEGORY=MB budgets into bytes per category"""
+    budgets = {}
+    for item in value.split(","):
+        if not item.strip():
+            continue
+        category, _, megabytes = item.partition("=")
+        category = category.strip()
+        if category not in RESOURCE_CATEGORIES:
+            raise argparse.ArgumentTypeError(f"unknown resource category: {category}")
+        try:
+            budgets[category] = int(float(megabytes) * MB)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"budget for {category} must be a number of MB") from None
+    return budgets
+
+
+def build_parser(description: str, logo_wall: bool = False) -> argparse.ArgumentParser:
+    """Create the argument parser; logo_wall adds the Simple Hacker Mode options"""
+    parser = argparse.ArgumentParser(description=description)
+
+    group = parser.add_argument_group("logging")
+    group.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+                       help="Minimum level of log messages (default: INFO)")
+    group.add_argument("--debug", type=debug_channel_list, default=[], metavar="CHANNELS",
+                       help=f"Comma-separated debug channels to enable: {', '.join(DEBUG_CHANNELS)}")
+    group.add_argument("--log-file", default=None,
+                       help="Also write log messages to this file")
+
+    group = parser.add_argument_group("profiling")
+    group.add_argument(PROFILE_FLAG, action="store_true",
+                       help="Print import, init and first-frame timings and save them as JSON")
+    group.add_argument("--profile-output", default=DEFAULT_REPORT, metavar="PATH",
+                       help=f"Where to save the startup profile (default: {DEFAULT_REPORT})")
+
+    group = parser.add_argument_group("frame pacing")
+    group.add_argument("--fps", type=int, default=DEFAULT_FPS,
+                       help=f"Target frame rate, 0 for uncapped (default: {DEFAULT_FPS})")
+    group.add_argument("--pacing", choices=PACING_STRATEGIES, default=DEFAULT_STRATEGY,
+                       help=f"How to wait for the next frame (default: {DEFAULT_STRATEGY})")
+    group.add_argument("--no-idle", action="store_true",
+                       help="Keep redrawing static scenes instead of sleeping until the next change")
+    group.add_argument("--frame-stats", action="store_true",
+                       help="Print frame interval jitter statistics at exit (F3 shows them on screen)")
+
+    group = parser.add_argument_group("simulation")
+    group.add_argument("--pipeline", action="store_true",
+                       help="Simulate the next slideshow frame on a worker thread while this one renders")
+    group.add_argument("--widget-process", action="store_true",
+                       help="Render the graph widgets in a separate process into shared memory")
+    group.add_argument("--widget-fps", type=int, default=DEFAULT_WIDGET_FPS,
+                       help=f"Frame rate of the widget process (default: {DEFAULT_WIDGET_FPS})")
+
+    group = parser.add_argument_group("slideshow")
+    group.add_argument("--transition", choices=TRANSITION_CHOICES, default=DEFAULT_TRANSITION,
+                       help=f"Transition between slides; cycle takes turns (default: {DEFAULT_TRANSITION})")
+
+    group = parser.add_argument_group("CRT effect")
+    group.add_argument("--crt", type=crt_effect_list, nargs="?", const="default", default=[], metavar="EFFECTS",
+                       help=f"CRT post-processing (F4 toggles it): 'all' or a comma-separated list of "
+                            f"{', '.join(CRT_EFFECTS)} (default: {','.join(DEFAULT_CRT_EFFECTS)})")
+
+    group = parser.add_argument_group("memory")
+    group.add_argument("--memory-budget", type=memory_budgets, default={}, metavar="CATEGORY=MB,...",
+                       help=f"Byte budgets per resource category, e.g. logos=64,popups=16 (F5 logs what is "
+                            f"resident); categories: {', '.join(RESOURCE_CATEGORIES)}")
+
+    group = parser.add_argument_group("metrics")
+    group.add_argument("--metrics-port", type=int, default=None, metavar="PORT",
+                       help="Serve live metrics in the Prometheus text format at http://HOST:PORT/metrics")
+    group.add_argument("--metrics-host", default=DEFAULT_METRICS_HOST, metavar="HOST",
+                       help=f"Address to serve metrics on (default: {DEFAULT_METRICS_HOST}, this machine only)")
+
+    group = parser.add_argument_group("deterministic mode")
+    group.add_argument("--seed", type=int, default=None,
+                       help="Seed every random stream and use a fixed-step clock so runs repeat exactly")
+    inputs = group.add_mutually_exclusive_group()
+    inputs.add_argument("--record-input", default=None, metavar="PATH",
+                        help="Record key presses per frame to this file (implies a seed)")
+    inputs.add_argument("--replay-input", default=None, metavar="PATH",
+                        help="Replay a recording instead of live keys, with its seed, then exit")
+    group.add_argument("--frame-hashes", default=None, metavar="PATH",
+                       help="Save a hash of every frame to this file")
+    group.add_argument("--check-frames", default=None, metavar="PATH",
+                       help="Compare every frame with hashes saved by --frame-hashes")
+
+    if logo_wall:
+        group = parser.add_argument_group("logo wall")
+        group.add_argument("--logo-budget-mb", type=float, default=None,
+                           help="Memory budget for decoded logos in MB (default: keep all loaded)")
+        group.add_argument("--prefetch", type=int, default=8,
+                           help="Number of upcoming logos to decode ahead of time (default: 8)")
+        group.add_argument("--no-hot-reload", action="store_true",
+                           help="Don't watch the Logos folder for added, changed or removed files")
+
+    return parser
+
+
+def parse_options(argv: Optional[List[str]] = None, description: str = "FunHackerMode",
+                  logo_wall: bool = False) -> argparse.Namespace:
+    """Parse command line options (sys.argv when argv is None)"""
+    return build_parser(description, logo_wall).parse_args(argv)
+
+
+def default_options(logo_wall: bool = False) -> argparse.Namespace:
+    """Options as if no flags were given"""
+    return parse_options([], logo_wall=logo_wall)
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Placement Module for Simple Hacker Mode
+=======================================
+
+Grid occupancy index used to place popup logos without overlap.
+
+The screen is divided into square cells and each placed image marks the
+cells it covers. Finding a spot uses a summed-area table over the cell
+counts, so the cost depends on the grid size only - not on how many
+images are already on screen - and a crowded screen is reported instead
+of silently overlapping.
+"""
+
+import random
+from typing import Dict, Hashable, Optional, Tuple
+
+import numpy as np
+
+
+class PlacementGrid:
+    def __init__(self, width: int, height: int, cell_size: int = 16, rng=random):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.rng = rng
+        # Only whole cells are used so a placement never runs past the screen edge
+        self.cols = max(1, width // cell_size)
+        self.rows = max(1, height // cell_size)
+        self.occupancy = np.zeros((self.rows, self.cols), dtype=np.int32)
+        self.placed: Dict[Hashable, Tuple[int, int, int, int]] = {}  # key -> (col, row, cols, rows)
+
+    def footprint(self, x: int, y: int, width: int, height: int) -> Tuple[int, int, int, int]:
+        """Cells covered by a rectangle, clipped to the grid"""
+        col = min(max(0, x // self.cell_size), self.cols - 1)
+        row = min(max(0, y // self.cell_size), self.rows - 1)
+        end_col = min(self.cols, -(-(x + width) // self.cell_size))
+        end_row = min(self.rows, -(-(y + height) // self.cell_size))
+        return col, row, max(1, end_col - col), max(1, end_row - row)
+
+    def find_position(self, width: int, height: int) -> Optional[Tuple[int, int]]:
+        """Random top-left position where the rectangle overlaps nothing, or None if it can't fit"""
+        cell = self.cell_size
+        # A logo scaled down to 0 pixels on one side still takes a cell (and a 0-length slice would be empty)
+        cols_needed = max(1, -(-width // cell))
+        rows_needed = max(1, -(-height // cell))
+        if cols_needed > self.cols or rows_needed > self.rows:
+            return None
+
+        # Summed-area table: free[r, c] is True when the window starting at cell (c, r) is empty
+        table = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int32)
+        np.cumsum(np.cumsum(self.occupancy, axis=0), axis=1, out=table[1:, 1:])
+        window = (table[rows_needed:, cols_needed:] - table[:-rows_needed, cols_needed:]
+                  - table[rows_needed:, :-cols_needed] + table[:-rows_needed, :-cols_needed])
+        free = np.flatnonzero(window == 0)
+        if free.size == 0:
+            return None
+
+        row, col = divmod(int(free[self.rng.randrange(free.size)]), window.shape[1])
+        # Jitter inside the spare pixels of the cell footprint so positions aren't grid-aligned
+        x = col * cell + self.rng.randint(0, cols_needed * cell - width)
+        y = row * cell + self.rng.randint(0, rows_needed * cell - height)
+        return x, y
+
+    def add(self, key: Hashable, x: int, y: int, width: int, height: int):
+        """Mark a placed rectangle as occupied"""
+        if key in self.placed:
+            self.remove(key)
+        col, row, cols, rows = self.footprint(x, y, width, height)
+        self.occupancy[row:row + rows, col:col + cols] += 1
+        self.placed[key] = (col, row, cols, rows)
+
+    def remove(self, key: Hashable):
+        """Free the cells of a rectangle that has expired"""
+        footprint = self.placed.pop(key, None)
+        if footprint is None:
+            return
+        col, row, cols, rows = footprint
+        self.occupancy[row:row + rows, col:col + cols] -= 1
+
+    def clear(self):
+        self.occupancy.fill(0)
+        self.placed.clear()
+
+    def __len__(self):
+        return len(self.placed)
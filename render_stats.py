@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+Render Statistics Module
+========================
+
+Small counters kept by the render loops so we can check that steady-state
+frames don't allocate new surfaces.
+"""
+
+
+class RenderStats:
+    def __init__(self):
+        self.frames = 0
+        self.frame_surfaces = 0  # Surfaces allocated so far in the current frame
+        self.last_frame_surfaces = 0
+        self.peak_frame_surfaces = 0
+        self.total_surfaces = 0
+        self.allocating_frames = 0  # Frames that allocated at least one surface
+
+    def count_surface(self, count: int = 1):
+        """Record surfaces allocated during the current frame"""
+        self.frame_surfaces += count
+        self.total_surfaces += count
+
+    def end_frame(self):
+        """Close the current frame's counters"""
+        self.frames += 1
+        self.last_frame_surfaces = self.frame_surfaces
+        self.peak_frame_surfaces = max(self.peak_frame_surfaces, self.frame_surfaces)
+        if self.frame_surfaces:
+            self.allocating_frames += 1
+        self.frame_surfaces = 0
+
+    def summary(self) -> str:
+        """One-line report of surface allocations"""
+        return (f"Surface allocations: {self.total_surfaces} over {self.frames} frames "
+                f"({self.allocating_frames} frames allocated, peak {self.peak_frame_surfaces} per frame)")
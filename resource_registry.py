@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Resource Registry Module
+========================
+
+Keeps count of the long-lived memory both programs hold: surfaces, sound
+buffers, fonts and scratch arrays, each tracked by owner and category.
+Tracking holds only a weak reference, so a resource drops out of the
+registry as soon as its owner lets go of it and nothing has to untrack
+by hand.
+
+Categories can be given a byte budget (--memory-budget logos=64,...).
+An owner that can free memory registers an eviction callback for its
+category; the render loop calls enforce() once per frame, which hands
+each over-budget category's excess to its callback. A category still
+over budget afterwards is logged once until it recovers.
+
+report() is logged on F5 and at exit: bytes resident, count and peak per
+category and owner, next to the budgets - the numbers to size the logo
+wall for a kiosk with.
+"""
+
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+import pygame
+
+from hacker_logging import get_logger
+from options import MB, RESOURCE_CATEGORIES
+
+log = get_logger()
+
+
+
+def resource_bytes(resource) -> int:
+    """Bytes held by a surface, sound or array (0 for anything that can't be sized)"""
+    if isinstance(resource, pygame.Surface):
+        return resource.get_pitch() * resource.get_height()
+    if isinstance(resource, pygame.mixer.Sound):
+        mixer = pygame.mixer.get_init()
+        if mixer is None:
+            return 0
+        frequency, sample_format, channels = mixer
+        return round(resource.get_length() * frequency) * channels * (abs(sample_format) // 8)
+    return getattr(resource, "nbytes", 0)
+
+
+@dataclass
+class TrackedResource:
+    owner: str
+    category: str
+    nbytes: int
+    finalizer: weakref.finalize
+
+
+class ResourceRegistry:
+    """Bytes resident per category and owner, with per-category budgets"""
+
+    def __init__(self):
+        # Finalizers can run on whichever thread drops the last reference, even while this one holds the lock
+        self.lock = threading.RLock()
+        self.entries: Dict[int, TrackedResource] = {}  # id(resource) -> entry
+        self.totals: Dict[str, int] = {}  # category -> bytes resident
+        self.peaks: Dict[str, int] = {}
+        self.budgets: Dict[str, int] = {}
+        self.evictors: Dict[str, Callable[[int], None]] = {}
+        self.evicted: Dict[str, int] = {}  # category -> bytes freed by enforce()
+        self.over_budget = set()  # Categories already warned about
+
+    def track(self, resource, owner: str, category: str, nbytes: Optional[int] = None):
+        """Count a resource until it is freed; returns it so tracking can wrap a constructor"""
+        if resource is None:
+            return None
+        if category not in RESOURCE_CATEGORIES:
+            raise ValueError(f"unknown resource category: {category}")
+        if nbytes is None:
+            nbytes = resource_bytes(resource)
+        key = id(resource)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                # Tracked again, perhaps by a new owner: move it
+                self.add(entry.category, -entry.nbytes)
+                entry.owner, entry.category, entry.nbytes = owner, category, nbytes
+            else:
+                finalizer = weakref.finalize(resource, self.forget, key)
+                finalizer.atexit = False
+                entry = self.entries[key] = TrackedResource(owner, category, nbytes, finalizer)
+            self.add(category, nbytes)
+        return resource
+
+    def untrack(self, resource):
+        """Stop counting a resource that stays alive"""
+        with self.lock:
+            entry = self.entries.get(id(resource))
+            if entry is not None:
+                entry.finalizer.detach()
+                self.forget(id(resource))
+
+    def forget(self, key: int):
+        with self.lock:
+            entry = self.entries.pop(key, None)
+            if entry is not None:
+                self.add(entry.category, -entry.nbytes)
+
+    def add(self, category: str, nbytes: int):
+        total = self.totals[category] = self.totals.get(category, 0) + nbytes
+        if total > self.peaks.get(category, 0):
+            self.peaks[category] = total
+
+    def resident(self, category: Optional[str] = None) -> int:
+        """Bytes resident in one category, or in all of them"""
+        if category is None:
+            return sum(self.totals.values())
+        return self.totals.get(category, 0)
+
+    def set_budget(self, category: str, nbytes: Optional[int]):
+        """Limit a category to nbytes (None removes the limit)"""
+        if category not in RESOURCE_CATEGORIES:
+            raise ValueError(f"unknown resource category: {category}")
+        if nbytes is None:
+            self.budgets.pop(category, None)
+        else:
+            self.budgets[category] = nbytes
+
+    def configure(self, budgets: Dict[str, int]):
+        for category, nbytes in budgets.items():
+            self.set_budget(category, nbytes)
+
+    def on_evict(self, category: str, callback: Callable[[int], None]):
+        """Register the callback that frees at least the given number of bytes from a category"""
+        self.evictors[category] = callback
+
+    def enforce(self) -> int:
+        """Ask over-budget categories to evict; returns the bytes freed"""
+        freed = 0
+        for category, budget in self.budgets.items():
+            before = self.totals.get(category, 0)
+            if before <= budget:
+                continue
+            evictor = self.evictors.get(category)
+            if evictor is not None:
+                evictor(before - budget)
+            after = self.totals.get(category, 0)
+            if after < before:
+                freed += before - after
+                self.evicted[category] = self.evicted.get(category, 0) + before - after
+            if after <= budget:
+                self.over_budget.discard(category)
+            elif category not in self.over_budget:
+                self.over_budget.add(category)
+                reason = "nothing more to evict" if evictor is not None else "no eviction callback"
+                log.warning(f"{category}: {after / MB:.1f} MB resident, over its {budget / MB:.1f} MB budget "
+                            f"({reason})")
+        return freed
+
+    def report(self) -> str:
+        """Table of bytes resident per category and owner"""
+        with self.lock:
+            usage: Dict[tuple, list] = {}
+            for entry in self.entries.values():
+                row = usage.setdefault((entry.category, entry.owner), [0, 0])
+                row[0] += 1
+                row[1] += entry.nbytes
+        lines = [f"Resident memory: {self.resident() / MB:.1f} MB in {len(self.entries)} resources",
+                 f"{'Category':<14} {'Owner':<18} {'Count':>6} {'MB':>9} {'Peak MB':>9} {'Budget MB':>10} "
+                 f"{'Evicted MB':>11}"]
+        for category in RESOURCE_CATEGORIES:
+            owners = sorted((owner, row) for (row_category, owner), row in usage.items() if row_category == category)
+            budget = self.budgets.get(category)
+            if not owners and budget is None:
+                continue
+            count = sum(row[0] for _, row in owners)
+            owner = owners[0][0] if len(owners) == 1 else ""
+            lines.append(f"{category:<14} {owner:<18} {count:>6} {self.resident(category) / MB:>9.2f} "
+                         f"{self.peaks.get(category, 0) / MB:>9.2f} "
+                         f"{'-' if budget is None else f'{budget / MB:.1f}':>10} "
+                         f"{self.evicted.get(category, 0) / MB:>11.2f}")
+            if len(owners) > 1:
+                for owner, (owner_count, nbytes) in owners:  # Breakdown when several owners share a category
+                    lines.append(f"{'':<14} {owner:<18} {owner_count:>6} {nbytes / MB:>9.2f}")
+        return "\n".join(lines)
+
+
+_registry = ResourceRegistry()
+
+
+def get_registry() -> ResourceRegistry:
+    """The registry shared by everything in this process"""
+    return _registry
+
+
+def track(resource, owner: str, category: str, nbytes: Optional[int] = None):
+    """Track a resource in the process-wide registry; returns the resource"""
+    return _registry.track(resource, owner, category, nbytes)
+
+
+def configure(options):
+    """Apply parsed command line options to the registry"""
+    _registry.configure(getattr(options, "memory_budget", None) or {})
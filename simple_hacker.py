@@ -9,22 +9,85 @@ A simple program that:
 3. Shows blue screen images
 """
 
+import startup_profile
+if startup_profile.requested():
+    # Before the other imports so they get timed too
+    startup_profile.enable("Simple Hacker Mode")
+
 import pygame
 import sys
 import os
-import time
-import random
-import glob
+import logging
+import itertools
+
+from asset_manifest import LOGO_PATTERNS, AssetManifest, scale_to_fit
+from console_widget import ConsoleWidget
+from crt_effect import CRTEffect
+from deterministic import Session
+from frame_pacer import DEFAULT_FPS, FramePacer
+from idle_scheduler import UNTIL_INPUT, IdleScheduler
+from display_format import DisplayFormatWatcher, convert_for_display
+from folder_watcher import FolderWatcher
+from hacker_logging import get_logger, log_event, setup_logging
+from image_loader import ImageLoader
+from logo_pool import LogoPool
+from metrics_server import FrameMetrics, start_metrics_server
+from options import default_options, parse_options
+from placement import PlacementGrid
+from render_stats import RenderStats
+import resource_registry
+from resource_registry import track
+from thumbnail_cache import ThumbnailCache
 
 # Initialize Pygame
-pygame.init()
+with startup_profile.phase("pygame init"):
+    pygame.init()
+
+ERROR_TEMPLATES = [
+    "ERROR: Memory access violation at 0x{:08X}",
+    "CRITICAL: Stack overflow detected",
+    "FATAL: Null pointer dereference",
+    "ERROR: Division by zero exception",
+    "CRITICAL: Buffer overflow in module {}",
+    "FATAL: Access violation reading 0x{:08X}",
+    "ERROR: Invalid instruction at 0x{:08X}",
+    "CRITICAL: Heap corruption detected",
+    "FATAL: Unhandled exception in thread {}",
+    "ERROR: Stack corruption at 0x{:08X}",
+    "CRITICAL: Memory leak detected ({} bytes)",
+    "FATAL: System call failed: {}",
+    "ERROR: Invalid memory address 0x{:08X}",
+    "CRITICAL: Deadlock detected in thread pool",
+    "FATAL: Corrupted heap block at 0x{:08X}"
+]
+
+log = get_logger()
+popup_log = get_logger("popups")
+placement_log = get_logger("placement")
+loader_log = get_logger("loader")
 
 class SimpleHackerMode:
-    def __init__(self):
+    def __init__(self, options=None):
+        self.options = options or default_options(logo_wall=True)
+        setup_logging(self.options.log_level, self.options.debug, self.options.log_file)
+        startup_profile.configure(self.options)
+        self.resources = resource_registry.get_registry()
+        resource_registry.configure(self.options)
+        if self.options.logo_budget_mb is not None:
+            self.resources.set_budget("logos", int(self.options.logo_budget_mb * 2**20))
+        self.session = Session(self.options, fps=self.options.fps or DEFAULT_FPS)
+        self.pacer = FramePacer(self.options.fps, self.options.pacing, clock=self.session.clock)
+        self.crt = CRTEffect(self.options.crt) if self.options.crt else None
+        self.idle = IdleScheduler(self.options.fps or DEFAULT_FPS,
+                                  enabled=not self.options.no_idle and not self.session.deterministic)
+        self.shuffle_rng = self.session.rng("shuffle")
+        self.error_rng = self.session.rng("errors")
+        
         # Get full screen dimensions
-        self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-        self.screen_width, self.screen_height = self.screen.get_size()
-        pygame.display.set_caption("System.exe - Running...")
+        with startup_profile.phase("display"):
+            self.screen = self.pacer.set_mode((0, 0), pygame.FULLSCREEN)
+            self.screen_width, self.screen_height = self.screen.get_size()
+            pygame.display.set_caption("System.exe - Running...")
         
         # Colors
         self.BLACK = (0, 0, 0)
@@ -34,12 +97,13 @@ class SimpleHackerMode:
         self.BLUE = (0, 0, 255)
         
         # Fonts
-        self.font_small = pygame.font.Font(None, 24)
-        self.font_medium = pygame.font.Font(None, 36)
-        self.font_large = pygame.font.Font(None, 48)
+        with startup_profile.phase("fonts"):
+            self.font_small = track(pygame.font.Font(None, 24), "simple_hacker", "fonts")
+            self.font_medium = track(pygame.font.Font(None, 36), "simple_hacker", "fonts")
+            self.font_large = track(pygame.font.Font(None, 48), "simple_hacker", "fonts")
         
         # Animation variables
-        self.clock = pygame.time.Clock()
+        self.clock = self.session.clock
         self.running = True
         self.current_mode = "popup"
         self.image_timer = 0
@@ -51,128 +115,242 @@ class SimpleHackerMode:
         self.grid_width = self.screen_width
         self.grid_height = self.screen_height
         self.active_images = []  # List of (x, y, image, timer)
+        self.placement = PlacementGrid(self.grid_width, self.grid_height,
+                                       rng=self.session.rng("placement"))  # Free space for new popups
         self.popup_timer = 0
         self.max_images = 10  # 10 images on screen at a time (all of them)
         self.image_indices = []  # Array of integers representing image indices
         self.shown_images = set()  # Track which images have been shown
         self.all_images_shown = False  # Flag to track if all images have been shown
+        self.shuffled_indices = []
+        self.current_index = 0
+        self.manifest = None
+        self.min_ready_logos = 3  # Start the popups once this many logos are decoded
+        self.cache_pruned = False
+        
+        # Crash screen console and banners are rendered once, not every frame
+        self.crash_lines_shown = 0
+        self.crash_console = ConsoleWidget(self.font_small, (self.screen_width - 100, self.screen_height - 100),
+                                           color=self.RED, background=self.BLACK, line_height=30)
+        self.crash_banner = track(self.font_large.render("SYSTEM CRASH DETECTED", True, self.RED),
+                                  "crash_screen", "text")
+        self.crash_subbanner = track(self.font_medium.render("Initiating Blue Screen of Death...", True, self.BLUE),
+                                     "crash_screen", "text")
+        
+        # Surface allocation counters for the render loop
+        self.render_stats = RenderStats()
+        self.fallback_blue_screen_text = None
+        
+        # Re-convert loaded images whenever the display format changes
+        self.display_watcher = DisplayFormatWatcher()
+        self.display_watcher.on_change(self.convert_images)
         
         # Load images
-        self.load_images()
+        with startup_profile.phase("images"):
+            self.load_images()
+        
+        # Live metrics, served on --metrics-port
+        self.metrics = FrameMetrics("simple_hacker")
+        self.metrics_server = start_metrics_server(self.options, self.metrics, self.resources)
         
     def load_images(self):
         """Load all images from the Logos folder"""
-        self.logo_images = []
         self.blue_screen_images = []
+        self.blue_screen_paths = [path for path in ["BlueScreen1.jpg", "BlueScreen2.png"] if os.path.exists(path)]
+        self.blue_screen_slots = [None] * len(self.blue_screen_paths)  # Keeps blue screens in path order
+        
+        # Convert everything to the display format as it loads, and again if the display mode changes
+        self.display_watcher.check()
+        
+        # Build the asset index once - the popup loop only does indexed lookups
+        self.manifest = AssetManifest("Logos")
+        self.manifest.scan()
         
-        # Load logo images
-        logo_paths = glob.glob("Logos/*.png") + glob.glob("Logos/*.jpg") + glob.glob("Logos/*.webp")
-        for path in logo_paths:
-            try:
-                image = pygame.image.load(path)
-                # Scale image to fit screen while maintaining aspect ratio
-                image = self.scale_image(image, 800, 600)
-                self.logo_images.append(image)
-                print(f"Loaded: {path}")
-            except Exception as e:
-                print(f"Could not load {path}: {e}")
-        
-        # Load blue screen images
-        blue_screen_paths = ["BlueScreen1.jpg", "BlueScreen2.png"]
-        for path in blue_screen_paths:
-            if os.path.exists(path):
-                try:
-                    image = pygame.image.load(path)
-                    # Scale to full screen
-                    image = pygame.transform.scale(image, (self.screen_width, self.screen_height))
-                    self.blue_screen_images.append(image)
-                    print(f"Loaded blue screen: {path}")
-                except Exception as e:
-                    print(f"Could not load {path}: {e}")
-        
-        print(f"Loaded {len(self.logo_images)} logo images and {len(self.blue_screen_images)} blue screen images")
+        # Decode and scale in background threads; surfaces are created on this thread in poll_loader()
+        self.loader = ImageLoader(progress_callback=self.on_image_loaded, cache=ThumbnailCache())
+        for i, path in enumerate(self.blue_screen_paths):
+            # Scale to full screen
+            self.loader.submit(("blue_screen", i, 0), path, (self.screen_width, self.screen_height), stretch=True)
         
         # Initialize image indices array - one number per image file
-        if self.logo_images:
-            self.image_indices = list(range(len(self.logo_images)))  # [0,1,2,3,4,5,6,7,8,9]
+        if self.manifest.assets:
+            self.image_indices = list(range(len(self.manifest)))  # [0,1,2,3,4,5,6,7,8,9]
             self.shuffled_indices = self.image_indices.copy()
-            random.shuffle(self.shuffled_indices)
+            self.shuffle_rng.shuffle(self.shuffled_indices)
             self.current_index = 0
-            print(f"Total images: {len(self.logo_images)}")
-            print(f"Image indices array: {self.image_indices}")
-            print(f"Fixed shuffled array: {self.shuffled_indices}")
-            print(f"Each number corresponds to one image file:")
-            for i, path in enumerate(glob.glob("Logos/*.png") + glob.glob("Logos/*.jpg") + glob.glob("Logos/*.webp")):
-                if i < len(self.logo_images):
-                    print(f"  {i}: {os.path.basename(path)}")
-    
-    def scale_image(self, image, max_width, max_height):
-        """Scale image to fit within max dimensions while maintaining aspect ratio"""
-        width, height = image.get_size()
+            log.info(f"Total images: {len(self.manifest)}")
+            log_event(loader_log, logging.DEBUG, "image indices",
+                      indices=tuple(self.image_indices), shuffled=tuple(self.shuffled_indices))
+            if loader_log.isEnabledFor(logging.DEBUG):
+                # Each number corresponds to one image file
+                for i, asset in enumerate(self.manifest.assets):
+                    log_event(loader_log, logging.DEBUG, "image file", index=i, name=asset.name)
         
-        # Calculate scaling factor
-        scale_x = max_width / width
-        scale_y = max_height / height
-        scale = min(scale_x, scale_y)
+        # Decoded logos live in a pool; without a budget every logo is loaded up front
+        budget_bytes = self.resources.budgets.get("logos")
+        self.pool = LogoPool(self.manifest, self.loader, budget_bytes=budget_bytes,
+                             prefetch_count=self.options.prefetch if budget_bytes is not None else None)
+        self.pool.prefetch(self.upcoming_indices())
+        self.resources.on_evict("logos", self.pool.trim)
+        self.resources.on_evict("popups", self.expire_popups)
         
-        # Scale image
-        new_width = int(width * scale)
-        new_height = int(height * scale)
+        # Pick up logos added, changed or removed while running (file events would make replays diverge)
+        self.watcher = None
+        if not self.options.no_hot_reload and not self.session.deterministic:
+            self.watcher = FolderWatcher(self.manifest.folder, LOGO_PATTERNS)
+            self.watcher.start()
         
-        return pygame.transform.scale(image, (new_width, new_height))
+        # Only wait for the first few logos - the rest keep loading while the popups run.
+        # A deterministic run can't depend on load timing, so it waits for everything.
+        ready_target = min(self.min_ready_logos, len(self.manifest))
+        while self.loader.pending and (self.session.deterministic or len(self.pool.resident) < ready_target):
+            self.poll_loader(timeout=0.1)
     
-    def get_random_position(self, image_width, image_height):
-        """Get a random position within 1920x1080 bounds using actual image size"""
-        # Try multiple times to find a non-overlapping position
-        for attempt in range(50):  # Try up to 50 times
-            max_x = self.grid_width - image_width
-            max_y = self.grid_height - image_height
-            
-            # Ensure we don't go negative
-            if max_x < 0:
-                max_x = 0
-            if max_y < 0:
-                max_y = 0
-                
-            x = random.randint(0, max_x)
-            y = random.randint(0, max_y)
-            
-            # Check if this position overlaps with existing images
-            overlaps = False
-            for existing_x, existing_y, existing_image, _ in self.active_images:
-                # Check if rectangles overlap
-                if (x < existing_x + existing_image.get_width() and 
-                    x + image_width > existing_x and
-                    y < existing_y + existing_image.get_height() and 
-                    y + image_height > existing_y):
-                    overlaps = True
-                    break
+    def on_image_loaded(self, done, total, result):
+        """Progress callback from the image loader"""
+        if result.error is not None:
+            log.warning(f"Could not load {result.path}: {result.error}")
+        else:
+            log_event(loader_log, logging.DEBUG, "loaded", done=done, total=total, path=result.path)
+    
+    def poll_loader(self, timeout=None):
+        """Turn finished background loads into display-ready surfaces"""
+        results = self.loader.poll(timeout=timeout)
+        for result in results:
+            kind, index, version = result.key
+            if kind == "logo" and version != self.manifest[index].version:
+                continue  # File changed or was removed while it was loading
+            if result.error is not None:
+                if kind == "logo":
+                    self.pool.fail(index)
+                    self.drop_from_rotation(index)
+                continue
             
-            if not overlaps:
-                return x, y
-        
-        # If we couldn't find a non-overlapping position, return any valid position
-        max_x = self.grid_width - image_width
-        max_y = self.grid_height - image_height
-        if max_x < 0:
-            max_x = 0
-        if max_y < 0:
-            max_y = 0
-        
-        x = random.randint(0, max_x)
-        y = random.randint(0, max_y)
-        
-        # Final safety check - ensure we never exceed screen bounds
-        if x + image_width > self.grid_width:
-            x = self.grid_width - image_width
-        if y + image_height > self.grid_height:
-            y = self.grid_height - image_height
-        if x < 0:
-            x = 0
-        if y < 0:
-            y = 0
+            surface = convert_for_display(result.surface)
+            if kind == "logo":
+                popup_surface = None
+                if result.popup_surface is not None:
+                    popup_surface = convert_for_display(result.popup_surface)
+                self.pool.store(index, result.original_size, surface, popup_surface)
+            else:
+                self.blue_screen_slots[index] = track(surface, "blue_screen", "blue_screens")
+                self.blue_screen_images = [image for image in self.blue_screen_slots if image is not None]
+        
+        # Prune old cache entries once, after every logo has been decoded (and its entry touched)
+        if results and not self.cache_pruned and self.pool.all_seen and not self.loader.pending:
+            self.cache_pruned = True
+            log.info(f"Loaded {len(self.pool.seen)} logo images and {len(self.blue_screen_images)} blue screen images")
+            log.info(self.pool.summary())
+            cache = self.loader.cache
+            removed = cache.prune()
+            log.info(f"Thumbnail cache: {cache.hits} hits, {cache.misses} misses, {removed} stale entries pruned")
+    
+    def apply_logo_changes(self):
+        """Merge added, changed and removed logo files into the rotation without resetting the cycle"""
+        for kind, path in self.watcher.drain():
+            if kind == "removed":
+                index = self.manifest.remove(path)
+                if index is not None:
+                    self.pool.invalidate(index)
+                    self.drop_from_rotation(index)
+                    log.info(f"Removed logo: {path}")
+                continue
             
-        return x, y
+            index = self.manifest.by_name.get(os.path.basename(path))
+            if index is None:
+                index = self.manifest.add(path)
+                if index is None:
+                    continue  # Disabled in manifest.json
+                self.image_indices.append(index)
+                log.info(f"Added logo: {path}")
+            else:
+                self.pool.invalidate(index)
+                log.info(f"Reloading changed logo: {path}")
+            if index not in self.shuffled_indices:
+                self.add_to_rotation(index)
+            self.pool.prefetch(self.upcoming_indices())
+    
+    def add_to_rotation(self, image_index):
+        """Insert an image into the part of the shuffled array not yet shown this cycle"""
+        position = self.shuffle_rng.randint(self.current_index, len(self.shuffled_indices))
+        self.shuffled_indices.insert(position, image_index)
+    
+    def drop_from_rotation(self, image_index):
+        """Remove an image from the shuffled array without disturbing the current cycle"""
+        if image_index not in self.shuffled_indices:
+            return
+        position = self.shuffled_indices.index(image_index)
+        self.shuffled_indices.pop(position)
+        if position < self.current_index:
+            self.current_index -= 1
+    
+    def wait_for_logo(self, image_index):
+        """Block until a logo is resident or has failed (deterministic mode only)"""
+        self.pool.request(image_index)
+        while not self.manifest[image_index].loaded and self.loader.pending:
+            self.poll_loader(timeout=0.1)
+    
+    def upcoming_indices(self):
+        """Shuffled indices in the order they will be shown next"""
+        return self.shuffled_indices[self.current_index:] + self.shuffled_indices[:self.current_index]
+    
+    def convert_images(self):
+        """Convert all loaded surfaces to the display's native format"""
+        if self.manifest is None:
+            return
+        self.pool.convert(convert_for_display)
+        self.blue_screen_slots = [track(convert_for_display(image), "blue_screen", "blue_screens")
+                                  if image is not None else None for image in self.blue_screen_slots]
+        self.blue_screen_images = [image for image in self.blue_screen_slots if image is not None]
+        self.active_images = [(x, y, track(convert_for_display(image), "popups", "popups"), timer)
+                              for x, y, image, timer in self.active_images]
+        # Converted popups are new surfaces, so re-key the placement grid
+        self.placement.clear()
+        for x, y, image, timer in self.active_images:
+            self.placement.add(image, x, y, image.get_width(), image.get_height())
+        log.info(f"Converted images to display format ({pygame.display.get_surface().get_bitsize()} bpp)")
+    
+    def scale_image(self, image, max_width, max_height):
+        """Scale image to fit within max dimensions while maintaining aspect ratio"""
+        return scale_to_fit(image, max_width, max_height)
+    
+    def get_random_position(self, image_width, image_height):
+        """Get a random non-overlapping position using actual image size, or None if the screen is full"""
+        position = self.placement.find_position(image_width, image_height)
+        if position is None and not self.placement:
+            # Bigger than the whole screen - pin it to the top-left corner
+            return 0, 0
+        return position
+    
+    def spawn_popup(self, image_index):
+        """Add one logo to the screen at a free position, returns False if there is no room yet"""
+        # Popup surface is pre-scaled at load time (O4U4.jpg and O4U1.jpg keep their size)
+        popup_surface = self.manifest[image_index].popup_surface
+        width, height = popup_surface.get_size()
+        
+        # Get position using actual image dimensions
+        position = self.get_random_position(width, height)
+        if position is None:
+            log_event(placement_log, logging.DEBUG, "no free space, waiting for a popup to expire",
+                      image=image_index, width=width, height=height, active=len(self.active_images))
+            return False
+        x, y = position
+        
+        # Each popup gets its own converted copy so its fade alpha doesn't affect others
+        scaled_image = track(popup_surface.copy(), "popups", "popups")
+        self.render_stats.count_surface()
+        self.placement.add(scaled_image, x, y, width, height)
+        log_event(popup_log, logging.DEBUG, "popup spawned", image=image_index, size=f"{width}x{height}",
+                  pos=(x, y), max_x=x + width, max_y=y + height)
+        self.active_images.append((x, y, scaled_image, 0))
+        return True
+    
+    def expire_popups(self, excess_bytes):
+        """Eviction callback for the popups budget: take the oldest popups off the screen early"""
+        while excess_bytes > 0 and len(self.active_images) > 1:
+            x, y, image, timer = self.active_images.pop(0)
+            self.placement.remove(image)
+            excess_bytes -= resource_registry.resource_bytes(image)
     
     def draw_popup_images(self):
         """Draw images popping up randomly on screen"""
@@ -181,128 +359,100 @@ class SimpleHackerMode:
         # Add new images gradually with fade-in effect
         self.popup_timer += 1
         if self.popup_timer > 30 and len(self.active_images) < self.max_images:  # Add new image every 0.5 seconds
-            if self.logo_images and self.shuffled_indices:
+            if self.shuffled_indices:
                 # Check if we've gone through all images in current shuffled array
                 if self.current_index >= len(self.shuffled_indices):
                     # Reset to start of same shuffled array (no new array)
                     self.current_index = 0
-                    print(f"Reset to start of same shuffled array: {self.shuffled_indices}")
+                    log_event(popup_log, logging.DEBUG, "reset to start of same shuffled array",
+                              shuffled=tuple(self.shuffled_indices))
                 
-                # Get next image from shuffled array
+                # Get next image from shuffled array (wait for it if it is still loading)
                 image_index = self.shuffled_indices[self.current_index]
-                self.current_index += 1
-                
-                image = self.logo_images[image_index]
-                
-                # Check if this is O4U4.jpg or O4U1.jpg - don't scale these
-                image_paths = glob.glob("Logos/*.png") + glob.glob("Logos/*.jpg") + glob.glob("Logos/*.webp")
-                if image_index < len(image_paths):
-                    current_path = image_paths[image_index]
-                    if "O4U4.jpg" in current_path or "O4U1.jpg" in current_path:
-                        # Don't scale these images - use original size
-                        scaled_image = image
-                    else:
-                        # Scale other images to twice as big (400x400 max)
-                        scaled_image = self.scale_image(image, 400, 400)
-                else:
-                    # Fallback - scale all images
-                    scaled_image = self.scale_image(image, 400, 400)
-                
-                # Get position using actual image dimensions
-                x, y = self.get_random_position(scaled_image.get_width(), scaled_image.get_height())
-                print(f"Image {image_index}: size={scaled_image.get_width()}x{scaled_image.get_height()}, pos=({x},{y}), max_x={x+scaled_image.get_width()}, max_y={y+scaled_image.get_height()}")
-                self.active_images.append((x, y, scaled_image, 0))
+                if self.session.deterministic:
+                    self.wait_for_logo(image_index)
+                if self.pool.get(image_index) is not None and self.spawn_popup(image_index):
+                    self.current_index += 1
+                    self.pool.prefetch(self.upcoming_indices())
             self.popup_timer = 0
         
-        # Draw all active images
-        for i, (x, y, image, timer) in enumerate(self.active_images):
-            # Fade in effect
+        # Draw all active images in one batch
+        batch = []
+        for x, y, image, timer in self.active_images:
+            # Fade in effect - per-surface alpha on the popup's own copy, no new surfaces
             alpha = min(255, timer * 5)
             if alpha > 0:
-                # Create a surface with alpha
-                image_surface = pygame.Surface(image.get_size(), pygame.SRCALPHA)
-                image_surface.blit(image, (0, 0))
-                image_surface.set_alpha(alpha)
-                self.screen.blit(image_surface, (x, y))
+                if timer <= 51:  # Still fading in (alpha reaches 255 at timer 51)
+                    image.set_alpha(alpha)
+                batch.append((image, (x, y)))
+        self.screen.blits(batch, doreturn=False)
         
         # Update timers and remove old images
+        for x, y, image, timer in self.active_images:
+            if timer >= 360:
+                self.placement.remove(image)
         self.active_images = [(x, y, image, timer + 1) for x, y, image, timer in self.active_images if timer < 360]  # Keep for 6 seconds
         
         # Check if we should move to blue screen phase (after all images have been shown and disappeared OR after 20 seconds)
         if (len(self.active_images) == 0 and self.current_index >= len(self.shuffled_indices)) or self.popup_timer > 1200:  # 20 seconds at 60 FPS
             self.current_mode = "blue_screen"
-            self.blue_screen_index = 1  # Go directly to BlueScreen2.png (index 1)
+            self.blue_screen_index = self.second_blue_screen()  # Go directly to BlueScreen2.png (index 1)
             self.popup_timer = 0  # Reset timer
     
     def reset_popup_phase(self):
         """Reset the popup phase"""
         self.current_mode = "popup"
         self.active_images = []
+        self.placement.clear()
         self.popup_timer = 0
         # Reset to start of same shuffled array (no new array)
         self.current_index = 0
-        print(f"Reset to start of same shuffled array: {self.shuffled_indices}")
-        print("Ready to populate all 10 images at once!")
+        log_event(popup_log, logging.DEBUG, "popup phase reset", shuffled=tuple(self.shuffled_indices))
     
-    def generate_error_messages(self):
-        """Generate random error messages for crash simulation"""
-        error_templates = [
-            "ERROR: Memory access violation at 0x{:08X}",
-            "CRITICAL: Stack overflow detected",
-            "FATAL: Null pointer dereference",
-            "ERROR: Division by zero exception",
-            "CRITICAL: Buffer overflow in module {}",
-            "FATAL: Access violation reading 0x{:08X}",
-            "ERROR: Invalid instruction at 0x{:08X}",
-            "CRITICAL: Heap corruption detected",
-            "FATAL: Unhandled exception in thread {}",
-            "ERROR: Stack corruption at 0x{:08X}",
-            "CRITICAL: Memory leak detected ({} bytes)",
-            "FATAL: System call failed: {}",
-            "ERROR: Invalid memory address 0x{:08X}",
-            "CRITICAL: Deadlock detected in thread pool",
-            "FATAL: Corrupted heap block at 0x{:08X}"
-        ]
-        
-        self.error_messages = []
-        for _ in range(20):  # Generate 20 error messages
-            template = random.choice(error_templates)
+    def error_message_stream(self):
+        """Endless stream of random error messages for crash simulation"""
+        while True:
+            template = self.error_rng.choice(ERROR_TEMPLATES)
             if "0x" in template:
-                error_msg = template.format(random.randint(0x10000000, 0xFFFFFFFF))
+                yield template.format(self.error_rng.randint(0x10000000, 0xFFFFFFFF))
             elif "{}" in template:
-                error_msg = template.format(random.randint(1000, 99999))
+                yield template.format(self.error_rng.randint(1000, 99999))
             else:
-                error_msg = template
-            
-            self.error_messages.append(error_msg)
+                yield template
+    
+    def generate_error_messages(self):
+        """Generate random error messages for crash simulation"""
+        self.error_messages = list(itertools.islice(self.error_message_stream(), 20))  # Generate 20 error messages
+    
+    def start_crash_phase(self):
+        """Switch to the crash simulation with a fresh set of error messages"""
+        self.current_mode = "crash"
+        self.crash_timer = 0
+        self.crash_lines_shown = 0
+        self.generate_error_messages()
+        self.crash_console.clear()
     
     def draw_crash_screen(self):
         """Draw the crash simulation with error messages"""
         self.screen.fill(self.BLACK)
         
-        # Draw error messages
-        y_offset = 50
-        messages_to_show = min(len(self.error_messages), self.crash_timer // 30)  # Show one message every 0.5 seconds
-        
-        for i in range(messages_to_show):
-            if i < len(self.error_messages):
-                error_text = self.error_messages[i]
-                error_surface = self.font_small.render(error_text, True, self.RED)
-                self.screen.blit(error_surface, (50, y_offset + i * 30))
+        # Stream error messages into the console - one message every 0.5 seconds.
+        # Each line is rendered once; the console keeps the composited text between frames.
+        messages_to_show = min(len(self.error_messages), self.crash_timer // 30)
+        if self.crash_lines_shown < messages_to_show:
+            self.crash_console.extend(self.error_messages[self.crash_lines_shown:messages_to_show])
+            self.crash_lines_shown = messages_to_show
+        self.crash_console.draw(self.screen, (50, 50))
         
         # Draw crash message
         if self.crash_timer > 600:  # After 10 seconds
-            crash_text = "SYSTEM CRASH DETECTED"
-            crash_surface = self.font_large.render(crash_text, True, self.RED)
-            crash_rect = crash_surface.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
-            self.screen.blit(crash_surface, crash_rect)
+            crash_rect = self.crash_banner.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
+            self.screen.blit(self.crash_banner, crash_rect)
             
             # Draw blue screen message
             if self.crash_timer > 900:  # After 15 seconds
-                blue_screen_text = "Initiating Blue Screen of Death..."
-                blue_surface = self.font_medium.render(blue_screen_text, True, self.BLUE)
-                blue_rect = blue_surface.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 50))
-                self.screen.blit(blue_surface, blue_rect)
+                blue_rect = self.crash_subbanner.get_rect(center=(self.screen_width // 2, self.screen_height // 2 + 50))
+                self.screen.blit(self.crash_subbanner, blue_rect)
         
         # Move to blue screen after crash simulation
         if self.crash_timer > 1200:  # After 20 seconds
@@ -326,41 +476,91 @@ class SimpleHackerMode:
                 # If we've shown all blue screens, restart
                 if self.blue_screen_index == 0:
                     self.reset_popup_phase()
+            else:
+                # Nothing changes until the next blue screen is due
+                self.idle.request(301 - self.image_timer, self.skip_blue_screen_frames)
         else:
             # Fallback: draw a simple blue screen
             self.screen.fill(self.BLUE)
-            error_text = "BLUE SCREEN OF DEATH"
-            error_surface = self.font_large.render(error_text, True, self.WHITE)
+            if self.fallback_blue_screen_text is None:
+                error_text = "BLUE SCREEN OF DEATH"
+                self.fallback_blue_screen_text = track(self.font_large.render(error_text, True, self.WHITE),
+                                                       "blue_screen", "text")
+                self.render_stats.count_surface()
+            error_surface = self.fallback_blue_screen_text
             error_rect = error_surface.get_rect(center=(self.screen_width // 2, self.screen_height // 2))
             self.screen.blit(error_surface, error_rect)
+            self.idle.request(UNTIL_INPUT)
+    
+    def second_blue_screen(self):
+        """Index of BlueScreen2.png, or the first blue screen if it's the only one"""
+        return 1 if len(self.blue_screen_images) > 1 else 0
+    
+    def skip_blue_screen_frames(self, frames):
+        """Count frames slept through by the idle scheduler toward the blue screen timer"""
+        self.image_timer += frames
     
     def handle_events(self):
         """Handle pygame events"""
-        for event in pygame.event.get():
+        for event in self.session.events():
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_ESCAPE or event.key == pygame.K_F11:
                     self.running = False
+                elif event.key == pygame.K_F3:
+                    self.pacer.toggle_overlay()
+                elif event.key == pygame.K_F4 and self.crt is not None:
+                    self.crt.toggle()
+                elif event.key == pygame.K_F5:
+                    log.info(self.resources.report())
                 elif event.key == pygame.K_SPACE:
                     if self.current_mode == "popup":
                         self.current_mode = "blue_screen"
-                        self.blue_screen_index = 1  # Go directly to BlueScreen2.png
+                        self.blue_screen_index = self.second_blue_screen()  # Go directly to BlueScreen2.png
                     elif self.current_mode == "blue_screen":
                         self.reset_popup_phase()
     
     def update(self):
         """Update game state"""
-        pass  # No updates needed for current modes
+        if self.watcher is not None:
+            self.apply_logo_changes()
+        if self.loader.pending:
+            self.poll_loader()
     
     def draw(self):
         """Draw the current frame"""
         if self.current_mode == "popup":
             self.draw_popup_images()
+        elif self.current_mode == "crash":
+            self.draw_crash_screen()
         elif self.current_mode == "blue_screen":
             self.draw_blue_screen()
         
+        if self.crt is not None:
+            self.render_stats.count_surface(self.crt.apply(self.screen))
+        self.pacer.draw_overlay(self.screen, self.font_small)
         pygame.display.flip()
+        startup_profile.first_frame()
+        self.session.end_frame(self.screen)
+        self.render_stats.end_frame()
+    
+    def run_frame(self):
+        """Handle input, update, draw and wait for the next frame"""
+        metrics = self.metrics
+        metrics.start_frame()
+        self.handle_events()
+        self.display_watcher.check()
+        metrics.lap("events")
+        self.update()
+        metrics.lap("update")
+        self.draw()
+        self.resources.enforce()
+        metrics.lap("draw")
+        interval = self.pacer.wait()
+        self.idle.wait(self.pacer)
+        metrics.lap("wait")
+        metrics.end_frame(interval, self.current_mode)
     
     def run(self):
         """Main game loop"""
@@ -371,31 +571,41 @@ class SimpleHackerMode:
         print("\nControls:")
         print("- SPACE: Skip to next phase")
         print("- ESC or F11: Exit fullscreen")
+        print("- F5: Log resident memory")
         print("\nStarting image popup sequence...")
         print(f"Screen resolution: {self.screen_width}x{self.screen_height}")
         print(f"Grid: {self.grid_width}x{self.grid_height} (should be 1920x1080)")
-        print(f"DEBUG: grid_width={self.grid_width}, grid_height={self.grid_height}")
+        log_event(placement_log, logging.DEBUG, "grid", grid_width=self.grid_width, grid_height=self.grid_height)
         print(f"Max images on screen: {self.max_images} (gradual popup, no overlapping)")
         print(f"Image size: 400x400 pixels max (twice as big) - except O4U4.jpg and O4U1.jpg (original size)")
         print(f"Image duration: 6 seconds each")
         print(f"Auto-transition to blue screen: 20 seconds")
         print(f"Background: White")
-        print(f"Total logos to cycle through: {len(self.logo_images)}")
+        print(f"Total logos to cycle through: {len(self.manifest)}")
         print(f"Shuffled array system: Fixed random order [0-9], positions randomized each cycle")
         
         while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+            self.run_frame()
         
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self.metrics_server is not None:
+            self.metrics_server.stop()
+        self.loader.shutdown()
+        self.session.close()
+        if self.options.frame_stats:
+            print(self.pacer.stats.summary())
+            print(self.idle.summary())
+        log.info(self.pool.summary())
+        log.info(self.render_stats.summary())
+        log.info(self.resources.report())
         print("👋 Simple Hacker Mode terminated!")
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
     try:
-        hacker_mode = SimpleHackerMode()
+        hacker_mode = SimpleHackerMode(parse_options(description="Simple Hacker Mode", logo_wall=True))
         hacker_mode.run()
     except KeyboardInterrupt:
         print("\n🛑 Interrupted by user")
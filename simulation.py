@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Simulation Module
+=================
+
+Slideshow simulation state and an optional pipeline that steps it on a
+worker thread. The Matrix rain lives in NumPy arrays, so a step is a
+handful of vectorized operations that run outside the GIL for most of
+their time, and a frame's positions can be snapshotted with a few array
+copies.
+
+With the pipeline on, the worker simulates frame N+1 while the main
+thread renders frame N from a read-only snapshot.
+"""
+
+import random
+import threading
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+
+class MatrixRain:
+    """Falling Matrix columns as NumPy arrays, stepped once per frame"""
+
+    def __init__(self, columns: int, width: int, height: int, rng=random):
+        self.width = width
+        self.height = height
+
+        xs, ys, speeds, strings = [], [], [], []
+        for _ in range(columns):
+            xs.append(rng.randint(0, width))
+            ys.append(rng.randint(-500, 0))
+            speeds.append(rng.randint(1, 3))
+            strings.append("".join([chr(rng.randint(33, 126)) for _ in range(rng.randint(10, 30))]))
+        self.chars = strings
+        self.x = np.array(xs, dtype=np.int32)
+        self.y = np.array(ys, dtype=np.int32)
+        self.speed = np.array(speeds, dtype=np.int32)
+        self.length = np.array([len(chars) for chars in strings], dtype=np.int32)
+        self.char_index = np.zeros(columns, dtype=np.int32)
+        self.reset = np.zeros(columns, dtype=bool)
+        # Columns that fall off the bottom restart from a generator seeded by the stream, so runs stay reproducible
+        self.np_rng = np.random.default_rng(rng.getrandbits(64))
+
+    def __len__(self):
+        return len(self.chars)
+
+    def step(self):
+        """Move every column down and advance its highlighted character"""
+        self.y += self.speed
+        self.char_index += 1
+        np.remainder(self.char_index, self.length, out=self.char_index)
+
+        # Reset columns that went off screen
+        np.greater(self.y, self.height, out=self.reset)
+        count = int(np.count_nonzero(self.reset))
+        if count:
+            self.y[self.reset] = self.np_rng.integers(-500, -99, count)
+            self.x[self.reset] = self.np_rng.integers(0, self.width + 1, count)
+
+
+class MatrixSnapshot:
+    """Read-only copy of the column positions for one frame"""
+
+    def __init__(self, columns: int):
+        self.x = np.zeros(columns, dtype=np.int32)
+        self.y = np.zeros(columns, dtype=np.int32)
+        self.char_index = np.zeros(columns, dtype=np.int32)
+
+    def copy_from(self, rain: MatrixRain):
+        for target, source in ((self.x, rain.x), (self.y, rain.y), (self.char_index, rain.char_index)):
+            target.flags.writeable = True
+            np.copyto(target, source)
+            target.flags.writeable = False  # The render thread must not write to it
+
+
+class FrameSnapshot:
+    """Everything the renderer needs from the simulation for one frame"""
+
+    def __init__(self, columns: int):
+        self.matrix = MatrixSnapshot(columns)
+        self.graphs = None  # Immutable GraphState
+
+
+class SimulationPipeline:
+    """Steps the simulation one frame ahead on a worker thread
+
+    Handoff protocol: there are two snapshot slots, each owned by exactly
+    one thread at a time. The worker steps the simulation, copies it into
+    the back slot and signals `ready`. At the start of a frame the main
+    thread waits for `ready`, makes the back slot its front slot, hands
+    the previous front slot to the worker as the new back slot and
+    signals `go`. Neither thread holds a lock while simulating or
+    rendering.
+    """
+
+    def __init__(self, step: Callable[[], None], publish: Callable[[Any], None], slots: List[Any]):
+        if len(slots) != 2:
+            raise ValueError("the pipeline double-buffers: it needs exactly two snapshot slots")
+        self.step = step
+        self.publish = publish
+        self.slots = slots
+        self.back = 0  # Slot the worker writes next
+        self.go = threading.Semaphore(0)
+        self.ready = threading.Semaphore(0)
+        self.stopping = False
+        self.error: Optional[BaseException] = None
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start the worker and have it simulate the first frame"""
+        self.thread = threading.Thread(target=self.run, name="simulation", daemon=True)
+        self.thread.start()
+        self.go.release()
+
+    def run(self):
+        while True:
+            self.go.acquire()
+            if self.stopping:
+                return
+            try:
+                self.step()
+                self.publish(self.slots[self.back])
+            except BaseException as e:
+                self.error = e
+            self.ready.release()
+
+    def next_frame(self):
+        """Snapshot to render this frame; the worker starts on the frame after it"""
+        self.ready.acquire()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        front = self.slots[self.back]
+        self.back = 1 - self.back
+        self.go.release()
+        return front
+
+    def stop(self):
+        if self.thread is None:
+            return
+        self.stopping = True
+        self.go.release()
+        self.thread.join()
+        self.thread = None
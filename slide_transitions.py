@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Slide Transitions Module
+========================
+
+Animated transitions between slideshow slides. Both slides are rendered
+once into cached surfaces; a transition only blits those surfaces, so a
+transition frame costs a few blits whatever is on the slides:
+
+- crossfade: the outgoing slide fades out while the incoming fades in
+  (surface alpha on top of the slides' own per-pixel alpha)
+- wipe: the incoming slide is revealed left to right behind a bright edge
+- glitch: the slide dissolves block by block in a shuffled order, with a
+  few rows of blocks jittered sideways like a corrupted signal; all the
+  blocks go out in one blits() call
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+import pygame
+
+from options import DEFAULT_TRANSITION, TRANSITION_CHOICES, TRANSITIONS
+
+TRANSITION_FRAMES = 30
+GLITCH_BLOCK = 40  # Block size in pixels
+GLITCH_JITTER = 12  # Largest sideways jitter in pixels
+GLITCH_ROWS = 2  # Rows of blocks jittered per frame
+
+
+class SlideTransitions:
+    """Runs one transition at a time between two cached slide surfaces"""
+
+    def __init__(self, kind: str = DEFAULT_TRANSITION, frames: int = TRANSITION_FRAMES, rng=random,
+                 edge_color: Tuple[int, int, int] = (50, 255, 50)):
+        if kind not in TRANSITION_CHOICES:
+            raise ValueError(f"unknown transition: {kind}")
+        self.kind = kind
+        self.frames = frames
+        self.rng = rng
+        self.edge_color = edge_color
+        self.next_kind = 0  # Position in TRANSITIONS when cycling
+
+        self.current: Optional[str] = None  # Transition in progress
+        self.outgoing: Optional[pygame.Surface] = None
+        self.incoming: Optional[pygame.Surface] = None
+        self.frame = 0
+        self.blocks: List[pygame.Rect] = []  # Glitch blocks for the current slide size
+        self.block_size: Optional[Tuple[int, int]] = None
+        self.order: List[int] = []  # Frame (in blocks revealed) at which each block switches
+
+    @property
+    def active(self) -> bool:
+        return self.current is not None
+
+    def start(self, outgoing: pygame.Surface, incoming: pygame.Surface):
+        """Begin a transition; both slides must be the same size"""
+        if self.kind == "none":
+            return
+        if self.kind == "cycle":
+            self.current = TRANSITIONS[self.next_kind]
+            self.next_kind = (self.next_kind + 1) % len(TRANSITIONS)
+        else:
+            self.current = self.kind
+        self.outgoing = outgoing
+        self.incoming = incoming
+        self.frame = 0
+        if self.current == "glitch":
+            self.prepare_glitch(incoming.get_size())
+
+    def prepare_glitch(self, size: Tuple[int, int]):
+        if size != self.block_size:
+            self.block_size = size
+            self.blocks = [pygame.Rect(x, y, min(GLITCH_BLOCK, size[0] - x), min(GLITCH_BLOCK, size[1] - y))
+                           for y in range(0, size[1], GLITCH_BLOCK) for x in range(0, size[0], GLITCH_BLOCK)]
+        self.order = list(range(len(self.blocks)))
+        self.rng.shuffle(self.order)
+
+    def draw(self, screen: pygame.Surface, position: Tuple[int, int]):
+        """Draw this frame of the transition at position and advance it"""
+        progress = (self.frame + 1) / (self.frames + 1)
+        if self.current == "crossfade":
+            self.draw_crossfade(screen, position, progress)
+        elif self.current == "wipe":
+            self.draw_wipe(screen, position, progress)
+        else:
+            self.draw_glitch(screen, position, progress)
+
+        self.frame += 1
+        if self.frame >= self.frames:
+            self.current = self.outgoing = self.incoming = None
+
+    def draw_crossfade(self, screen: pygame.Surface, position: Tuple[int, int], progress: float):
+        alpha = int(255 * progress)
+        self.outgoing.set_alpha(255 - alpha)
+        self.incoming.set_alpha(alpha)
+        screen.blit(self.outgoing, position)
+        screen.blit(self.incoming, position)
+        # 255, not None: None would switch off blending and draw the slides' transparent inside as black
+        self.outgoing.set_alpha(255)
+        self.incoming.set_alpha(255)
+
+    def draw_wipe(self, screen: pygame.Surface, position: Tuple[int, int], progress: float):
+        width, height = self.incoming.get_size()
+        edge = int(width * progress)
+        x, y = position
+        screen.blit(self.incoming, position, (0, 0, edge, height))
+        screen.blit(self.outgoing, (x + edge, y), (edge, 0, width - edge, height))
+        pygame.draw.line(screen, self.edge_color, (x + edge, y), (x + edge, y + height - 1), 2)
+
+    def draw_glitch(self, screen: pygame.Surface, position: Tuple[int, int], progress: float):
+        revealed = int(len(self.blocks) * progress)
+        x, y = position
+        columns = -(-self.block_size[0] // GLITCH_BLOCK)
+        rows = len(self.blocks) // columns
+        jittered = {self.rng.randrange(rows): self.rng.randint(-GLITCH_JITTER, GLITCH_JITTER)
+                    for _ in range(GLITCH_ROWS)}
+        batch = []
+        for index, block in enumerate(self.blocks):
+            source = self.incoming if self.order[index] < revealed else self.outgoing
+            dx = jittered.get(index // columns, 0)
+            batch.append((source, (x + block.x + dx, y + block.y), block))
+        screen.blits(batch, doreturn=False)
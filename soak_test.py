@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Soak Test
+=========
+
+Runs the shows headless at uncapped speed for as many frames as days of
+kiosk time take, and checks that memory stays flat. Each engine runs in
+deterministic mode, so the simulated clock advances one 60 FPS frame per
+frame and the show cycles exactly as on a kiosk (a million frames is
+about 4.6 hours of show).
+
+At the start of each show cycle - Simple Hacker Mode back to the popups
+after the blue screens, FunHackerMode back to the first slide - at most
+every --sample-every frames, it records:
+
+- the tracemalloc snapshot (Python allocations)
+- the resident set size from /proc/self/statm (everything, SDL included)
+- the resources in the resource registry (surfaces, sounds, glyphs)
+
+The popups keep cycling through the logos until someone presses SPACE,
+so the soak test presses it after --popup-frames frames of popups, the
+way an operator would, to run the whole popup, blue screen and reset
+loop.
+
+The first sample after --warmup cycles, once the caches have filled, is
+the baseline. An engine fails if any of them has grown by more than the
+tolerance by its last sample, and the allocation sites that grew the
+most since the baseline are printed either way.
+
+Usage:
+    python soak_test.py [--engine simple|main|both] [--frames N] [-- engine options]
+"""
+
+import os
+import sys
+import time
+import argparse
+import fnmatch
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+import resource_registry
+from options import parse_options
+
+ENGINES = ("simple", "main")
+DEFAULT_FRAMES = 1_000_000
+DEFAULT_SAMPLE_EVERY = 20_000
+DEFAULT_WARMUP = 2  # Cycles before the baseline sample
+DEFAULT_TOLERANCE_MB = 8.0
+DEFAULT_RESOURCE_TOLERANCE = 64  # Extra tracked resources allowed (e.g. glyphs for characters seen late)
+DEFAULT_TOP = 10
+DEFAULT_POPUP_FRAMES = 1200  # 20 seconds of popups per cycle
+TRACEBACK_DEPTH = 4
+MB = 2**20
+
+
+@dataclass
+class Sample:
+    frame: int
+    cycle: int
+    seconds: float  # Wall time since the engine started
+    traced_bytes: int
+    rss_bytes: Optional[int]
+    resources: int
+    resource_bytes: int
+    snapshot: Optional[tracemalloc.Snapshot]  # Kept for the baseline and the latest sample only
+
+
+def rss_bytes() -> Optional[int]:
+    """Current resident set size (peak RSS where /proc isn't available, None on Windows)"""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in KB on Linux and bytes on macOS; it never shrinks, so growth still shows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def take_sample(frame: int, cycle: int, started: float) -> Sample:
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, fnmatch.__file__),  # Used by the filters themselves
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    ))
+    registry = resource_registry.get_registry()
+    return Sample(frame, cycle, time.perf_counter() - started, tracemalloc.get_traced_memory()[0],
+                  rss_bytes(), len(registry.entries), registry.resident(), snapshot)
+
+
+def make_simple(engine_options: List[str]):
+    import simple_hacker
+    return simple_hacker.SimpleHackerMode(parse_options(engine_options, logo_wall=True))
+
+
+def close_simple(engine):
+    engine.loader.shutdown()
+    engine.session.close()
+
+
+def press_space():
+    pygame.event.post(pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE, mod=0, unicode=" ", scancode=44))
+
+
+def advance_simple(engine, phase_frames: int, popup_frames: int):
+    """Skip from the popups to the blue screens once they have run for popup_frames"""
+    if engine.current_mode == "popup" and phase_frames == popup_frames:
+        press_space()
+
+
+def make_main(engine_options: List[str]):
+    import main
+    return main.FunHackerMode(parse_options(engine_options))
+
+
+def close_main(engine):
+    if engine.pipeline is not None:
+        engine.pipeline.stop()
+    if engine.widgets is not None:
+        engine.widgets.stop()
+    engine.session.close()
+
+
+# Engine -> (constructor, cleanup, true on the frames at the start of a show cycle, key presses per frame)
+ENGINE_HOOKS = {
+    "simple": (make_simple, close_simple, lambda engine: engine.current_mode == "popup", advance_simple),
+    "main": (make_main, close_main,
+             lambda engine: engine.current_mode == "slideshow" and engine.current_image_index == 0
+             and not engine.transitions.active,
+             lambda engine, phase_frames, popup_frames: None),  # The slideshow loops on its own
+}
+
+
+def soak(name: str, engine_options: List[str], frames: int, sample_every: int, warmup: int, popup_frames: int,
+         progress: Callable[[Sample], None]) -> List[Sample]:
+    """Run one engine and sample memory at cycle starts; the first sample is the baseline"""
+    make, close, at_cycle_start, advance = ENGINE_HOOKS[name]
+    engine = make(engine_options)
+    samples = []
+    cycles = 0
+    mode = engine.current_mode
+    phase_frames = 0
+    was_at_start = True  # Both shows start mid-cycle (boot sequence, first popups)
+    last_sample = 0
+    started = time.perf_counter()
+    try:
+        for frame in range(1, frames + 1):
+            engine.run_frame()
+            if not engine.running:
+                break
+            if engine.current_mode != mode:
+                mode = engine.current_mode
+                phase_frames = 0
+            phase_frames += 1
+            advance(engine, phase_frames, popup_frames)
+            at_start = at_cycle_start(engine)
+            if at_start and not was_at_start:
+                cycles += 1
+                if cycles >= warmup and (not samples or frame - last_sample >= sample_every):
+                    if len(samples) > 1:
+                        samples[-1].snapshot = None  # Snapshots are large; only compare against the baseline
+                    samples.append(take_sample(frame, cycles, started))
+                    last_sample = frame
+                    progress(samples[-1])
+            was_at_start = at_start
+    finally:
+        close(engine)
+    return samples
+
+
+def growth(samples: List[Sample], field: str) -> Optional[int]:
+    first, last = getattr(samples[0], field), getattr(samples[-1], field)
+    return None if first is None or last is None else last - first
+
+
+def report(name: str, samples: List[Sample], tolerance: int, resource_tolerance: int, top: int) -> bool:
+    """Print the growth since the baseline and the top growing sites; returns False on a leak"""
+    if len(samples) < 2:
+        print(f"{name}: only {len(samples)} sample(s) - run more frames or lower --sample-every")
+        return True
+
+    checks = [
+        ("Python heap (tracemalloc)", growth(samples, "traced_bytes"), tolerance, MB, "MB"),
+        ("Resident set size", growth(samples, "rss_bytes"), tolerance, MB, "MB"),
+        ("Tracked resource bytes", growth(samples, "resource_bytes"), tolerance, MB, "MB"),
+        ("Tracked resources", growth(samples, "resources"), resource_tolerance, 1, ""),
+    ]
+    passed = True
+    first, last = samples[0], samples[-1]
+    print(f"{name}: frames {first.frame}-{last.frame}, cycles {first.cycle}-{last.cycle}")
+    for label, grown, limit, unit, suffix in checks:
+        if grown is None:
+            print(f"  {label:<28} unavailable")
+            continue
+        ok = grown <= limit
+        passed = passed and ok
+        print(f"  {label:<28} {grown / unit:>+10.2f} {suffix:<2} (tolerance {limit / unit:.1f})"
+              f"{'' if ok else '  FAIL'}")
+
+    stats = [stat for stat in last.snapshot.compare_to(first.snapshot, "traceback") if stat.size_diff > 0]
+    if stats:
+        print("  Top growing allocation sites since the baseline:")
+        for stat in stats[:top]:
+            site, *callers = reversed(stat.traceback)  # Tracebacks run from the oldest frame
+            print(f"  {stat.size_diff / 1024:>+10.1f} KB {stat.count_diff:>+7} blocks  {site.filename}:{site.lineno}")
+            for caller in callers:
+                print(f"  {'':>30}  called from {caller.filename}:{caller.lineno}")
+    return passed
+
+
+def main_soak(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Headless soak test with leak detection",
+                                     epilog="Arguments after -- are passed to the engines, e.g. -- --crt all")
+    parser.add_argument("--engine", choices=ENGINES + ("both",), default="both",
+                        help="Which show to run (default: both, one after the other)")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help=f"Frames to run per engine (default: {DEFAULT_FRAMES:,})")
+    parser.add_argument("--sample-every", type=int, default=DEFAULT_SAMPLE_EVERY, metavar="FRAMES",
+                        help=f"Fewest frames between samples, taken at cycle starts (default: {DEFAULT_SAMPLE_EVERY:,})")
+    parser.add_argument("--warmup", type=int, default=DEFAULT_WARMUP, metavar="CYCLES",
+                        help=f"Show cycles before the baseline sample (default: {DEFAULT_WARMUP})")
+    parser.add_argument("--tolerance-mb", type=float, default=DEFAULT_TOLERANCE_MB,
+                        help=f"Growth allowed in heap, RSS and tracked bytes (default: {DEFAULT_TOLERANCE_MB})")
+    parser.add_argument("--resource-tolerance", type=int, default=DEFAULT_RESOURCE_TOLERANCE, metavar="COUNT",
+                        help=f"Growth allowed in tracked resources (default: {DEFAULT_RESOURCE_TOLERANCE})")
+    parser.add_argument("--popup-frames", type=int, default=DEFAULT_POPUP_FRAMES, metavar="FRAMES",
+                        help=f"Frames of popups before pressing SPACE for the blue screen (default: {DEFAULT_POPUP_FRAMES})")
+    parser.add_argument("--top", type=int, default=DEFAULT_TOP,
+                        help=f"Growing allocation sites to print (default: {DEFAULT_TOP})")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the deterministic run (default: 1)")
+    argv = sys.argv[1:] if argv is None else argv
+    engine_options = []
+    if "--" in argv:
+        split = argv.index("--")
+        argv, engine_options = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+    engine_options = ["--seed", str(args.seed), "--fps", "0"] + engine_options
+
+    def progress(sample: Sample):
+        rss = "?" if sample.rss_bytes is None else f"{sample.rss_bytes / MB:.1f}"
+        print(f"  frame {sample.frame:>10,} cycle {sample.cycle:>6} {sample.frame / sample.seconds:>8.0f} fps  "
+              f"heap {sample.traced_bytes / MB:>7.1f} MB  rss {rss:>7} MB  "
+              f"{sample.resources:>6} resources {sample.resource_bytes / MB:>7.1f} MB")
+
+    tracemalloc.start(TRACEBACK_DEPTH)
+    passed = True
+    for name in ENGINES if args.engine == "both" else (args.engine,):
+        print(f"Soaking {name} for {args.frames:,} frames ({args.frames / 60 / 3600:.1f} hours of show)")
+        samples = soak(name, engine_options, args.frames, args.sample_every, args.warmup,
+                       args.popup_frames, progress)
+        passed = report(name, samples, int(args.tolerance_mb * MB), args.resource_tolerance, args.top) and passed
+        print()
+    tracemalloc.stop()
+    pygame.quit()
+    print("Soak test passed" if passed else "Soak test FAILED: memory grew beyond the tolerance")
+    return 0 if passed else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main_soak())
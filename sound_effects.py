@@ -9,8 +9,11 @@ This module provides sound effects and audio feedback for the hacker interface.
 import pygame
 import random
 import math
+import numpy as np
 from typing import Optional
 
+from resource_registry import track
+
 class SoundEffects:
     def __init__(self):
         self.sounds_enabled = True
@@ -18,6 +21,8 @@ class SoundEffects:
         self.beep_sound = None
         self.error_sound = None
         self.success_sound = None
+        self.triggers = 0
+        self.dropped_triggers = 0
         
         # Initialize sound effects
         self.init_sounds()
@@ -34,6 +39,14 @@ class SoundEffects:
             print(f"Warning: Could not initialize sounds: {e}")
             self.sounds_enabled = False
     
+    def make_sound(self, arr):
+        """Turn [left, right] samples into a Sound in the mixer's format"""
+        samples = np.array(arr, dtype=np.int16)
+        channels = pygame.mixer.get_init()[2]
+        if channels == 1:
+            samples = np.ascontiguousarray(samples[:, 0])
+        return track(pygame.sndarray.make_sound(samples), "sound_effects", "sounds")
+    
     def create_typing_sound(self):
         """Create a synthetic typing sound"""
         try:
@@ -52,7 +65,7 @@ class SoundEffects:
                 wave += random.randint(-200, 200)
                 arr.append([int(wave), int(wave)])
             
-            sound_array = pygame.sndarray.make_sound(pygame.array.array('i', arr))
+            sound_array = self.make_sound(arr)
             self.typing_sound = sound_array
         except Exception as e:
             print(f"Could not create typing sound: {e}")
@@ -74,7 +87,7 @@ class SoundEffects:
                 wave = 4096 * volume * math.sin(frequency * 2 * math.pi * time)
                 arr.append([int(wave), int(wave)])
             
-            sound_array = pygame.sndarray.make_sound(pygame.array.array('i', arr))
+            sound_array = self.make_sound(arr)
             self.beep_sound = sound_array
         except Exception as e:
             print(f"Could not create beep sound: {e}")
@@ -96,7 +109,7 @@ class SoundEffects:
                 wave *= math.sin(10 * 2 * math.pi * time)  # Modulation
                 arr.append([int(wave), int(wave)])
             
-            sound_array = pygame.sndarray.make_sound(pygame.array.array('i', arr))
+            sound_array = self.make_sound(arr)
             self.error_sound = sound_array
         except Exception as e:
             print(f"Could not create error sound: {e}")
@@ -119,42 +132,38 @@ class SoundEffects:
                 wave = 4096 * math.sin(frequency * 2 * math.pi * time)
                 arr.append([int(wave), int(wave)])
             
-            sound_array = pygame.sndarray.make_sound(pygame.array.array('i', arr))
+            sound_array = self.make_sound(arr)
             self.success_sound = sound_array
         except Exception as e:
             print(f"Could not create success sound: {e}")
     
+    def play(self, sound):
+        """Start a sound, counting triggers that couldn't play (no sound, no free channel or a mixer error)"""
+        if not self.sounds_enabled:
+            return
+        self.triggers += 1
+        try:
+            channel = sound.play() if sound else None
+        except pygame.error:
+            channel = None
+        if channel is None:
+            self.dropped_triggers += 1
+    
     def play_typing(self):
         """Play typing sound effect"""
-        if self.sounds_enabled and self.typing_sound:
-            try:
-                self.typing_sound.play()
-            except:
-                pass
+        self.play(self.typing_sound)
     
     def play_beep(self):
         """Play beep sound effect"""
-        if self.sounds_enabled and self.beep_sound:
-            try:
-                self.beep_sound.play()
-            except:
-                pass
+        self.play(self.beep_sound)
     
     def play_error(self):
         """Play error sound effect"""
-        if self.sounds_enabled and self.error_sound:
-            try:
-                self.error_sound.play()
-            except:
-                pass
+        self.play(self.error_sound)
     
     def play_success(self):
         """Play success sound effect"""
-        if self.sounds_enabled and self.success_sound:
-            try:
-                self.success_sound.play()
-            except:
-                pass
+        self.play(self.success_sound)
     
     def toggle_sounds(self):
         """Toggle sound effects on/off"""
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Startup Profiling Module
+========================
+
+Measures where startup time goes when a program is run with
+--profile-startup: how long each module import takes, how long each
+initialization phase takes, and how long until the first frame is on
+screen. The report is printed as a table and written as JSON so startup
+can be compared release to release.
+
+Imports are only timed if the profiler is enabled before them, so entry
+points check the flag at the very top of the module, before importing
+pygame.
+"""
+
+import os
+import sys
+import json
+import time
+import builtins
+import platform
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+PROFILE_FLAG = "--profile-startup"
+DEFAULT_REPORT = "startup_profile.json"
+REPORT_IMPORTS = 15  # Imports shown in the printed table
+
+_profiler: Optional["StartupProfiler"] = None
+
+
+def requested(argv: Optional[List[str]] = None) -> bool:
+    """Whether the command line asks for startup profiling"""
+    return PROFILE_FLAG in (sys.argv if argv is None else argv)
+
+
+class StartupProfiler:
+    """Collects import, phase and first-frame timings for one run"""
+
+    def __init__(self, program: str):
+        self.program = program
+        self.start = time.perf_counter()
+        self.imports: List[Dict] = []
+        self.phases: List[Dict] = []
+        self.first_frame_ms: Optional[float] = None
+        self.report_path = DEFAULT_REPORT
+        self.original_import = None
+        self.local = threading.local()  # Per-thread stack of imports in progress
+
+    def elapsed_ms(self, since: Optional[float] = None) -> float:
+        return (time.perf_counter() - (self.start if since is None else since)) * 1000
+
+    def install_import_timer(self):
+        """Time every first-time import from now on"""
+        if self.original_import is not None:
+            return
+        self.original_import = builtins.__import__
+        builtins.__import__ = self.timed_import
+
+    def remove_import_timer(self):
+        if self.original_import is not None:
+            builtins.__import__ = self.original_import
+            self.original_import = None
+
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        original = self.original_import
+        if level or name in sys.modules:
+            # Already loaded (or relative, where the real name isn't known yet) - nothing to time
+            return original(name, globals, locals, fromlist, level)
+
+        stack = getattr(self.local, "stack", None)
+        if stack is None:
+            stack = self.local.stack = []
+        record = {"module": name, "depth": len(stack), "thread": threading.current_thread().name,
+                  "start_ms": self.elapsed_ms(), "children_ms": 0.0}
+        stack.append(record)
+        started = time.perf_counter()
+        try:
+            return original(name, globals, locals, fromlist, level)
+        finally:
+            total = (time.perf_counter() - started) * 1000
+            stack.pop()
+            record["total_ms"] = total
+            record["self_ms"] = total - record.pop("children_ms")
+            if stack:
+                stack[-1]["children_ms"] += total
+            self.imports.append(record)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time one initialization phase"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases.append({"phase": name, "start_ms": (started - self.start) * 1000,
+                                "duration_ms": self.elapsed_ms(started)})
+
+    def mark_first_frame(self):
+        """Record the first flip; the startup report is complete after it"""
+        self.first_frame_ms = self.elapsed_ms()
+        self.remove_import_timer()
+        self.write(self.report_path)
+        print(self.format_table())
+
+    def top_level_import_ms(self) -> float:
+        return sum(record["total_ms"] for record in self.imports if record["depth"] == 0)
+
+    def to_dict(self) -> Dict:
+        return {
+            "program": self.program,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "import_ms": self.top_level_import_ms(),
+            "first_frame_ms": self.first_frame_ms,
+            "phases": self.phases,
+            "imports": sorted(self.imports, key=lambda record: record["start_ms"]),
+        }
+
+    def write(self, path: str):
+        """Write the machine-readable report"""
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(temp_path, path)
+
+    def format_table(self) -> str:
+        """Human-readable summary of the report"""
+        lines = [f"Startup profile: {self.program}", "",
+                 f"{'Import (top ' + str(REPORT_IMPORTS) + ' by total)':<48} {'total ms':>10} {'self ms':>10}"]
+        for record in sorted(self.imports, key=lambda r: r["total_ms"], reverse=True)[:REPORT_IMPORTS]:
+            lines.append(f"{record['module']:<48} {record['total_ms']:>10.1f} {record['self_ms']:>10.1f}")
+        lines.append(f"{'all imports':<48} {self.top_level_import_ms():>10.1f}")
+        lines.append("")
+        lines.append(f"{'Phase':<48} {'ms':>10} {'at ms':>10}")
+        for phase in self.phases:
+            lines.append(f"{phase['phase']:<48} {phase['duration_ms']:>10.1f} {phase['start_ms']:>10.1f}")
+        lines.append("")
+        if self.first_frame_ms is not None:
+            lines.append(f"{'First frame flipped':<48} {self.first_frame_ms:>10.1f}")
+        lines.append(f"Report written to {self.report_path}")
+        return "\n".join(lines)
+
+
+def enable(program: str) -> StartupProfiler:
+    """Start profiling (once per process - later calls return the same profiler)"""
+    global _profiler
+    if _profiler is None:
+        _profiler = StartupProfiler(program)
+        _profiler.install_import_timer()
+    return _profiler
+
+
+def get_profiler() -> Optional[StartupProfiler]:
+    return _profiler
+
+
+def configure(options):
+    """Apply parsed command line options to the running profiler"""
+    if _profiler is not None and getattr(options, "profile_output", None):
+        _profiler.report_path = options.profile_output
+
+
+@contextmanager
+def phase(name: str):
+    """Time a phase if profiling is on; otherwise does nothing"""
+    if _profiler is None:
+        yield
+    else:
+        with _profiler.phase(name):
+            yield
+
+
+def first_frame():
+    """Call after every flip; only the first one does anything"""
+    if _profiler is not None and _profiler.first_frame_ms is None:
+        _profiler.mark_first_frame()
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Thumbnail Cache Module
+======================
+
+Disk cache of ready-to-blit scaled images so a cold start is a few file
+reads instead of decoding and rescaling every logo again.
+
+Entries are keyed by source path, mtime, file size, target sizes and
+scaling algorithm, so editing or replacing a file simply misses the cache.
+Each entry stores zlib-compressed raw pixels. A hit touches the entry, and
+entries nobody has used for STALE_ENTRY_DAYS are pruned - not just the
+ones this run didn't need, since a cache shared by kiosks at different
+resolutions, or kept while a logo is briefly taken out, holds entries
+other runs still use. Pruning also removes this process's leftover temp
+files and ones other processes abandoned long ago.
+"""
+
+import os
+import zlib
+import struct
+import hashlib
+import threading
+import time
+from typing import Optional, Tuple
+
+from hacker_logging import get_logger
+from image_loader import DecodedImage
+
+log = get_logger("loader")
+
+CACHE_DIR = ".thumbnail_cache"
+CACHE_VERSION = 1
+ENTRY_SUFFIX = ".thumb"
+TEMP_SUFFIX = ".tmp"
+STALE_ENTRY_DAYS = 30
+STALE_TEMP_SECONDS = 3600  # Another process's temp file this old was abandoned, not in progress
+
+# Header: magic, original width/height, number of images
+HEADER = struct.Struct("<4sIIB")
+# Per image: width, height, mode, compressed length
+IMAGE_HEADER = struct.Struct("<II4sI")
+MAGIC = b"FHMT"
+
+
+class ThumbnailCache:
+    def __init__(self, directory: str = CACHE_DIR, compress_level: int = 1):
+        self.directory = directory
+        self.compress_level = compress_level  # Fast compression keeps cold starts cheap
+        self.lock = threading.Lock()  # load() runs on the loader's worker threads
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def key_for(self, path: str, max_size: Tuple[int, int], popup_size: Optional[Tuple[int, int]],
+                stretch: bool, resample: str) -> str:
+        """Cache key for one scaled image request"""
+        stat = os.stat(path)
+        parts = (CACHE_VERSION, os.path.abspath(path), stat.st_mtime_ns, stat.st_size,
+                 tuple(max_size), tuple(popup_size) if popup_size else None, stretch, resample)
+        return hashlib.sha1(repr(parts).encode("utf-8")).hexdigest()
+
+    def entry_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ENTRY_SUFFIX)
+
+    def count(self, hit: bool):
+        with self.lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def load(self, key: str):
+        """Read a cached entry as (original_size, image, popup_image), or None on a miss"""
+        path = self.entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            self.count(hit=False)
+            return None
+
+        try:
+            magic, original_width, original_height, count = HEADER.unpack_from(data, 0)
+            if magic != MAGIC:
+                raise ValueError("bad magic")
+            offset = HEADER.size
+            images = []
+            for _ in range(count):
+                width, height, mode, length = IMAGE_HEADER.unpack_from(data, offset)
+                offset += IMAGE_HEADER.size
+                pixels = zlib.decompress(data[offset:offset + length])
+                offset += length
+                images.append(DecodedImage((width, height), mode.rstrip(b"\0").decode("ascii"), pixels))
+        except (struct.error, ValueError, zlib.error):
+            # Corrupt or old-format entry - treat as a miss and let it be rewritten
+            self.count(hit=False)
+            return None
+
+        self.count(hit=True)
+        try:
+            os.utime(path)  # Last used now, for prune()
+        except OSError:
+            pass
+        return (original_width, original_height), images[0], images[1] if len(images) > 1 else None
+
+    def store(self, key: str, original_size: Tuple[int, int], image: DecodedImage,
+              popup: Optional[DecodedImage] = None):
+        """Write an entry atomically so a crash never leaves a half-written file"""
+        images = [image] if popup is None else [image, popup]
+        chunks = [HEADER.pack(MAGIC, original_size[0], original_size[1], len(images))]
+        for decoded in images:
+            pixels = zlib.compress(decoded.data, self.compress_level)
+            chunks.append(IMAGE_HEADER.pack(decoded.size[0], decoded.size[1],
+                                            decoded.mode.encode("ascii"), len(pixels)))
+            chunks.append(pixels)
+
+        path = self.entry_path(key)
+        temp_path = f"{path}.{os.getpid()}{TEMP_SUFFIX}"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(b"".join(chunks))
+            os.replace(temp_path, path)
+        except OSError as e:
+            log.warning(f"Could not write thumbnail cache entry {path}: {e}")
+
+    def age(self, name: str) -> float:
+        """Seconds since a file in the cache was last written or used (0 if it's gone)"""
+        try:
+            return time.time() - os.path.getmtime(os.path.join(self.directory, name))
+        except OSError:
+            return 0.0
+
+    def is_stale(self, name: str, max_age_days: float) -> bool:
+        if name.endswith(ENTRY_SUFFIX):
+            return self.age(name) > max_age_days * 86400
+        if name.endswith(TEMP_SUFFIX):
+            # This process's leftovers, or another's abandoned ones (not one it is still writing)
+            return name.endswith(f".{os.getpid()}{TEMP_SUFFIX}") or self.age(name) > STALE_TEMP_SECONDS
+        return False
+
+    def prune(self, max_age_days: float = STALE_ENTRY_DAYS) -> int:
+        """Delete entries nobody has used for max_age_days, and stale temp files"""
+        removed = 0
+        for name in os.listdir(self.directory):
+            if not self.is_stale(name, max_age_days):
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+                removed += 1
+            except OSError:
+                pass
+        return removed
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Typewriter Text Module
+======================
+
+Text that grows a character at a time, like the boot log typing
+animation. Glyphs are rendered once and cached with their advances; the
+laid out text lives on a backing surface that is only touched where it
+changed, so adding a character costs one glyph blit instead of
+re-rendering the whole string. Long text is word-wrapped to a maximum
+width and each line is centered when drawn.
+"""
+
+from typing import Dict, List, Tuple
+
+import pygame
+
+from resource_registry import track
+
+Color = Tuple[int, int, int]
+
+
+class TypewriterText:
+    def __init__(self, font: pygame.font.Font, color: Color, max_width: int, cursor: str = "_"):
+        self.font = font
+        self.color = color
+        self.max_width = max_width
+        self.cursor = cursor
+        self.line_height = font.get_linesize()
+
+        self.glyphs: Dict[str, Tuple[pygame.Surface, int]] = {}  # char -> (surface, advance)
+        self.text = ""
+        self.layout: List[Tuple[str, int, int]] = []  # (char, x, line) per character
+        self.line_widths: List[int] = [0]
+        self.surface = track(pygame.Surface((max_width, self.line_height), pygame.SRCALPHA), "typewriter", "text")
+        self.glyphs_blitted = 0
+
+    def glyph(self, char: str) -> Tuple[pygame.Surface, int]:
+        """Rendered glyph and its advance, cached per character"""
+        cached = self.glyphs.get(char)
+        if cached is None:
+            surface = track(self.font.render(char, True, self.color), "typewriter", "glyphs")
+            metrics = self.font.metrics(char)
+            advance = metrics[0][4] if metrics and metrics[0] else surface.get_width()
+            cached = self.glyphs[char] = (surface, advance)
+        return cached
+
+    def layout_text(self, text: str) -> Tuple[List[Tuple[str, int, int]], List[int]]:
+        """Word-wrap text into (char, x, line) positions and the width of each line"""
+        layout = []
+        line_widths = [0]
+        x = 0
+        line = 0
+        index = 0
+        while index < len(text):
+            char = text[index]
+            if char == "\n":
+                line_widths[line] = x
+                layout.append((char, x, line))
+                line += 1
+                line_widths.append(0)
+                x = 0
+                index += 1
+                continue
+
+            # Measure the whole word so it wraps as a unit
+            end = index
+            while end < len(text) and not text[end].isspace():
+                end += 1
+            word = text[index:end] if end > index else char
+            word_width = sum(self.glyph(c)[1] for c in word)
+            if x > 0 and x + word_width > self.max_width and not char.isspace():
+                line_widths[line] = x
+                line += 1
+                line_widths.append(0)
+                x = 0
+
+            for c in word:
+                advance = self.glyph(c)[1]
+                if x > 0 and x + advance > self.max_width:
+                    # Word longer than a whole line - break it
+                    line_widths[line] = x
+                    line += 1
+                    line_widths.append(0)
+                    x = 0
+                layout.append((c, x, line))
+                x += advance
+            line_widths[line] = x
+            index += len(word)
+        return layout, line_widths
+
+    def set_text(self, text: str) -> bool:
+        """Update the text, redrawing only glyphs that changed; returns False if nothing did"""
+        if text == self.text:
+            return False
+
+        layout, line_widths = self.layout_text(text)
+        # Glyphs that kept their character and position stay on the backing surface
+        keep = 0
+        for old, new in zip(self.layout, layout):
+            if old != new:
+                break
+            keep += 1
+
+        for char, x, line in self.layout[keep:]:
+            surface, advance = self.glyph(char)
+            self.surface.fill((0, 0, 0, 0), (x, line * self.line_height,
+                                             max(advance, surface.get_width()), self.line_height))
+
+        needed_height = len(line_widths) * self.line_height
+        if needed_height > self.surface.get_height():
+            grown = track(pygame.Surface((self.max_width, needed_height), pygame.SRCALPHA), "typewriter", "text")
+            grown.blit(self.surface, (0, 0))
+            self.surface = grown
+
+        for char, x, line in layout[keep:]:
+            if char != "\n":
+                self.surface.blit(self.glyph(char)[0], (x, line * self.line_height))
+                self.glyphs_blitted += 1
+
+        self.text = text
+        self.layout = layout
+        self.line_widths = line_widths
+        return True
+
+    def draw(self, screen: pygame.Surface, center_x: int, center_y: int, show_cursor: bool = True):
+        """Draw each line centered on center_x; the first line is centered vertically on center_y"""
+        top = center_y - self.line_height // 2
+        last_line = len(self.line_widths) - 1
+        cursor_surface, cursor_advance = self.glyph(self.cursor) if show_cursor and self.cursor else (None, 0)
+        for line, width in enumerate(self.line_widths):
+            line_width = width + (cursor_advance if line == last_line else 0)
+            x = center_x - line_width // 2
+            y = top + line * self.line_height
+            if width:
+                screen.blit(self.surface, (x, y), (0, line * self.line_height, width, self.line_height))
+            if cursor_surface is not None and line == last_line:
+                screen.blit(cursor_surface, (x + width, y))
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Widget Process Module
+=====================
+
+Renders the graph widgets (system monitor, radar, pulse, data stream) in
+a separate process so they don't compete with the Matrix rain for the
+render thread. The worker draws every panel into a pixel atlas in
+multiprocessing.shared_memory at its own frame rate; the main process
+wraps the atlas buffers as pygame surfaces once (pygame.image.frombuffer,
+no copies) and blits the panels from the newest finished frame.
+
+The atlas is triple-buffered. A small header in front of the pixels
+holds the handshake:
+
+- LATEST: buffer holding the newest finished frame (-1 before the first)
+- READING: buffer the main process is blitting from
+- SEQ[i]: per-buffer sequence number, odd while the worker writes to it
+- FRAME[i]: widget frame number stored in the buffer
+
+The worker only writes to a buffer that is neither LATEST nor READING,
+and both sides read and swap those two indices under a lock held for a
+few integer operations - never while drawing or blitting. The main
+process checks SEQ before its blit and falls back to the last complete
+buffer it showed if the latest one is odd, then checks SEQ again after
+the blit, so a frame that was written to while on screen would be
+counted as torn (neither can happen while the protocol holds).
+"""
+
+import random
+import time
+import multiprocessing
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+import pygame
+
+from hacker_logging import get_logger
+from options import DEFAULT_WIDGET_FPS
+from resource_registry import get_registry, track
+
+log = get_logger()
+
+PANEL_KINDS = ("system_monitor", "radar", "pulse", "data_stream")
+BUFFERS = 3
+
+# Header slots (int64)
+LATEST = 0
+READING = 1
+VISIBLE = 2
+RENDERED = 3
+SEQ = 4
+FRAME = SEQ + BUFFERS
+HEADER_SLOTS = 16
+HEADER_BYTES = HEADER_SLOTS * 8
+
+
+@dataclass(frozen=True)
+class WidgetPanel:
+    """A widget and the screen rectangle it owns"""
+    kind: str
+    rect: Tuple[int, int, int, int]
+
+    def __post_init__(self):
+        if self.kind not in PANEL_KINDS:
+            raise ValueError(f"unknown widget panel: {self.kind}")
+
+
+def draw_panel(graphs, surface: pygame.Surface, panel: WidgetPanel, x: int, y: int):
+    """Draw a panel with its top-left corner at (x, y) of surface"""
+    width, height = panel.rect[2], panel.rect[3]
+    if panel.kind == "system_monitor":
+        # The right margin leaves room for the value labels next to the graphs
+        graphs.draw_system_monitor(surface, x, y, width - 20, height)
+    elif panel.kind == "radar":
+        graphs.draw_radar_sweep(surface, x + width // 2, y + height // 2, min(width, height) // 2)
+    elif panel.kind == "pulse":
+        graphs.draw_pulse_animation(surface, x + width // 2, y + height // 2)
+    elif panel.kind == "data_stream":
+        graphs.draw_data_stream(surface, x, y, width, height)
+
+
+def atlas_layout(panels: Sequence[WidgetPanel]) -> Tuple[int, int, List[Tuple[int, int]]]:
+    """Atlas size and each panel's position in it (panels side by side)"""
+    positions = []
+    width = 0
+    for panel in panels:
+        positions.append((width, 0))
+        width += panel.rect[2]
+    height = max((panel.rect[3] for panel in panels), default=0)
+    return width, height, positions
+
+
+class SharedAtlas:
+    """Header and triple-buffered BGRA atlas in one shared memory block"""
+
+    def __init__(self, panels: Sequence[WidgetPanel], name: Optional[str] = None):
+        self.width, self.height, self.positions = atlas_layout(panels)
+        self.buffer_bytes = self.width * self.height * 4
+        size = HEADER_BYTES + BUFFERS * self.buffer_bytes
+        if name is None:
+            self.memory = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.memory = shared_memory.SharedMemory(name=name)
+        self.header = np.ndarray((HEADER_SLOTS,), dtype=np.int64, buffer=self.memory.buf)
+        if name is None:
+            self.header[:] = 0
+            self.header[LATEST] = self.header[READING] = -1
+        # Surfaces share the buffers' memory: drawing on them writes the atlas, blitting reads it.
+        # BGRA matches the usual 32-bit display format, so blits skip per-pixel conversion.
+        self.surfaces = [
+            pygame.image.frombuffer(self.memory.buf[self.offset(i):self.offset(i) + self.buffer_bytes],
+                                    (self.width, self.height), "BGRA")
+            for i in range(BUFFERS)
+        ]
+
+    def offset(self, index: int) -> int:
+        return HEADER_BYTES + index * self.buffer_bytes
+
+    def close(self):
+        # The surfaces and header export the buffer; it can't be closed while they exist
+        self.surfaces = []
+        self.header = None
+        self.memory.close()
+
+
+def run_widget_renderer(name: str, panels: Sequence[WidgetPanel], fps: int, lock, stop):
+    """Worker process entry point: draw the widgets into the shared atlas until told to stop"""
+    pygame.font.init()
+    atlas = SharedAtlas(panels, name)
+    try:
+        render_widgets(atlas, panels, fps, lock, stop)
+    finally:
+        atlas.close()
+
+
+def render_widgets(atlas: SharedAtlas, panels: Sequence[WidgetPanel], fps: int, lock, stop):
+    from graph_animations import GraphAnimations
+
+    header = atlas.header
+    graphs = GraphAnimations(atlas.width, atlas.height, rng=random.Random())
+    period = 1.0 / fps
+    parent = multiprocessing.parent_process()
+    deadline = time.perf_counter()
+    while not stop.is_set() and (parent is None or parent.is_alive()):
+        if not header[VISIBLE]:
+            stop.wait(0.05)  # Nothing is shown; don't burn a core
+            deadline = time.perf_counter()
+            continue
+
+        graphs.update()
+        with lock:
+            busy = (header[LATEST], header[READING])
+            index = next(i for i in range(BUFFERS) if i not in busy)
+        header[SEQ + index] += 1  # Odd: being written
+        surface = atlas.surfaces[index]
+        surface.fill((0, 0, 0, 0))
+        for panel, (x, y) in zip(panels, atlas.positions):
+            surface.set_clip((x, y, panel.rect[2], panel.rect[3]))
+            draw_panel(graphs, surface, panel, x, y)
+        surface.set_clip(None)
+        header[RENDERED] += 1
+        header[FRAME + index] = header[RENDERED]
+        header[SEQ + index] += 1  # Even: complete
+        with lock:
+            header[LATEST] = index
+
+        deadline += period
+        remaining = deadline - time.perf_counter()
+        if remaining > 0:
+            stop.wait(remaining)
+        else:
+            deadline = time.perf_counter()  # Fell behind; don't try to catch up
+
+
+class WidgetProcess:
+    """Main-process side: starts the worker and blits its newest finished frame"""
+
+    def __init__(self, panels: Sequence[WidgetPanel], fps: int = DEFAULT_WIDGET_FPS):
+        self.panels = list(panels)
+        # Spawn rather than fork: the main process already runs threads and SDL
+        context = multiprocessing.get_context("spawn")
+        self.atlas = SharedAtlas(self.panels)
+        track(self.atlas.memory, "widget_process", "shared_memory", self.atlas.memory.size)
+        self.lock = context.Lock()
+        self.stop_event = context.Event()
+        self.process = context.Process(target=run_widget_renderer, name="widgets", daemon=True,
+                                       args=(self.atlas.memory.name, self.panels, fps,
+                                             self.lock, self.stop_event))
+        self.blits = [
+            [(surface, panel.rect[:2], (x, y, panel.rect[2], panel.rect[3]))
+             for panel, (x, y) in zip(self.panels, self.atlas.positions)]
+            for surface in self.atlas.surfaces
+        ]
+        self.shown_frame = 0
+        self.shown_index = -1  # Buffer of the last complete frame shown
+        self.frames_shown = 0
+        self.new_frames = 0
+        self.torn = 0
+        self.skipped = 0  # Screen frames without a complete widget frame to show
+        self.rendered = 0
+
+    def start(self):
+        self.process.start()
+
+    def set_visible(self, visible: bool):
+        """Let the worker pause while the widgets are hidden"""
+        self.atlas.header[VISIBLE] = int(visible)
+
+    def wait_for_frame(self, timeout: float = 10.0) -> bool:
+        """Block until the worker has finished its first frame (benchmarks)"""
+        self.set_visible(True)
+        deadline = time.perf_counter() + timeout
+        while self.atlas.header[LATEST] < 0:
+            if time.perf_counter() > deadline or not self.process.is_alive():
+                return False
+            time.sleep(0.005)
+        return True
+
+    def claim(self, index: int) -> int:
+        """Mark a buffer as being read and return its sequence number (odd if it isn't complete)"""
+        with self.lock:
+            self.atlas.header[READING] = index
+        return int(self.atlas.header[SEQ + index])
+
+    def draw(self, screen: pygame.Surface) -> bool:
+        """Blit the newest complete widget frame; False if there is none yet"""
+        header = self.atlas.header
+        with self.lock:
+            index = int(header[LATEST])
+            header[READING] = index
+        if index < 0:
+            return False
+
+        sequence = int(header[SEQ + index])
+        if sequence % 2:
+            # Still being written: fall back to the last buffer shown complete
+            log.warning(f"Widget buffer {index} was being written when it was latest")
+            index = self.shown_index
+            sequence = self.claim(index) if index >= 0 else 1
+            if sequence % 2:
+                self.skipped += 1
+                return False
+
+        screen.blits(self.blits[index], doreturn=False)
+        if header[SEQ + index] != sequence:
+            self.torn += 1
+            log.warning(f"Widget frame {header[FRAME + index]} was written while on screen")
+
+        self.shown_index = index
+        self.frames_shown += 1
+        frame = int(header[FRAME + index])
+        if frame != self.shown_frame:
+            self.new_frames += 1
+            self.shown_frame = frame
+        return True
+
+    def stop(self):
+        if self.process.is_alive():
+            self.stop_event.set()
+            self.process.join(timeout=2)
+            if self.process.is_alive():
+                self.process.terminate()
+        self.rendered = int(self.atlas.header[RENDERED])
+        self.blits = []
+        self.atlas.close()
+        self.atlas.memory.unlink()
+        get_registry().untrack(self.atlas.memory)
+
+    def summary(self) -> str:
+        if self.atlas.header is not None:
+            self.rendered = int(self.atlas.header[RENDERED])
+        return (f"Widgets: {self.rendered} frames rendered out of process, "
+                f"{self.new_frames} new frames shown in {self.frames_shown} screen frames, "
+                f"{self.torn} torn, {self.skipped} skipped")